@@ -0,0 +1,29 @@
+# Generated by Django 6.0.7 on 2026-10-18 19:07
+
+from django.db import migrations
+from django.db.models import Max
+
+
+def remove_duplicates(apps, schema_editor):
+    # balances are derived data: keep the newest row of each account and year
+    AccountBalance = apps.get_model("accounts", "AccountBalance")
+    keep = list(
+        AccountBalance.objects.values("account", "year")
+        .annotate(last_id=Max("id"))
+        .values_list("last_id", flat=True)
+    )
+    AccountBalance.objects.exclude(id__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0006_alter_account_slug_alter_account_title"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, reverse_code=migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name="accountbalance",
+            unique_together={("account", "year")},
+        ),
+    ]
@@ -42,6 +42,7 @@ class AccountBalance(models.Model):
 
     class Meta:
         ordering = ["year", "account__pk"]
+        unique_together = ["account", "year"]
 
     def __str__(self):
         return f"{self.account.title}"
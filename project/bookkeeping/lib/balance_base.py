@@ -1,18 +1,29 @@
+from dataclasses import dataclass, field
+from functools import cached_property
+
 import polars as pl
 
 
+@dataclass(frozen=True)
+class Metrics:
+    total: int = 0
+    total_row: dict[str, float] = field(default_factory=dict)
+    total_column: list[dict] = field(default_factory=list)
+    average: dict[str, float] = field(default_factory=dict)
+
+
 class BalanceBase:
     def __init__(self, data: pl.DataFrame = pl.DataFrame()):
         self._data = data
 
-    @property
+    @cached_property
     def balance(self) -> list[dict]:
         """
         Return [{'date': datetime.datetime, 'title': float}]
         """
         return [] if self.is_empty(self._data) else self._data.to_dicts()
 
-    @property
+    @cached_property
     def types(self) -> list:
         return sorted(self._data.select(pl.exclude("date")).columns)
 
@@ -21,31 +32,15 @@ class BalanceBase:
         """
         Return total sum of all columns
         """
-
-        if self.is_empty(self._data):
-            return 0
-
-        if self._data.shape[1] <= 1:
-            return 0
-
-        return self._data.select(pl.sum_horizontal(pl.exclude("date")).sum())[0, 0]
+        return self._metrics.total
 
     @property
     def total_column(self) -> list:
-        if self.is_empty(self._data):
-            return []
-
-        df = self.sum_cols(self._data, "total")
-        return [] if df.is_empty() else df.to_dicts()
+        return self._metrics.total_column
 
     @property
     def total_row(self) -> dict[str, float]:
-        if self.is_empty(self._data):
-            return {}
-
-        df = self._data.select(pl.exclude("date")).sum().head(1)
-
-        return {} if self.is_empty(df) else df.to_dicts()[0]
+        return self._metrics.total_row
 
     @property
     def average(self) -> dict[str, float]:
@@ -54,32 +49,63 @@ class BalanceBase:
         Returns:
             dict[str, float]
         """
+        return self._metrics.average
 
+    @cached_property
+    def _metrics(self) -> Metrics:
+        """All the summary statistics, from one query plan run on first use."""
         if self.is_empty(self._data):
-            return {}
+            return Metrics()
 
         cols = self._data.select(pl.exclude("date")).columns
+        if not cols:
+            df = self.sum_cols(self._data, "total")
+            return Metrics(total_column=df.to_dicts())
+
+        lf = self._data.lazy()
 
         def col_sum(col_name) -> pl.Expr:
-            return pl.col(col_name).sum()
+            return pl.col(col_name).fill_null(0).sum()
 
         def count_not_nulls(col_name):
-            return pl.col(col_name).filter(pl.col(col_name) != 0).count()
-
-        df = (
-            self._data.select(cols)
-            .lazy()
-            .fill_null(0)
-            .with_columns(
-                [
-                    pl.when(col_sum(col_name) != 0)
-                    .then(col_sum(col_name) / count_not_nulls(col_name))
-                    .otherwise(pl.lit(0))
-                    for col_name in cols
-                ]
+            col = pl.col(col_name).fill_null(0)
+            return col.filter(col != 0).count()
+
+        plans = [
+            lf.select(cols).sum(),
+            lf.select(
+                pl.when(col_sum(col_name) != 0)
+                .then(col_sum(col_name) / count_not_nulls(col_name))
+                .otherwise(pl.lit(0))
+                .alias(col_name)
+                for col_name in cols
+            ),
+        ]
+        # a frame of one column has nothing to add up across
+        across = self._data.shape[1] > 1
+        if across and "date" in self._data.columns:
+            plans.append(
+                lf.select(
+                    pl.col("date"), pl.sum_horizontal(pl.exclude("date")).alias("total")
+                )
             )
-        ).collect()
-        return {} if self.is_empty(df) else df.to_dicts()[0]
+
+        sums, averages, *column = pl.collect_all(plans)
+        total_row = sums.to_dicts()[0]
+
+        if column:
+            total_column = column[0].to_dicts()
+        elif across:
+            total_column = []
+        else:
+            total_column = self.sum_cols(self._data, "total").to_dicts()
+
+        return Metrics(
+            total=sum(total_row.values()) if across else 0,
+            total_row=total_row,
+            total_column=total_column,
+            average=averages.to_dicts()[0],
+        )
 
     def is_empty(self, df: pl.DataFrame) -> bool:
         return df.is_empty() if isinstance(df, pl.DataFrame) else True
@@ -1,5 +1,6 @@
 import calendar
 from datetime import date
+from functools import cached_property
 
 import polars as pl
 
@@ -97,7 +98,7 @@ class MakeDataFrame:
 
         self._builder = TimeSeriesPivotBuilder(year, month, columns)
 
-    @property
+    @cached_property
     def data(self) -> pl.DataFrame:
         return self._builder.build(self._data, value_column="sum")
 
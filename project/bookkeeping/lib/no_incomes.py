@@ -6,6 +6,7 @@ from django.db.models import Sum
 from django.utils.translation import gettext_lazy as _
 
 from ...accounts.services.model_services import AccountBalanceModelService
+from ...core.lib.context_cache import journal_cache
 from ...expenses.services.model_services import (
     ExpenseModelService,
     ExpenseTypeModelService,
@@ -93,6 +94,7 @@ class NoIncomes:
         return incomes / expenses if expenses else 0
 
 
+@journal_cache("no_incomes")
 def load_service(user: User, year: int, months: int = 6) -> dict:
 
     # 1. Fetch Unnecessary Titles
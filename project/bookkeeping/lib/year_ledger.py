@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from datetime import date
+
+from django.db.models import F, QuerySet, Sum
+from django.db.models.functions import ExtractMonth
+
+from ...core.lib import request_memo
+from ...core.services.model_services import MonthlyRollupModelService
+from ...debts.services.model_services import DebtModelService, DebtReturnModelService
+from ...transactions.services.model_services import SavingCloseModelService
+from ...users.models import User
+
+KINDS = (
+    "incomes",
+    "expenses",
+    "savings",
+    "savings_close",
+    "lend",
+    "borrow",
+    "lend_return",
+    "borrow_return",
+)
+
+
+@dataclass(frozen=True)
+class YearLedger:
+    """Monthly totals of every money movement of a year, twelve per kind."""
+
+    year: int
+    months: dict[str, list[int]]
+
+    def monthly(self, kind: str) -> list[int]:
+        return list(self.months[kind])
+
+    def rows(self) -> list[dict]:
+        """The months with data as {"date", "sum", "title"} rows, the way the
+        model services' sum_by_month return them."""
+        return [
+            {"date": date(self.year, month, 1), "sum": total, "title": kind}
+            for kind, totals in self.months.items()
+            for month, total in enumerate(totals, start=1)
+            if total
+        ]
+
+
+def get_year_ledger(user: User, year: int) -> YearLedger:
+    """The user's ledger of the year, fetched once per request."""
+    return request_memo.memoize(
+        ("year_ledger", user.journal_id, year), lambda: _fetch(user, year)
+    )
+
+
+def _fetch(user: User, year: int) -> YearLedger:
+    first, *others = _querysets(user, year)
+    months = {kind: [0] * 12 for kind in KINDS}
+
+    for title, month, total in first.union(*others, all=True):
+        months[title][month - 1] += total or 0
+
+    return YearLedger(year=year, months=months)
+
+
+def _querysets(user: User, year: int) -> list[QuerySet]:
+    """(title, month, sum) rows of every kind for one UNION ALL query: the
+    incomes, expenses and savings from the monthly rollup, the rest from
+    their sum_by_month."""
+    rollup = (
+        MonthlyRollupModelService(user)
+        .year(year)
+        .values("kind", "month")
+        .annotate(total=Sum("sum"))
+        .order_by()
+        .values_list("kind", "month", "total")
+    )
+
+    querysets = [
+        SavingCloseModelService(user).sum_by_month(year),
+        DebtReturnModelService(user, "lend").sum_by_month(year),
+        DebtReturnModelService(user, "borrow").sum_by_month(year),
+    ]
+    querysets += [
+        DebtModelService(user, debt_type)
+        .sum_by_month(year, closed=True)
+        .values("date", "title", sum=F("sum_debt"))
+        for debt_type in ("lend", "borrow")
+    ]
+
+    return [rollup] + [
+        qs.order_by()
+        .annotate(month_number=ExtractMonth("date"))
+        .values_list("title", "month_number", "sum")
+        for qs in querysets
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.0.7 on 2026-10-18 19:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0007_alter_accountbalance_unique_together"),
+        (
+            "bookkeeping",
+            "0005_alter_accountworth_price_alter_pensionworth_price_and_more",
+        ),
+        ("pensions", "0016_alter_pensionbalance_unique_together"),
+        ("savings", "0017_alter_savingbalance_unique_together"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="accountworth",
+            index=models.Index(
+                fields=["account", "date"], name="bookkeeping_account_fb6563_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pensionworth",
+            index=models.Index(
+                fields=["pension_type", "date"], name="bookkeeping_pension_82d49a_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="savingworth",
+            index=models.Index(
+                fields=["saving_type", "date"], name="bookkeeping_saving__84e41c_idx"
+            ),
+        ),
+    ]
@@ -15,6 +15,7 @@ class SavingWorth(models.Model):
     class Meta:
         get_latest_by = ["date"]
         ordering = ["-date"]
+        indexes = [models.Index(fields=["saving_type", "date"])]
 
     def __str__(self):
         return f"{self.date:%Y-%m-%d %H:%M} - {self.saving_type}"
@@ -30,6 +31,7 @@ class AccountWorth(models.Model):
     class Meta:
         get_latest_by = ["date"]
         ordering = ["-date"]
+        indexes = [models.Index(fields=["account", "date"])]
 
     def __str__(self):
         return f"{self.date:%Y-%m-%d %H:%M} - {self.account}"
@@ -45,6 +47,7 @@ class PensionWorth(models.Model):
     class Meta:
         ordering = ["-date"]
         get_latest_by = ["date"]
+        indexes = [models.Index(fields=["pension_type", "date"])]
 
     def __str__(self):
         return f"{self.date:%Y-%m-%d %H:%M} - {self.pension_type}"
@@ -1,6 +1,7 @@
 from project.core.lib import utils
 
 from ...accounts.services.model_services import AccountBalanceModelService
+from ...core.lib.context_cache import journal_cache
 from ...users.models import User
 
 
@@ -8,6 +9,7 @@ def get_data(user: User, year: int):
     return AccountBalanceModelService(user).year(year)
 
 
+@journal_cache("accounts")
 def load_service(user: User, year: int) -> dict:
     data = get_data(user, year)
     fields = [
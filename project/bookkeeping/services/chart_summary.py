@@ -1,8 +1,11 @@
 from collections import defaultdict
 from dataclasses import dataclass, field
+from operator import itemgetter
 
 from django.utils.translation import gettext as _
 
+from ...core.lib.context_cache import journal_cache
+from ...core.lib.year_cache import rows_by_year
 from ...expenses.services.model_services import ExpenseModelService
 from ...incomes.services.model_services import IncomeModelService
 from ...users.models import User
@@ -18,14 +21,26 @@ class Data:
     salary: list = field(init=False, default_factory=list)
 
     def __post_init__(self):
-        self.incomes = IncomeModelService(self.user).sum_by_year()
-        self.incomes_types = IncomeModelService(self.user).sum_by_year_and_type()
-        self.salary = (
-            IncomeModelService(self.user)
-            .sum_by_year()
-            .filter(income_type__type="salary")
+        incomes = IncomeModelService(self.user)
+
+        self.incomes = rows_by_year(self.user, "incomes", incomes.sum_by_year())
+        self.incomes_types = sorted(
+            rows_by_year(
+                self.user,
+                "incomes_types",
+                incomes.sum_by_year_and_type(),
+                lookup="date__year",
+            ),
+            key=itemgetter("title"),
+        )
+        self.salary = rows_by_year(
+            self.user,
+            "salary",
+            incomes.sum_by_year().filter(income_type__type="salary"),
+        )
+        self.expenses = rows_by_year(
+            self.user, "expenses", ExpenseModelService(self.user).sum_by_year()
         )
-        self.expenses = ExpenseModelService(self.user).sum_by_year()
 
 
 class Charts:
@@ -97,6 +112,7 @@ class Charts:
         }
 
 
+@journal_cache("chart_summary")
 def load_service(user: User) -> dict:
     data = Data(user)
     obj = Charts(data)
@@ -4,6 +4,7 @@ from dataclasses import dataclass, field
 
 from django.utils.translation import gettext as _
 
+from ...core.lib.year_cache import rows_by_year
 from ...expenses.services.model_services import ExpenseModelService
 from ...users.models import User
 
@@ -36,10 +37,18 @@ class ChartSummaryExpensesServiceData:
         return types, names
 
     def _get_types(self, types: list) -> list[dict]:
-        return ExpenseModelService(self.user).sum_by_year_type(types)
+        return rows_by_year(
+            self.user,
+            f"expense_types:{sorted(types)}",
+            ExpenseModelService(self.user).sum_by_year_type(types),
+        )
 
     def _get_names(self, names: list) -> list[dict]:
-        return ExpenseModelService(self.user).sum_by_year_name(names)
+        return rows_by_year(
+            self.user,
+            f"expense_names:{sorted(names)}",
+            ExpenseModelService(self.user).sum_by_year_name(names),
+        )
 
 
 @dataclass
@@ -1,3 +1,3 @@
-from .presenters import load_service
+from .presenters import load_categories, load_service
 
-__all__ = ["load_service"]
+__all__ = ["load_categories", "load_service"]
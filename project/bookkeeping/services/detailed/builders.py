@@ -1,11 +1,11 @@
-from collections import defaultdict
-from datetime import date
 from functools import cached_property
 
 import polars as pl
 
 from .dtos import DetailedDto
 
+MONTHS = pl.DataFrame({"month": range(1, 13)}, schema={"month": pl.Int8})
+
 
 class DetailedTableBuilder:
     """Takes a DTO and constructs the Polars pivot table with dynamic sorting."""
@@ -20,44 +20,25 @@ class DetailedTableBuilder:
         if not self.dto.data:
             return pl.DataFrame()
 
-        padded_data = self._pad_data_for_upsampling(list(self.dto.data))
+        sums = (
+            pl.DataFrame(self.dto.data)
+            .group_by("title", month=pl.col("date").dt.month())
+            .agg(pl.col("sum").sum())
+        )
+
+        # every title gets all twelve months, the empty ones as 0
+        grid = sums.select("title").unique().join(MONTHS, how="cross")
 
         df = (
-            pl.DataFrame(padded_data)
-            .sort(["title", "date"])
-            .upsample(
-                time_column="date", group_by="title", every="1mo", maintain_order=True
-            )
+            grid.join(sums, on=["title", "month"], how="left")
             .with_columns(pl.col("sum").fill_null(0))
-            .group_by("title", "date")
-            .agg(pl.col("sum").sum())
-            .sort(["title", "date"])
-            .with_columns(date=(pl.col("date").dt.month()))
-            .pivot(index="title", on="date", values="sum", aggregate_function="sum")
-            .fill_null(0)
+            .sort(["title", "month"])
+            .pivot(index="title", on="month", values="sum")
             .with_columns(total_col=pl.sum_horizontal(pl.exclude("title")))
         )
 
         return self._apply_sorting(df)
 
-    def _pad_data_for_upsampling(self, data: list[dict]) -> list[dict]:
-        # Map every title to a set of its existing months
-        existing_months_map = defaultdict(set)
-        for item in data:
-            existing_months_map[item["title"]].add(item["date"].month)
-
-        # Pad missing boundaries using map
-        for title, months in existing_months_map.items():
-            item = {"sum": 0, "title": title}
-
-            if 1 not in months:
-                data.append(item | {"date": date(self.year, 1, 1)})
-
-            if 12 not in months:
-                data.append(item | {"date": date(self.year, 12, 1)})
-
-        return data
-
     def _apply_sorting(self, df: pl.DataFrame) -> pl.DataFrame:
         """Applies dynamic sorting based on the instance's order parameter."""
         if not self.order:
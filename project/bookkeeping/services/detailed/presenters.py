@@ -1,6 +1,6 @@
-from django.utils.text import slugify
 from django.utils.translation import gettext as _
 
+from ....core.models import MonthlyRollup
 from ....users.models import User
 from .builders import DetailedTableBuilder
 from .dtos import DetailedDto
@@ -27,18 +27,6 @@ def _get_categories(
     user: User, category: str, provider: DetailedDataProvider
 ) -> list[tuple[str, str, DetailedDto]]:
     match category:
-        case "all_data":
-            categories = [
-                (_("Incomes"), "income", provider.get_incomes()),
-                (_("Savings"), "saving", provider.get_savings()),
-            ]
-            categories.extend(
-                (f"{_('Expenses')} / {title}", slugify(title), dto)
-                for title, dto in provider.get_expenses().items()
-                if dto.data
-            )
-            return categories
-
         case "income":
             return [(_("Incomes"), "income", provider.get_incomes())]
 
@@ -54,7 +42,30 @@ def _get_categories(
             return [(title, category, provider.get_expense(expense_type.slug))]
 
 
-def load_service(user: User, category: str = "all_data", order: str = "") -> list[dict]:
+def load_categories(user: User) -> list[dict]:
+    """The year's tables without their data; the page loads each on its own."""
+    provider = DetailedDataProvider(user)
+    kinds = provider.get_kinds()
+
+    categories = [
+        {"title": title, "url_title": url_title}
+        for kind, title, url_title in (
+            (MonthlyRollup.Kind.INCOMES, _("Incomes"), "income"),
+            (MonthlyRollup.Kind.SAVINGS, _("Savings"), "saving"),
+        )
+        if kinds.get(kind)
+    ]
+
+    if expense_types := kinds.get(MonthlyRollup.Kind.EXPENSES):
+        categories.extend(
+            {"title": f"{_('Expenses')} / {title}", "url_title": slug}
+            for title, slug in provider.get_expense_types(expense_types)
+        )
+
+    return categories
+
+
+def load_service(user: User, category: str, order: str = "") -> list[dict]:
     provider = DetailedDataProvider(user)
     contexts = []
 
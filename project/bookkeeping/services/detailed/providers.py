@@ -1,5 +1,7 @@
 from collections import defaultdict
 
+from ....core.models import MonthlyRollup
+from ....core.services.model_services import MonthlyRollupModelService
 from ....expenses.services.model_services import (
     ExpenseModelService,
     ExpenseTypeModelService,
@@ -27,16 +29,28 @@ class DetailedDataProvider:
             data=list(SavingModelService(self.user).sum_by_month_and_type(self.year))
         )
 
-    def get_expenses(self) -> dict[str, DetailedDto]:
-        """Returns a dictionary mapping expense categories to their respective DTOs."""
-        qs = ExpenseModelService(self.user).sum_by_month_and_name(self.year)
+    def get_kinds(self) -> dict[str, set[int]]:
+        """Categories with records in the year by kind, from the monthly rollup."""
+        qs = (
+            MonthlyRollupModelService(self.user)
+            .year(self.year)
+            .values_list("kind", "category_id")
+            .distinct()
+        )
+
+        kinds = defaultdict(set)
+        for kind, category_id in qs:
+            kinds[kind].add(category_id)
 
-        grouped_data = defaultdict(list)
-        for record in qs:
-            group_key = record.pop("type_title")
-            grouped_data[group_key].append(record)
+        return kinds
 
-        return {title: DetailedDto(data=data) for title, data in grouped_data.items()}
+    def get_expense_types(self, pks: set[int]) -> list[tuple[str, str]]:
+        """(title, slug) of the expense types, ordered by title."""
+        return list(
+            ExpenseTypeModelService(self.user)
+            .objects.filter(pk__in=pks)
+            .values_list("title", "slug")
+        )
 
     def get_expense(self, category_slug: str) -> DetailedDto:
         """Fetches a single expense category filtered directly at the DB level."""
@@ -55,7 +55,7 @@ class ExpenseService:
     def table_context(self):
         return {
             "categories": self._types,
-            "data": it.zip_longest(self._balance, self._total_column),
+            "data": list(it.zip_longest(self._balance, self._total_column)),
             "total": self._total,
             "total_row": self._total_row,
             "avg": self._calc_total_avg(self._total_row),
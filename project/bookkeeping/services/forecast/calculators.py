@@ -1,6 +1,8 @@
 import statistics
 
-from .dtos import AveragesDTO, CurrentMonthDTO, ForecastDataDTO
+import numpy as np
+
+from .dtos import AveragesDTO, BandsDTO, CurrentMonthDTO, ForecastDataDTO, HistoryDTO
 
 
 class ForecastCalculator:
@@ -38,19 +40,85 @@ class ForecastCalculator:
             planned_incomes=float(self._data.planned_incomes[idx]),
         )
 
-    def forecast(self) -> float:
+    def incomes_left(self) -> np.ndarray:
+        """Incomes of the current month and of each month after it."""
+        current = self.current_month()
+        return np.array(
+            [max(current.incomes, current.planned_incomes)]
+            + self._data.planned_incomes[self._month :],
+            dtype=float,
+        )
+
+    def path(self) -> np.ndarray:
+        """Projected balance at the end of the current month and of each month
+        after it, spending the median month in every month left."""
         avg = self.medians()
         current = self.current_month()
         months_left = 12 - self._month
 
-        expenses = max(current.expenses, avg.expenses)
-        savings = max(current.savings, avg.savings)
-        incomes = max(current.incomes, current.planned_incomes)
+        expenses = np.full(months_left + 1, avg.expenses)
+        savings = np.full(months_left + 1, avg.savings)
+        expenses[0] = max(current.expenses, avg.expenses)
+        savings[0] = max(current.savings, avg.savings)
 
-        return (
-            self.balance()
-            + self.planned_incomes()
-            + incomes
-            - (expenses + avg.expenses * months_left)
-            - (savings + avg.savings * months_left)
-        )
+        return self.balance() + np.cumsum(self.incomes_left() - expenses - savings)
+
+    def forecast(self) -> float:
+        return float(self.path()[-1])
+
+
+class ForecastScenarios:
+    """Bootstrapped projections of the rest of the year.
+
+    Every scenario draws the expenses and savings of each month left from the
+    months already known, this year's and the prior years', one whole month at
+    a time, so a month heavy on expenses keeps its savings. All scenarios are
+    built at once as (scenarios, months) arrays.
+    """
+
+    def __init__(
+        self,
+        month: int,
+        data: ForecastDataDTO,
+        history: HistoryDTO,
+        size: int = 2000,
+        seed: int | None = None,
+    ):
+        self._calculator = ForecastCalculator(month, data)
+        self._data = data
+        self._past_idx = month - 1
+        self._history = history
+        self._size = size
+        self._rng = np.random.default_rng(seed)
+
+    def pool(self) -> np.ndarray:
+        """(expenses, savings) pairs of the known months with any data."""
+        idx = self._past_idx
+        expenses = np.array(self._history.expenses + self._data.expenses[:idx], float)
+        savings = np.array(self._history.savings + self._data.savings[:idx], float)
+        pool = np.column_stack((expenses, savings))
+        pool = pool[pool.any(axis=1)]
+
+        return pool if len(pool) else np.zeros((1, 2))
+
+    def paths(self) -> np.ndarray:
+        """Projected balance of every scenario, shape (size, months left)."""
+        current = self._calculator.current_month()
+        incomes = self._calculator.incomes_left()
+
+        pool = self.pool()
+        picks = self._rng.integers(len(pool), size=(self._size, len(incomes)))
+        drawn = pool[picks]
+        expenses, savings = drawn[..., 0], drawn[..., 1]
+
+        # what is already spent this month is spent in every scenario
+        expenses[:, 0] = np.maximum(expenses[:, 0], current.expenses)
+        savings[:, 0] = np.maximum(savings[:, 0], current.savings)
+
+        flow = incomes - expenses - savings
+        return self._calculator.balance() + np.cumsum(flow, axis=1)
+
+    def bands(self) -> BandsDTO:
+        p10, p50, p90 = np.percentile(self.paths(), [10, 50, 90], axis=0)
+
+        return BandsDTO(p10=p10.tolist(), p50=p50.tolist(), p90=p90.tolist())
@@ -10,6 +10,14 @@ class ForecastDataDTO:
     planned_incomes: list[int]
 
 
+@dataclass(frozen=True)
+class HistoryDTO:
+    """Monthly expenses and savings of the prior years, month by month."""
+
+    expenses: list[int]
+    savings: list[int]
+
+
 @dataclass(frozen=True)
 class AveragesDTO:
     expenses: float
@@ -22,3 +30,13 @@ class CurrentMonthDTO:
     savings: float
     incomes: float
     planned_incomes: float
+
+
+@dataclass(frozen=True)
+class BandsDTO:
+    """Projected balance at the end of each month left, from the current one
+    to December, at the 10th, 50th and 90th percentile of the scenarios."""
+
+    p10: list[float]
+    p50: list[float]
+    p90: list[float]
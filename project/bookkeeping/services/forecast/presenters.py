@@ -1,8 +1,12 @@
 from datetime import datetime
 from typing import cast
 
+from django.utils.translation import gettext as _
+
+from ....core.lib.context_cache import journal_cache
+from ....core.lib.translation import month_abbr
 from ....users.models import User
-from .calculators import ForecastCalculator
+from .calculators import ForecastCalculator, ForecastScenarios
 from .providers import ForecastDataProvider
 
 
@@ -15,6 +19,7 @@ def get_month(year: int) -> int:
     return 12 if year < now.year else now.month
 
 
+@journal_cache("forecast")
 def load_service(user: User) -> dict:
     year = cast(int, user.year)
     month = get_month(year)
@@ -22,12 +27,42 @@ def load_service(user: User) -> dict:
     provider = ForecastDataProvider(user)
     forecast_data = provider.get_forecast_data()
 
-    forecast_value = ForecastCalculator(month, forecast_data).forecast()
+    # the forecast row: every month left spends the median month of this year
+    path = ForecastCalculator(month, forecast_data).path()
+    forecast_value = float(path[-1])
+
+    # the P rows: percentiles of scenarios drawing whole months of this and the
+    # prior years, seeded by the year, so the same data renders the same bands
+    bands = ForecastScenarios(
+        month, forecast_data, provider.get_history(), seed=year
+    ).bands()
 
     beginning = provider.get_beginning_balance()
     end = beginning + forecast_value
 
     return {
+        "title": _("Median month"),
         "data": [beginning, end, forecast_value],
         "highlight": [False, False, True],
+        "bands": [
+            {"title": title, "data": [beginning, beginning + band[-1], band[-1]]}
+            for title, band in (
+                ("P10", bands.p10),
+                ("P50", bands.p50),
+                ("P90", bands.p90),
+            )
+        ],
+        # the end of the current month and of each month after it
+        "months": [
+            {
+                "title": month_abbr(month + i),
+                "data": [beginning, beginning + float(value), float(value)],
+                "bands": [
+                    beginning + bands.p10[i],
+                    beginning + bands.p50[i],
+                    beginning + bands.p90[i],
+                ],
+            }
+            for i, value in enumerate(path)
+        ],
     }
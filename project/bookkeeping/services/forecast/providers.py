@@ -3,13 +3,12 @@ from typing import cast
 from django.db.models import QuerySet, Sum
 
 from ....accounts.services.model_services import AccountBalanceModelService
-from ....expenses.services.model_services import ExpenseModelService
-from ....incomes.services.model_services import IncomeModelService
+from ....core.models import MonthlyRollup
+from ....core.services.model_services import MonthlyRollupModelService
 from ....plans.services.model_services import IncomePlanModelService
-from ....savings.services.model_services import SavingModelService
-from ....transactions.services.model_services import SavingCloseModelService
 from ....users.models import User
-from .dtos import ForecastDataDTO
+from ...lib.year_ledger import get_year_ledger
+from .dtos import ForecastDataDTO, HistoryDTO
 
 
 class MonthlyDataFormatter:
@@ -31,28 +30,48 @@ class MonthlyDataFormatter:
 
 
 class ForecastDataProvider:
+    # how many prior years of months the scenarios draw from
+    history_years = 3
+
     def __init__(self, user: User):
         self.user = user
         self.year = cast(int, user.year)
 
     def get_forecast_data(self) -> ForecastDataDTO:
-        incomes_qs = IncomeModelService(self.user).sum_by_month(self.year)
-        expenses_qs = ExpenseModelService(self.user).sum_by_month(self.year)
-        savings_qs = SavingModelService(self.user).sum_by_month(self.year)
-        savings_close_qs = SavingCloseModelService(self.user).sum_by_month(self.year)
-
+        ledger = get_year_ledger(self.user, self.year)
         planned_qs = (
             IncomePlanModelService(self.user).year(self.year).values("month", "price")
         )
 
         return ForecastDataDTO(
-            incomes=MonthlyDataFormatter.from_monthly_sum(incomes_qs),
-            expenses=MonthlyDataFormatter.from_monthly_sum(expenses_qs),
-            savings=MonthlyDataFormatter.from_monthly_sum(savings_qs),
-            savings_close=MonthlyDataFormatter.from_monthly_sum(savings_close_qs),
+            incomes=ledger.monthly("incomes"),
+            expenses=ledger.monthly("expenses"),
+            savings=ledger.monthly("savings"),
+            savings_close=ledger.monthly("savings_close"),
             planned_incomes=MonthlyDataFormatter.from_planned_data(planned_qs),
         )
 
+    def get_history(self) -> HistoryDTO:
+        first = self.year - self.history_years
+        kinds = (MonthlyRollup.Kind.EXPENSES, MonthlyRollup.Kind.SAVINGS)
+        qs = (
+            MonthlyRollupModelService(self.user)
+            .objects.filter(year__gte=first, year__lt=self.year, kind__in=kinds)
+            .values("kind", "year", "month")
+            .annotate(total=Sum("sum"))
+            .order_by()
+        )
+
+        months = {kind: [0] * 12 * self.history_years for kind in kinds}
+        for row in qs:
+            idx = (row["year"] - first) * 12 + row["month"] - 1
+            months[row["kind"]][idx] = row["total"]
+
+        return HistoryDTO(
+            expenses=months[MonthlyRollup.Kind.EXPENSES],
+            savings=months[MonthlyRollup.Kind.SAVINGS],
+        )
+
     def get_beginning_balance(self) -> int:
         return (
             AccountBalanceModelService(self.user)
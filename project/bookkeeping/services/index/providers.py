@@ -1,14 +1,9 @@
-import itertools as it
-
-from django.db.models import F, QuerySet, Sum
+from django.db.models import Sum
 
 from ....accounts.services.model_services import AccountBalanceModelService
-from ....debts.services.model_services import DebtModelService, DebtReturnModelService
-from ....expenses.services.model_services import ExpenseModelService
-from ....incomes.services.model_services import IncomeModelService
-from ....savings.services.model_services import SavingModelService
-from ....transactions.services.model_services import SavingCloseModelService
+from ....debts.services.model_services import DebtModelService
 from ....users.models import User
+from ...lib.year_ledger import get_year_ledger
 from .dtos import IndexDataDTO
 
 
@@ -33,25 +28,7 @@ class IndexDataProvider:
         )
 
     def _get_monthly_data(self) -> list[dict]:
-        return list(
-            it.chain(
-                IncomeModelService(self.user).sum_by_month(self.year),
-                ExpenseModelService(self.user).sum_by_month(self.year),
-                SavingModelService(self.user).sum_by_month(self.year),
-                SavingCloseModelService(self.user).sum_by_month(self.year),
-                self._get_debt_monthly("lend"),
-                self._get_debt_monthly("borrow"),
-                DebtReturnModelService(self.user, "lend").sum_by_month(self.year),
-                DebtReturnModelService(self.user, "borrow").sum_by_month(self.year),
-            )
-        )
-
-    def _get_debt_monthly(self, debt_type: str) -> QuerySet:
-        return (
-            DebtModelService(self.user, debt_type)
-            .sum_by_month(self.year, closed=True)
-            .values("date", "title", sum=F("sum_debt"))
-        )
+        return get_year_ledger(self.user, self.year).rows()
 
     def _get_debts(self) -> dict[str, dict]:
         return {
@@ -1,8 +1,5 @@
-from functools import reduce
-from operator import or_
-
-from django.db.models import Count, F, Max, Q
-from django.db.models.functions import ExtractYear
+from django.db.models import F, Window
+from django.db.models.functions import ExtractMonth, ExtractYear, RowNumber
 
 from ...core.services.model_services import BaseModelService
 from ...users.models import User
@@ -16,33 +13,36 @@ class CommonMethodsMixin:
     def items(self):
         raise NotImplementedError("Method items is not implemented.")
 
-    def latest_have(self, field: str):
-        qs = [
-            *(
-                self.objects.annotate(year=ExtractYear(F("date")))
-                .values("year", f"{field}_id")
-                .annotate(latest_date=Max("date"))
-                .order_by("year")
-            )
-        ]
-
-        # items = [ <Q AND( ('date': datetime), ('field_id': int) )>, ... ]
-        fld = f"{field}_id"
-        items = [Q(date=x["latest_date"]) & Q(**{fld: x[fld]}) for x in qs]
+    def latest_per_period(self, field: str, period: str = "year"):
+        """The latest worth record of every `field` category per year, or per
+        year and month with period="month", picked by a ROW_NUMBER() window
+        in a single query."""
+        periods = {
+            "year": {"year": ExtractYear("date")},
+            "month": {"year": ExtractYear("date"), "month": ExtractMonth("date")},
+        }
+        if period not in periods:
+            raise ValueError(f"Unknown period: {period}")
 
         return (
-            self.objects.filter(reduce(or_, items))
-            .annotate(c=Count("id"))
-            .values("c")
-            .annotate(year=ExtractYear(F("date")))
-            .values(
-                "year",
-                latest_check=F("date"),
-                category_id=F(f"{field}__id"),
-                have=F("price"),
+            self.objects.annotate(**periods[period])
+            .annotate(
+                row_number=Window(
+                    RowNumber(),
+                    partition_by=[F(f"{field}_id"), *map(F, periods[period])],
+                    order_by=[F("date").desc(), F("pk").desc()],
+                )
             )
-            if items
-            else None
+            .filter(row_number=1)
+            .order_by(*periods[period], f"{field}_id")
+        )
+
+    def latest_have(self, field: str):
+        return self.latest_per_period(field).values(
+            "year",
+            latest_check=F("date"),
+            category_id=F(f"{field}_id"),
+            have=F("price"),
         )
 
 
@@ -18,17 +18,20 @@ class MonthContextPresenter:
         self.dto = dto
 
     @cached_property
-    def month_table(self) -> MonthTableBuilder:
-        expense_df_object = MakeDataFrame(
+    def expense_frame(self) -> MakeDataFrame:
+        return MakeDataFrame(
             year=self.year,
             month=self.month,
             data=self.dto.expenses,
             columns=self.dto.expense_types,
         )
+
+    @cached_property
+    def month_table(self) -> MonthTableBuilder:
         saving_df_object = MakeDataFrame(
             year=self.year, month=self.month, data=self.dto.savings
         )
-        return MonthTableBuilder(expense_df_object.data, saving_df_object.data)
+        return MonthTableBuilder(self.expense_frame.data, saving_df_object.data)
 
     @cached_property
     def plans(self) -> PlanCalculateDaySum:
@@ -36,14 +39,8 @@ class MonthContextPresenter:
 
     @cached_property
     def spending(self) -> DaySpending:
-        expense_df_object = MakeDataFrame(
-            year=self.year,
-            month=self.month,
-            data=self.dto.expenses,
-            columns=self.dto.expense_types,
-        )
         return DaySpending(
-            expense=expense_df_object,
+            expense=self.expense_frame,
             necessary=self.dto.necessary_expense_types,
             per_day=self.plans.day_input,
             free=self.plans.expenses_free,
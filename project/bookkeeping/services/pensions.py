@@ -3,6 +3,7 @@ import itertools as it
 from django.utils.translation import gettext as _
 
 from ...core.lib import utils
+from ...core.lib.context_cache import journal_cache
 from ...pensions.services.model_services import PensionBalanceModelService
 from ...savings.services.model_services import SavingBalanceModelService
 
@@ -15,6 +16,7 @@ def get_data(user, year) -> list:
     return list(it.chain(savings_as_pensions, pensions))
 
 
+@journal_cache("pensions")
 def load_service(user, year: int) -> dict:
     data = get_data(user, year)
     fields = [
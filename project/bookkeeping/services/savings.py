@@ -5,6 +5,7 @@ from django.db.models import Sum
 from django.utils.translation import gettext as _
 
 from ...core.lib import utils
+from ...core.lib.context_cache import journal_cache
 from ...incomes.services.model_services import IncomeModelService
 from ...savings.services.model_services import (
     SavingBalanceModelService,
@@ -80,6 +81,7 @@ def get_data(user, year: int) -> SavingsDto:
     return SavingsService(user, year).get_data()
 
 
+@journal_cache("savings")
 def load_service(user, year: int) -> dict:
     dto = get_data(user, year)
     return SavingsPresenter(dto).as_dict()
@@ -6,6 +6,8 @@ from typing import NamedTuple
 import polars as pl
 from django.utils.translation import gettext as _
 
+from ...core.lib.context_cache import journal_cache
+from ...core.lib.year_cache import rows_by_year
 from ...pensions.services.model_services import PensionBalanceModelService
 from ...savings.services.model_services import SavingBalanceModelService
 
@@ -90,17 +92,27 @@ def chart_keys_map():
     ]
 
 
+@journal_cache("summary_savings")
 def get_data(user, saving_types: list = None):
     if saving_types is None:
         saving_types = ["funds", "shares", "pensions"]
 
+    # balances carry the earlier years over, so are cached as cumulative
     data = {
-        saving_type: list(
-            SavingBalanceModelService(user).sum_by_type().filter(type=saving_type)
+        saving_type: rows_by_year(
+            user,
+            f"saving_balances:{saving_type}",
+            SavingBalanceModelService(user).sum_by_type().filter(type=saving_type),
+            cumulative=True,
         )
         for saving_type in saving_types
     }
-    data["pensions2"] = list(PensionBalanceModelService(user).sum_by_year())
+    data["pensions2"] = rows_by_year(
+        user,
+        "pension_balances",
+        PensionBalanceModelService(user).sum_by_year(),
+        cumulative=True,
+    )
 
     return data
 
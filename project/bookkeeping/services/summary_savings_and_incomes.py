@@ -3,6 +3,7 @@ from dataclasses import dataclass, field
 from django.utils.translation import gettext as _
 
 from ...core.lib.date import years
+from ...core.lib.year_cache import rows_by_year
 from ...incomes.services.model_services import IncomeModelService
 from ...savings.services.model_services import SavingModelService
 from ...users.models import User
@@ -15,8 +16,12 @@ class Data:
     savings: list = field(init=False, default_factory=list)
 
     def __post_init__(self):
-        self.incomes = IncomeModelService(self.user).sum_by_year()
-        self.savings = SavingModelService(self.user).sum_by_year()
+        self.incomes = rows_by_year(
+            self.user, "incomes", IncomeModelService(self.user).sum_by_year()
+        )
+        self.savings = rows_by_year(
+            self.user, "savings", SavingModelService(self.user).sum_by_year()
+        )
 
 
 class Service:
@@ -1,5 +1,6 @@
 from django.utils.translation import gettext as _
 
+from ....core.lib.context_cache import journal_cache
 from .dtos import WealthDto
 
 
@@ -30,6 +31,7 @@ def build_context(dto: WealthDto) -> dict:
     }
 
 
+@journal_cache("wealth")
 def load_service(user, year: int) -> dict:
     from .providers import WealthDataProvider
 
@@ -112,3 +112,15 @@ def test_types(df):
     actual = BalanceBase(df).types
 
     assert actual == ["x", "y"]
+
+
+def test_metrics_computed_once(df, mocker):
+    collect_all = mocker.spy(pl, "collect_all")
+    obj = BalanceBase(df)
+
+    assert obj.total == 96
+    assert obj.total_row == {"x": 33, "y": 63}
+    assert obj.average == {"x": 11.0, "y": 21.0}
+    assert len(obj.total_column) == 4
+
+    assert collect_all.call_count == 1
@@ -187,3 +187,9 @@ def test_facade_preserves_public_attributes():
     actual = MakeDataFrame(year=1999, month=5, data=[], columns=["T1"])
     assert actual.year == 1999
     assert actual.month == 5
+
+
+def test_data_is_built_once(month_data, columns):
+    obj = MakeDataFrame(1999, month_data, columns, 1)
+
+    assert obj.data is obj.data
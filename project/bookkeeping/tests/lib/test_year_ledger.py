@@ -0,0 +1,69 @@
+from datetime import date
+
+import pytest
+
+from ....core.lib import request_memo
+from ....debts.tests.factories import (
+    BorrowFactory,
+    BorrowReturnFactory,
+    LendFactory,
+    LendReturnFactory,
+)
+from ....expenses.tests.factories import ExpenseFactory
+from ....incomes.tests.factories import IncomeFactory
+from ....savings.tests.factories import SavingFactory
+from ....transactions.tests.factories import SavingCloseFactory
+from ...lib.year_ledger import KINDS, YearLedger, get_year_ledger
+
+pytestmark = pytest.mark.django_db
+
+
+def test_year_ledger_months(main_user):
+    IncomeFactory(date=date(1999, 1, 1), price=1)
+    IncomeFactory(date=date(1999, 1, 31), price=2)
+    ExpenseFactory(date=date(1999, 3, 1), price=3)
+    SavingFactory(date=date(1999, 12, 1), price=4)
+    SavingCloseFactory(date=date(1999, 2, 1), price=5)
+    LendReturnFactory(debt=LendFactory(price=6), price=1)
+    BorrowReturnFactory(debt=BorrowFactory(price=7), price=2)
+    IncomeFactory(date=date(2000, 1, 1), price=99)
+
+    actual = get_year_ledger(main_user, 1999)
+
+    assert actual.monthly("incomes") == [3] + [0] * 11
+    assert actual.monthly("expenses") == [0, 0, 3] + [0] * 9
+    assert actual.monthly("savings") == [0] * 11 + [4]
+    assert actual.monthly("savings_close") == [0, 5] + [0] * 10
+    assert actual.monthly("lend")[0] == 6
+    assert actual.monthly("borrow")[0] == 7
+    assert actual.monthly("lend_return")[0] == 1
+    assert actual.monthly("borrow_return")[0] == 2
+
+
+def test_year_ledger_one_query(main_user, django_assert_num_queries):
+    IncomeFactory()
+    ExpenseFactory()
+
+    with django_assert_num_queries(1):
+        get_year_ledger(main_user, 1999)
+
+
+def test_year_ledger_shared_within_scope(main_user, django_assert_num_queries):
+    with django_assert_num_queries(1), request_memo.scope():
+        first = get_year_ledger(main_user, 1999)
+        second = get_year_ledger(main_user, 1999)
+
+    assert first is second
+
+
+def test_year_ledger_rows():
+    months = {kind: [0] * 12 for kind in KINDS}
+    months["incomes"][0] = 1
+    months["expenses"][11] = 2
+
+    actual = YearLedger(year=1999, months=months).rows()
+
+    assert actual == [
+        {"date": date(1999, 1, 1), "sum": 1, "title": "incomes"},
+        {"date": date(1999, 12, 1), "sum": 2, "title": "expenses"},
+    ]
@@ -60,6 +60,20 @@ def test_table_property_with_february_only(data):
     assert actual[0]["total_col"] == 2
 
 
+def test_table_property_sums_rows_of_same_month():
+    data = SimpleNamespace(
+        data=[
+            {"date": date(1999, 12, 1), "sum": 2, "title": "X"},
+            {"date": date(1999, 12, 1), "sum": 3, "title": "X"},
+        ]
+    )
+    actual = DetailedTableBuilder(data, 1999).table
+
+    assert list(actual[0]) == ["title", *map(str, range(1, 13)), "total_col"]
+    assert actual[0]["12"] == 5
+    assert actual[0]["total_col"] == 5
+
+
 def test_table_property_no_data():
     data = SimpleNamespace(data=[])
     actual = DetailedTableBuilder(data, 1999).table
@@ -1,11 +1,15 @@
 from datetime import date
 from types import SimpleNamespace
 
+import numpy as np
 import pytest
 import time_machine
 
-from ...services.forecast.calculators import ForecastCalculator
-from ...services.forecast.dtos import ForecastDataDTO
+from ....expenses.tests.factories import ExpenseFactory
+from ....savings.tests.factories import SavingFactory
+from ...lib.year_ledger import KINDS, YearLedger
+from ...services.forecast.calculators import ForecastCalculator, ForecastScenarios
+from ...services.forecast.dtos import ForecastDataDTO, HistoryDTO
 from ...services.forecast.presenters import get_month
 from ...services.forecast.providers import ForecastDataProvider, MonthlyDataFormatter
 
@@ -192,6 +196,90 @@ def test_forecast_current_month_savings_exceeds_average(data):
     assert actual == expect
 
 
+def test_path(data):
+    actual = ForecastCalculator(month=4, data=data).path()
+
+    # the median month is 2 of expenses and 5 of savings
+    assert actual.tolist() == [12, 13, 15, 8, 1, -6, -13, -20, -27]
+
+
+def test_path_ends_with_forecast(data):
+    calculator = ForecastCalculator(month=4, data=data)
+
+    assert calculator.path()[-1] == calculator.forecast()
+
+
+def test_path_december(data):
+    actual = ForecastCalculator(month=12, data=data).path()
+
+    assert len(actual) == 1
+
+
+def _history(expenses=None, savings=None):
+    return HistoryDTO(expenses=expenses or [0] * 12, savings=savings or [0] * 12)
+
+
+def test_scenarios_paths_shape(data):
+    actual = ForecastScenarios(month=4, data=data, history=_history(), size=50)
+
+    assert actual.paths().shape == (50, 9)
+
+
+def test_scenarios_pool_skips_empty_months(data):
+    history = _history(expenses=[7] + [0] * 11, savings=[0] * 11 + [8])
+
+    actual = ForecastScenarios(month=4, data=data, history=history).pool()
+
+    assert actual.tolist() == [[7, 0], [0, 8], [1, 4], [2, 5], [3, 6]]
+
+
+def test_scenarios_no_data(data_empty):
+    actual = ForecastScenarios(month=1, data=data_empty, history=_history()).bands()
+
+    assert actual.p10 == [0] * 12
+    assert actual.p90 == [0] * 12
+
+
+def test_scenarios_one_month_pool_is_the_median_path(data_empty):
+    data_empty.expenses[0] = 3
+    data_empty.savings[0] = 1
+    data_empty.planned_incomes[5] = 10
+
+    actual = ForecastScenarios(month=2, data=data_empty, history=_history())
+
+    expect = ForecastCalculator(month=2, data=data_empty).path().tolist()
+    assert actual.bands().p10 == expect
+    assert actual.bands().p90 == expect
+
+
+def test_scenarios_bands_are_ordered(data):
+    history = _history(expenses=list(range(1, 13)), savings=list(range(12, 0, -1)))
+
+    actual = ForecastScenarios(month=4, data=data, history=history, seed=1).bands()
+
+    assert np.all(np.array(actual.p10) <= np.array(actual.p50))
+    assert np.all(np.array(actual.p50) <= np.array(actual.p90))
+    assert actual.p10[-1] < actual.p90[-1]
+
+
+def test_scenarios_seed_repeats_bands(data):
+    history = _history(expenses=list(range(1, 13)))
+
+    first = ForecastScenarios(month=4, data=data, history=history, seed=1).bands()
+    second = ForecastScenarios(month=4, data=data, history=history, seed=1).bands()
+
+    assert first == second
+
+
+def test_scenarios_current_month_spent_in_every_scenario(data):
+    data.expenses[3] = 100
+
+    actual = ForecastScenarios(month=4, data=data, history=_history()).paths()
+
+    # 12 past balance + 7 planned incomes - 100 spent this month - >= 4 saved
+    assert np.all(actual[:, 0] <= 12 + 7 - 100 - 4)
+
+
 @time_machine.travel("1999-3-1")
 @pytest.mark.parametrize(
     "year, expected",
@@ -247,22 +335,14 @@ def test_monthly_data_formatter_from_planned_data():
 def test_forecast_data_provider_get_forecast_data(mocker, main_user):
     main_user.year = 1000
 
-    # 1. Mock the services to return fake database QuerySets
-    mock_income = mocker.patch(f"{MODULE_PATH}.providers.IncomeModelService")
-    mock_income.return_value.sum_by_month.return_value = [
-        {"date": date(1000, 1, 1), "sum": 100}
-    ]
-
-    mock_expense = mocker.patch(f"{MODULE_PATH}.providers.ExpenseModelService")
-    mock_expense.return_value.sum_by_month.return_value = [
-        {"date": date(1000, 2, 1), "sum": 50}
-    ]
-
-    mock_saving = mocker.patch(f"{MODULE_PATH}.providers.SavingModelService")
-    mock_saving.return_value.sum_by_month.return_value = []
-
-    mock_saving_close = mocker.patch(f"{MODULE_PATH}.providers.SavingCloseModelService")
-    mock_saving_close.return_value.sum_by_month.return_value = []
+    # 1. Mock the year ledger and the plans service
+    months = {kind: [0] * 12 for kind in KINDS}
+    months["incomes"][0] = 100
+    months["expenses"][1] = 50
+    mocker.patch(
+        f"{MODULE_PATH}.providers.get_year_ledger",
+        return_value=YearLedger(year=1000, months=months),
+    )
 
     mock_plan = mocker.patch(f"{MODULE_PATH}.providers.IncomePlanModelService")
     mock_plan.return_value.year.return_value.values.return_value = [
@@ -297,3 +377,22 @@ def test_forecast_data_provider_get_beginning_balance(mocker, main_user):
     assert actual == 1500
     mock_balance_service.return_value.objects.filter.assert_called_once_with(year=1000)
     mock_filter.aggregate.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_forecast_data_provider_get_history(main_user):
+    main_user.year = 2000
+    ExpenseFactory(date=date(1999, 12, 1), price=5)
+    ExpenseFactory(date=date(1999, 12, 31), price=6)
+    SavingFactory(date=date(1997, 1, 1), price=7)
+    # outside the history
+    ExpenseFactory(date=date(1996, 12, 1), price=1)
+    ExpenseFactory(date=date(2000, 1, 1), price=1)
+
+    actual = ForecastDataProvider(main_user).get_history()
+
+    assert len(actual.expenses) == 36
+    assert actual.expenses[-1] == 11
+    assert sum(actual.expenses) == 11
+    assert actual.savings[0] == 7
+    assert sum(actual.savings) == 7
@@ -21,7 +21,7 @@ def test_provider_empty_db(main_user):
 
 def test_provider_account_balance(main_user):
     AccountBalanceFactory()
-    AccountBalanceFactory()
+    AccountBalanceFactory(account__title="Account2")
 
     obj = WealthDataProvider(main_user, 1999).get_wealth_data()
 
@@ -30,7 +30,7 @@ def test_provider_account_balance(main_user):
 
 def test_provider_saving_balance(main_user):
     SavingBalanceFactory()
-    SavingBalanceFactory()
+    SavingBalanceFactory(saving_type__title="Savings2")
 
     obj = WealthDataProvider(main_user, 1999).get_wealth_data()
 
@@ -39,7 +39,7 @@ def test_provider_saving_balance(main_user):
 
 def test_provider_pension_balance(main_user):
     PensionBalanceFactory()
-    PensionBalanceFactory()
+    PensionBalanceFactory(pension_type__title="Pensions2")
 
     obj = WealthDataProvider(main_user, 1999).get_wealth_data()
 
@@ -85,6 +85,46 @@ def test_account_worth_have(main_user):
     assert actual[1]["have"] == 4
 
 
+def test_account_worth_have_is_one_query(main_user, django_assert_num_queries):
+    for month in range(1, 13):
+        AccountWorthFactory(date=dt(2000, month, 1, tzinfo=ZoneInfo("UTC")))
+
+    with django_assert_num_queries(1):
+        actual = list(AccountWorthModelService(main_user).have())
+
+    assert len(actual) == 1
+
+
+def test_account_worth_have_same_date_takes_last_entered(main_user):
+    date = dt(2000, 1, 1, tzinfo=ZoneInfo("UTC"))
+    AccountWorthFactory(date=date, price=1)
+    AccountWorthFactory(date=date, price=2)
+
+    actual = AccountWorthModelService(main_user).have()
+
+    assert [x["have"] for x in actual] == [2]
+
+
+def test_account_worth_latest_per_month(main_user):
+    AccountWorthFactory(date=dt(2000, 1, 1, tzinfo=ZoneInfo("UTC")), price=1)
+    AccountWorthFactory(date=dt(2000, 1, 15, tzinfo=ZoneInfo("UTC")), price=2)
+    AccountWorthFactory(date=dt(2000, 3, 1, tzinfo=ZoneInfo("UTC")), price=3)
+
+    actual = AccountWorthModelService(main_user).latest_per_period(
+        "account", period="month"
+    )
+
+    assert [(x.year, x.month, x.price) for x in actual] == [
+        (2000, 1, 2),
+        (2000, 3, 3),
+    ]
+
+
+def test_account_worth_latest_per_unknown_period(main_user):
+    with pytest.raises(ValueError):
+        AccountWorthModelService(main_user).latest_per_period("account", "week")
+
+
 # -------------------------------------------------------------------------------------
 #                                                                           SavingWorth
 # -------------------------------------------------------------------------------------
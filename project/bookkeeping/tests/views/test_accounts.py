@@ -1,9 +1,11 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import pytest
 import pytz
 from django.urls import resolve, reverse
+from django.utils import timezone
 
+from ....core.models import BalanceJob
 from ....savings.tests.factories import SavingFactory
 from ... import views
 from .. import factories
@@ -53,3 +55,29 @@ def test_regenerate_buttons(client_logged):
 
     assert f'hx-get="{url}?type=accounts"' in content
     assert "Bus atnaujinti tik šios lentelės balansai." in content
+
+
+def test_recalculating(client_logged, main_user, settings):
+    settings.BALANCE_SYNC_IN_WORKER = True
+    BalanceJob.objects.create(journal=main_user.journal, kind="accounts")
+
+    url = reverse("bookkeeping:accounts")
+    response = client_logged.get(url)
+    content = response.content.decode("utf-8")
+
+    assert response.context["recalculating"]
+    assert f'hx-get="{url}" hx-trigger="load delay:2s" hx-target="#accounts"' in content
+
+
+def test_recalculating_stalled(client_logged, main_user, settings):
+    settings.BALANCE_SYNC_IN_WORKER = True
+    BalanceJob.objects.create(journal=main_user.journal, kind="accounts")
+    BalanceJob.objects.update(created=timezone.now() - timedelta(hours=1))
+
+    url = reverse("bookkeeping:accounts")
+    response = client_logged.get(url)
+    content = response.content.decode("utf-8")
+
+    assert response.context["stalled"]
+    assert "bi-exclamation-triangle" in content
+    assert 'hx-trigger="load delay:2s"' not in content
@@ -1,3 +1,5 @@
+from datetime import date
+
 import factory
 import pytest
 from django.db.models.signals import post_save
@@ -32,8 +34,7 @@ def test_view_detailed_302(client):
     assert response.status_code == 302
 
 
-@factory.django.mute_signals(post_save)
-def test_view_detailed_rendered_expenses(client_logged, expenses):
+def test_view_detailed_shell_has_no_tables(client_logged, expenses):
     url = reverse("bookkeeping:detailed")
     response = client_logged.get(url)
 
@@ -41,8 +42,32 @@ def test_view_detailed_rendered_expenses(client_logged, expenses):
 
     content = response.content.decode("utf-8")
 
-    assert "Expense Name" in content
-    assert "Išlaidos / Expense Type" in content
+    assert "Expense Name" not in content
+    assert reverse("bookkeeping:detailed_table", args=["expense-type"]) in content
+
+
+def test_view_detailed_categories(client_logged):
+    IncomeFactory()
+    SavingFactory()
+    ExpenseFactory()
+
+    url = reverse("bookkeeping:detailed")
+    response = client_logged.get(url)
+
+    assert response.context["object_list"] == [
+        {"title": "Pajamos", "url_title": "income"},
+        {"title": "Taupymas", "url_title": "saving"},
+        {"title": "Išlaidos / Expense Type", "url_title": "expense-type"},
+    ]
+
+
+def test_view_detailed_categories_of_other_year(client_logged):
+    ExpenseFactory(date=date(1974, 1, 1))
+
+    url = reverse("bookkeeping:detailed")
+    response = client_logged.get(url)
+
+    assert response.context["object_list"] == []
 
 
 def test_view_detailed_no_expenses(client_logged):
@@ -53,7 +78,7 @@ def test_view_detailed_no_expenses(client_logged):
 
     content = response.content.decode("utf-8")
 
-    assert "Išlaidos / " not in content
+    assert "detailed/expense-type/" not in content
 
 
 def test_view_detailed_no_expenses_with_types(client_logged):
@@ -66,14 +91,33 @@ def test_view_detailed_no_expenses_with_types(client_logged):
 
     content = response.content.decode("utf-8")
 
-    assert "Išlaidos / Expense Type" not in content
+    assert "detailed/expense-type/" not in content
 
 
-@factory.django.mute_signals(post_save)
-def test_view_detailed_with_incomes(client_logged):
+def test_view_detailed_table_func():
+    view = resolve("/detailed/income/")
+
+    assert views.Detailed == view.func.view_class
+
+
+def test_view_detailed_table_expenses(client_logged):
+    ExpenseFactory()
+
+    url = reverse("bookkeeping:detailed_table", args=["expense-type"])
+    response = client_logged.get(url)
+
+    assert response.status_code == 200
+
+    content = response.content.decode("utf-8")
+
+    assert "Expense Name" in content
+    assert "Išlaidos / Expense Type" in content
+
+
+def test_view_detailed_table_incomes(client_logged):
     IncomeFactory()
 
-    url = reverse("bookkeeping:detailed")
+    url = reverse("bookkeeping:detailed_table", args=["income"])
     response = client_logged.get(url)
 
     assert response.status_code == 200
@@ -84,42 +128,41 @@ def test_view_detailed_with_incomes(client_logged):
     assert "Income Type" in content
 
 
-def test_view_detailed_no_incomes(client_logged):
-    url = reverse("bookkeeping:detailed")
+def test_view_detailed_table_no_incomes(client_logged):
+    url = reverse("bookkeeping:detailed_table", args=["income"])
     response = client_logged.get(url)
 
     assert response.status_code == 200
 
     content = response.content.decode("utf-8")
 
-    assert "<th>Pajamos</th>" not in content
-    assert "Income Type</td>" not in content
+    assert "Pajamos" not in content
+    assert "Income Type" not in content
 
 
-def test_view_detailed_no_savings(client_logged):
-    url = reverse("bookkeeping:detailed")
+def test_view_detailed_table_savings(client_logged):
+    SavingFactory()
+
+    url = reverse("bookkeeping:detailed_table", args=["saving"])
     response = client_logged.get(url)
 
     assert response.status_code == 200
 
     content = clean_content(response.content.decode("utf-8"))
 
-    assert "<th>Taupymas</th>" not in content
+    assert "Taupymas" in content
+    assert "Savings" in content
 
 
-@factory.django.mute_signals(post_save)
-def test_view_detailed_with_savings(client_logged):
-    SavingFactory()
-
-    url = reverse("bookkeeping:detailed")
+def test_view_detailed_table_no_savings(client_logged):
+    url = reverse("bookkeeping:detailed_table", args=["saving"])
     response = client_logged.get(url)
 
     assert response.status_code == 200
 
     content = clean_content(response.content.decode("utf-8"))
 
-    assert "Taupymas" in content
-    assert "Savings" in content
+    assert "Taupymas" not in content
 
 
 def test_view_detailed_category_func():
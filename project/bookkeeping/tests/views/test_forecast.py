@@ -1,4 +1,5 @@
 import pytest
+import time_machine
 from django.urls import resolve, reverse
 
 from ... import views
@@ -24,3 +25,30 @@ def test_302(client):
     response = client.get(url)
 
     assert response.status_code == 302
+
+
+def test_bands(client_logged):
+    url = reverse("bookkeeping:forecast")
+    response = client_logged.get(url)
+
+    assert [band["title"] for band in response.context["bands"]] == [
+        "P10",
+        "P50",
+        "P90",
+    ]
+    assert "P90" in response.content.decode()
+
+
+@time_machine.travel("1999-10-18")
+def test_months(client_logged):
+    url = reverse("bookkeeping:forecast")
+    response = client_logged.get(url)
+
+    months = response.context["months"]
+    forecast = response.context["data"]
+
+    # the current month and each month after it, ending with the forecast
+    assert [month["title"] for month in months] == ["Spa", "Lap", "Grd"]
+    assert months[-1]["data"] == forecast
+    assert all(len(month["bands"]) == 3 for month in months)
+    assert response.context["title"] == "Median month"
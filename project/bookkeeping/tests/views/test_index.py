@@ -1,6 +1,10 @@
 import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import resolve, reverse
 
+from ....core.lib import context_cache
 from ....pensions.tests.factories import PensionFactory
 from ....savings.tests.factories import SavingFactory
 from ... import views
@@ -8,6 +12,14 @@ from ... import views
 pytestmark = pytest.mark.django_db
 
 
+@pytest.fixture
+def locmem(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+
+
 def test_view_index_func():
     view = resolve("/")
 
@@ -73,8 +85,66 @@ def test_view_reload_200(client_logged):
     assert response.status_code == 200
 
 
+def test_view_reload_expenses_200(client_logged):
+    url = reverse("bookkeeping:reload_expenses")
+    response = client_logged.get(url)
+
+    assert response.status_code == 200
+    assert "expenses" in response.context
+    assert "balance" not in response.context
+
+
 def test_view_reload_anonymous(client):
     url = reverse("bookkeeping:reload_index")
     response = client.get(url)
 
     assert response.status_code == 302
+
+
+def test_view_index_server_timing(client_logged):
+    url = reverse("bookkeeping:index")
+    response = client_logged.get(url)
+
+    assert "accounts;dur=" in response["Server-Timing"]
+    assert "expenses;dur=" in response["Server-Timing"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_view_index_panels_on_threads(client_logged, settings):
+    settings.PANEL_WORKERS = 4
+    SavingFactory()
+
+    url = reverse("bookkeeping:index")
+    response = client_logged.get(url)
+
+    assert response.status_code == 200
+    assert "savings" in response.context
+    assert "balance" in response.context
+
+
+def test_view_index_cached(client_logged, main_user, locmem, django_assert_num_queries):
+    SavingFactory()
+
+    url = reverse("bookkeeping:index")
+    with CaptureQueriesContext(connection) as queries:
+        first = client_logged.get(url).content
+
+    # session, user, journal and the menu's count types; the rest is cached
+    with django_assert_num_queries(4):
+        second = client_logged.get(url).content
+
+    assert first == second
+    assert len(queries) > 4
+
+
+def test_view_index_cache_dropped_by_write(client_logged, main_user, locmem):
+    SavingFactory(price=1)
+
+    url = reverse("bookkeeping:index")
+    first = client_logged.get(url).content
+    version = context_cache.get_version(main_user.journal_id)
+
+    SavingFactory(price=1234)
+
+    assert context_cache.get_version(main_user.journal_id) != version
+    assert client_logged.get(url).content != first
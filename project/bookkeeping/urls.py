@@ -32,7 +32,17 @@ urlpatterns = [
     path("bookkeeping/forecast/", views.Forecast.as_view(), name="forecast"),
     path("bookkeeping/no_incomes/", views.NoIncomes.as_view(), name="no_incomes"),
     path("bookkeeping/reload_index/", views.ReloadIndex.as_view(), name="reload_index"),
+    path(
+        "bookkeeping/reload_expenses/",
+        views.ReloadExpenses.as_view(),
+        name="reload_expenses",
+    ),
     path("detailed/", views.Detailed.as_view(), name="detailed"),
+    path(
+        "detailed/<slug:category>/",
+        views.Detailed.as_view(),
+        name="detailed_table",
+    ),
     path(
         "detailed/<slug:category>/<slug:order>/",
         views.Detailed.as_view(),
@@ -1,4 +1,5 @@
 from datetime import date
+from functools import partial
 
 from django.shortcuts import render
 from django.urls import reverse_lazy
@@ -11,14 +12,17 @@ from project.bookkeeping.services.model_services import (
 )
 
 from ..accounts.services.model_services import AccountModelService
+from ..core.lib.context_cache import journal_cache
 from ..core.lib.date import monthnames_num
-from ..core.lib.utils import rendered_content
+from ..core.lib.utils import render_panels, rendered_content, server_timing
+from ..core.mixins.conditional import ConditionalGetMixin
 from ..core.mixins.formset import FormsetMixin
 from ..core.mixins.views import (
     CreateViewMixin,
     FormViewMixin,
     TemplateViewMixin,
 )
+from ..core.services import balance_jobs
 from ..pensions.services.model_services import PensionTypeModelService
 from ..savings.services.model_services import SavingTypeModelService
 from . import forms, services
@@ -26,50 +30,90 @@ from .lib import no_incomes
 from .mixins.month import MonthMixin
 
 
-class ReloadIndexContextDataMixin:
-    def get_context_data(self, **kwargs):
-        user = self.request.user
-        ind = services.index.load_service(user)
-        exp = services.expenses.load_service(user)
+@journal_cache("index")
+def _index_context(user) -> dict:
+    ind = services.index.load_service(user)
 
-        context = {
-            "year": user.year,
-            "averages": ind.averages_context(),
-            "borrow": ind.borrow_context(),
-            "lend": ind.lend_context(),
-            "balance_short": ind.balance_short_context(),
-            "balance": ind.balance_context(),
-            "chart_balance": ind.chart_balance_context(),
-            "chart_expenses": exp.chart_context(),
-            "expenses": exp.table_context(),
-        }
-        return super().get_context_data(**kwargs) | context
+    return {
+        "year": user.year,
+        "averages": ind.averages_context(),
+        "borrow": ind.borrow_context(),
+        "lend": ind.lend_context(),
+        "balance_short": ind.balance_short_context(),
+        "balance": ind.balance_context(),
+        "chart_balance": ind.chart_balance_context(),
+    }
 
 
-class Index(ReloadIndexContextDataMixin, TemplateViewMixin):
+@journal_cache("expenses")
+def _expenses_context(user) -> dict:
+    exp = services.expenses.load_service(user)
+
+    return {
+        "chart_expenses": exp.chart_context(),
+        "expenses": exp.table_context(),
+    }
+
+
+class Index(TemplateViewMixin):
     template_name = "bookkeeping/index.html"
 
     def get_context_data(self, **kwargs):
-        context = {
-            "accounts": rendered_content(self.request, Accounts, **self.kwargs),
-            "savings": rendered_content(self.request, Savings, **self.kwargs),
-            "pensions": rendered_content(self.request, Pensions, **self.kwargs),
-            "wealth": rendered_content(self.request, Wealth, **self.kwargs),
-            "no_incomes": rendered_content(self.request, NoIncomes, **self.kwargs),
+        user = self.request.user
+        views = {
+            "accounts": Accounts,
+            "savings": Savings,
+            "pensions": Pensions,
+            "wealth": Wealth,
+            "no_incomes": NoIncomes,
+        }
+        panels = {
+            name: partial(rendered_content, self.request, view, **self.kwargs)
+            for name, view in views.items()
         }
+        panels["index"] = partial(_index_context, user)
+        panels["expenses"] = partial(_expenses_context, user)
+
+        context = render_panels(self.request, panels)
+        context |= context.pop("index") | context.pop("expenses")
+
         return super().get_context_data(**kwargs) | context
 
+    def render_to_response(self, context, **response_kwargs):
+        response = super().render_to_response(context, **response_kwargs)
+        response["Server-Timing"] = server_timing(self.request.panel_timings)
+
+        return response
 
-class ReloadIndex(ReloadIndexContextDataMixin, TemplateViewMixin):
+
+class ReloadIndex(ConditionalGetMixin, TemplateViewMixin):
     template_name = "bookkeeping/includes/reload_index.html"
 
+    def get_context_data(self, **kwargs):
+        context = _index_context(self.request.user)
+
+        return super().get_context_data(**kwargs) | context
 
-class Accounts(TemplateViewMixin):
+
+class ReloadExpenses(ConditionalGetMixin, TemplateViewMixin):
+    template_name = "bookkeeping/includes/reload_expenses.html"
+
+    def get_context_data(self, **kwargs):
+        context = _expenses_context(self.request.user)
+
+        return super().get_context_data(**kwargs) | context
+
+
+class Accounts(ConditionalGetMixin, TemplateViewMixin):
     template_name = "bookkeeping/includes/account_worth_list.html"
 
     def get_context_data(self, **kwargs):
         user = self.request.user
         context = services.accounts.load_service(user, user.year)
+        context["recalculating"] = balance_jobs.is_recalculating(user, "accounts")
+        context["stalled"] = context["recalculating"] and balance_jobs.is_stalled(
+            user, "accounts"
+        )
 
         return super().get_context_data(**kwargs) | context
 
@@ -83,12 +127,16 @@ class AccountsWorthNew(FormsetMixin, CreateViewMixin):
     hx_trigger_django = "afterAccountWorthNew"
 
 
-class Savings(TemplateViewMixin):
+class Savings(ConditionalGetMixin, TemplateViewMixin):
     template_name = "bookkeeping/savings.html"
 
     def get_context_data(self, **kwargs):
         user = self.request.user
         context = services.savings.load_service(user, user.year)
+        context["recalculating"] = balance_jobs.is_recalculating(user, "savings")
+        context["stalled"] = context["recalculating"] and balance_jobs.is_stalled(
+            user, "savings"
+        )
         return super().get_context_data(**kwargs) | context
 
 
@@ -101,12 +149,16 @@ class SavingsWorthNew(FormsetMixin, CreateViewMixin):
     hx_trigger_django = "afterSavingWorthNew"
 
 
-class Pensions(TemplateViewMixin):
+class Pensions(ConditionalGetMixin, TemplateViewMixin):
     template_name = "bookkeeping/includes/funds_table.html"
 
     def get_context_data(self, **kwargs):
         user = self.request.user
         context = services.pensions.load_service(user, user.year)
+        context["recalculating"] = balance_jobs.is_recalculating(user, "pensions")
+        context["stalled"] = context["recalculating"] and balance_jobs.is_stalled(
+            user, "pensions"
+        )
 
         return super().get_context_data(**kwargs) | context
 
@@ -120,7 +172,7 @@ class PensionsWorthNew(FormsetMixin, CreateViewMixin):
     hx_trigger_django = "afterPensionWorthNew"
 
 
-class Wealth(TemplateViewMixin):
+class Wealth(ConditionalGetMixin, TemplateViewMixin):
     template_name = "cotton/info_table.html"
 
     def get_context_data(self, **kwargs):
@@ -129,7 +181,7 @@ class Wealth(TemplateViewMixin):
         return super().get_context_data(**kwargs) | context
 
 
-class Forecast(TemplateViewMixin):
+class Forecast(ConditionalGetMixin, TemplateViewMixin):
     template_name = "bookkeeping/includes/forecast.html"
 
     def get_context_data(self, **kwargs):
@@ -138,7 +190,7 @@ class Forecast(TemplateViewMixin):
         return super().get_context_data(**kwargs) | context
 
 
-class NoIncomes(TemplateViewMixin):
+class NoIncomes(ConditionalGetMixin, TemplateViewMixin):
     template_name = "bookkeeping/includes/no_incomes.html"
 
     def get_context_data(self, **kwargs):
@@ -171,25 +223,28 @@ class Detailed(TemplateViewMixin):
         return ["bookkeeping/detailed.html"]
 
     def get_context_data(self, **kwargs):
-        category = self.kwargs.get("category", "all_data")
+        context = super().get_context_data(**kwargs)
+
+        # the page is a shell, each of its tables is loaded on its own
+        if "category" not in self.kwargs:
+            context["object_list"] = services.detailed.load_categories(
+                self.request.user
+            )
+            return context
+
+        category = self.kwargs["category"]
         order = self.kwargs.get("order", "")
 
         service_data = services.detailed.load_service(
             user=self.request.user, category=category, order=order
         )
 
-        context = super().get_context_data(**kwargs)
         context |= {
             "order": order,
             "months": monthnames_num(),
         }
 
-        if not service_data:
-            return context
-
-        if category == "all_data":
-            context["object_list"] = service_data
-        else:
+        if service_data:
             context |= service_data[0]
 
         return context
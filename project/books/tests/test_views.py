@@ -3,9 +3,11 @@ from datetime import date
 
 import pytest
 import time_machine
+from django.core.cache import cache
 from django.urls import resolve, reverse
 from django.utils.translation import gettext as _
 
+from ...core.services import search_index
 from ...users.tests.factories import UserFactory
 from .. import models, views
 from .factories import Book, BookFactory, BookTargetFactory
@@ -13,6 +15,14 @@ from .factories import Book, BookFactory, BookTargetFactory
 pytestmark = pytest.mark.django_db
 
 
+@pytest.fixture
+def locmem(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+
+
 # ----------------------------------------------------------------------------
 #                                                             Books Index View
 # ----------------------------------------------------------------------------
@@ -269,6 +279,31 @@ def test_list_all_books_lists_another_year(client_logged):
     assert "1974-01-01" in actual
 
 
+def test_list_count_is_cached(client_logged, locmem, mocker):
+    BookFactory()
+    url = reverse("books:list")
+    client_logged.get(url)
+
+    count = mocker.spy(views.Lists, "get_count")
+    mocker.patch("django.db.models.QuerySet.count", side_effect=AssertionError)
+    response = client_logged.get(url)
+
+    assert count.call_count == 1
+    assert response.context["first_item"] == 1
+
+
+def test_list_count_follows_new_book(client_logged, locmem):
+    BookFactory()
+    url = reverse("books:list")
+    client_logged.get(url, {"tab": "all"})
+
+    BookFactory(started=date(1974, 1, 1), ended=date(1974, 1, 31))
+    response = client_logged.get(url, {"tab": "all"})
+
+    assert response.context["first_item"] == 2
+    assert len(response.context["object_list"]) == 2
+
+
 def test_list_empty_state_names_the_year(client_logged):
     url = reverse("books:list")
     actual = client_logged.get(url).content.decode("utf-8")
@@ -572,6 +607,8 @@ def test_search_pagination_first_page(client_logged):
     u = UserFactory()
     i = BookFactory.build_batch(51, user=u)
     Book.objects.bulk_create(i)
+    # bulk_create skips the signals keeping the search index
+    search_index.rebuild()
 
     url = reverse("books:search")
     response = client_logged.get(url, {"search": "title"})
@@ -584,6 +621,8 @@ def test_search_pagination_second_page(client_logged):
     u = UserFactory()
     i = BookFactory.build_batch(51, user=u)
     Book.objects.bulk_create(i)
+    # bulk_create skips the signals keeping the search index
+    search_index.rebuild()
 
     url = reverse("books:search")
 
@@ -593,6 +632,25 @@ def test_search_pagination_second_page(client_logged):
     assert actual.count("Author") == 1
 
 
+def test_search_pagination_next_page_by_cursor(client_logged):
+    u = UserFactory()
+    i = BookFactory.build_batch(51, user=u)
+    Book.objects.bulk_create(i)
+    # bulk_create skips the signals keeping the search index
+    search_index.rebuild()
+
+    url = reverse("books:search")
+    first = client_logged.get(url, {"search": "author"}).context["object_list"]
+
+    response = client_logged.get(
+        url, {"page": 2, "search": "author", "cursor": first.next_cursor}
+    )
+    actual = response.content.decode("utf-8")
+
+    assert first.next_cursor
+    assert actual.count("Author") == 1
+
+
 # -------------------------------------------------------------------------------------
 #                                                                  Target Create/Update
 # -------------------------------------------------------------------------------------
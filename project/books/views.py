@@ -71,7 +71,10 @@ class Lists(ListViewMixin):
         tab = self.request.GET.get("tab")
         sql = self.get_queryset()
         paginator = CountlessPaginator(
-            query=sql, total_records=len(sql), per_page=self.per_page
+            query=sql,
+            total_records=self.get_count(sql),
+            per_page=self.per_page,
+            keyset=True,
         )
         page_range = paginator.get_elided_page_range(page=page)
 
@@ -84,7 +87,7 @@ class Lists(ListViewMixin):
 
         context = {
             "notice": notice,
-            "object_list": paginator.get_page(page),
+            "object_list": paginator.get_page(page, self.request.GET.get("cursor")),
             "url": reverse("books:list"),
             "tab": tab,
             "first_item": paginator.count - paginator.per_page * (page - 1),
@@ -113,9 +113,29 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django_htmx.middleware.HtmxMiddleware",
+    "project.core.middleware.BalanceSyncMiddleware",
+    "project.core.middleware.RequestMemoMiddleware",
+    "project.core.middleware.FragmentTriggerMiddleware",
 ]
 
 
+# Balance syncs triggered by signals wait for the request or transaction
+# to finish and then run once per journal and ledger
+BALANCE_SYNC_ON_COMMIT = True
+
+# Hand the balance syncs to the balance_worker command instead of running
+# them in the request; off, they run synchronously
+BALANCE_SYNC_IN_WORKER = False
+
+# Threads rendering the panels of a page like the bookkeeping index, each
+# with its own database connection; 1 renders them one after another
+PANEL_WORKERS = 1
+
+# Seconds the dashboard contexts stay cached; any save in the journal makes
+# its cached contexts stale sooner
+CONTEXT_CACHE_TIMEOUT = 60 * 60 * 24
+
+
 SESSION_SERIALIZER = "django.contrib.sessions.serializers.JSONSerializer"
 
 
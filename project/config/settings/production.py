@@ -29,6 +29,17 @@ MIDDLEWARE += [
 ]
 
 
+# one cache for all processes, the balance_worker's included, so a write seen
+# by one drops the context and year caches of the others; its table is made
+# by `manage.py createcachetable`
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "cache",
+    }
+}
+
+
 SECURE_CSP = {
     "default-src": [CSP.SELF],
     "script-src": [CSP.SELF, CSP.NONCE, CSP.UNSAFE_EVAL],
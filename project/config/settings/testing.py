@@ -17,6 +17,9 @@ DATABASES = {
     }
 }
 
+# test transactions are rolled back, on_commit callbacks would never run
+BALANCE_SYNC_ON_COMMIT = False
+
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
 
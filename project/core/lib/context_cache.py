@@ -0,0 +1,101 @@
+"""
+Cache of the contexts the dashboard services build, in Django's default cache.
+
+A context is stored under the journal's data version, the user's year, the
+service, the active language and today's date. Any save in a journal bumps its
+version, so the contexts built before it are never read again and simply
+expire. With several processes use a cache they share (file, database,
+memcached): the local-memory cache only sees the bumps of its own process.
+"""
+
+import hashlib
+import time
+from datetime import date
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import QuerySet
+from django.utils import translation
+
+from ...users.models import User
+from . import request_memo
+
+
+def _version_key(journal_id: int) -> str:
+    return f"journal-data:{journal_id}"
+
+
+def bump(journal_id: int) -> None:
+    """Mark the journal's data as changed. The version is a new token rather
+    than an increment, so a version lost from the cache never comes back."""
+    cache.set(_version_key(journal_id), time.time_ns(), None)
+    request_memo.clear()
+
+
+def get_version(journal_id: int) -> Optional[int]:
+    """The journal's data version; None if the cache keeps nothing."""
+    key = _version_key(journal_id)
+
+    if (version := cache.get(key)) is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+
+    return version
+
+
+def journal_cache(service: str) -> Callable:
+    """Cache what `func(user, *args)` returns until the user's journal changes.
+
+    The arguments after the user are part of the key, so they have to be
+    plain values like a year.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(user: User, *args, **kwargs):
+            parts = (
+                *args,
+                *(f"{name}={value}" for name, value in sorted(kwargs.items())),
+            )
+            return _cached(user, service, parts, lambda: func(user, *args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+def journal_count(user: User, queryset: QuerySet) -> int:
+    """The queryset's count, cached like a context under a digest of its SQL,
+    so whatever filters the queryset tells the counts apart."""
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.blake2b(f"{sql}:{params!r}".encode(), digest_size=16)
+
+    return _cached(user, "count", (digest.hexdigest(),), queryset.count)
+
+
+def _cached(user: User, service: str, parts: tuple, build: Callable) -> Any:
+    version = get_version(user.journal_id)
+    if version is None:
+        return build()
+
+    key = ":".join(
+        str(part)
+        for part in (
+            "context",
+            user.journal_id,
+            version,
+            service,
+            user.year,
+            translation.get_language(),
+            date.today(),
+            *parts,
+        )
+    )
+
+    if (context := cache.get(key)) is None:
+        context = build()
+        cache.set(key, context, settings.CONTEXT_CACHE_TIMEOUT)
+
+    return context
@@ -1,12 +1,14 @@
-from typing import Tuple
+from typing import Optional, Tuple
 
 import polars as pl
+from django.db import connections, router
 from django.db import transaction as django_transaction
 from django.utils import timezone
 
 from ...pensions import models as pension
 from ...savings import models as saving
 from ...users.models import User
+from .signals import SyncScope
 
 ACCOUNT_FIELDS = [
     "incomes",
@@ -34,27 +36,38 @@ SAVING_FIELDS = [
 ]
 
 
+def balance_fields(model) -> Tuple[str, list[str]]:
+    """The category FK column and the value columns of a balance table."""
+    match model:
+        case saving.SavingBalance:
+            return "saving_type_id", SAVING_FIELDS
+
+        case pension.PensionBalance:
+            return "pension_type_id", SAVING_FIELDS
+
+        case _:
+            return "account_id", ACCOUNT_FIELDS
+
+
 class BalanceSynchronizer:
     KEY_FIELDS = ["category_id", "year"]
 
-    def __init__(self, model_service_class, user: User, df: pl.LazyFrame) -> None:
+    def __init__(
+        self,
+        model_service_class,
+        user: User,
+        df: pl.LazyFrame,
+        scope: Optional[SyncScope] = None,
+        stored: Optional[list[dict]] = None,
+    ) -> None:
         self.model_service_class = model_service_class
         self.user = user
+        self.scope = scope
+        self.stored = stored
 
         service = model_service_class(self.user)
 
-        match service.objects.model:
-            case saving.SavingBalance:
-                self.fk_field = "saving_type_id"
-                self.fields = SAVING_FIELDS
-
-            case pension.PensionBalance:
-                self.fk_field = "pension_type_id"
-                self.fields = SAVING_FIELDS
-
-            case _:
-                self.fk_field = "account_id"
-                self.fields = ACCOUNT_FIELDS
+        self.fk_field, self.fields = balance_fields(service.objects.model)
 
         self.df = df
         self.df_db = self._get_existing_records()
@@ -62,12 +75,8 @@ class BalanceSynchronizer:
         self.sync()
 
     def _get_existing_records(self) -> pl.LazyFrame:
-        # Select only necessary fields to reduce memory usage
-        records = [
-            *self.model_service_class(self.user).objects.values(
-                "id", self.fk_field, "year", *self.fields
-            )
-        ]
+        records = self.stored if self.stored is not None else self._stored_records()
+
         if not records:
             return pl.LazyFrame()
 
@@ -79,16 +88,31 @@ class BalanceSynchronizer:
 
         return df_db
 
-    def _identify_operations(self) -> Tuple[pl.LazyFrame, pl.LazyFrame, pl.LazyFrame]:
+    def _stored_records(self):
+        qs = self.model_service_class(self.user).objects
+
+        # rows outside the rebuilt slice are neither read nor touched
+        if self.scope:
+            qs = qs.filter(
+                **{
+                    f"{self.fk_field}__in": self.scope.category_ids,
+                    "year__gte": self.scope.first_year,
+                }
+            )
+
+        # Select only necessary fields to reduce memory usage
+        return [*qs.values("id", self.fk_field, "year", *self.fields)]
+
+    def _identify_operations(self) -> Tuple[pl.LazyFrame, pl.LazyFrame]:
         empty_df = pl.LazyFrame()
 
         if self.df_db.limit(1).collect().is_empty():
-            return self.df, empty_df, empty_df
+            return self.df, empty_df
 
         if self.df.limit(1).collect().is_empty():
-            return empty_df, empty_df, self.df_db
+            return empty_df, self.df_db
 
-        return self._insert_df(), self._update_df(), self._delete_df()
+        return pl.concat([self._insert_df(), self._update_df()]), self._delete_df()
 
     def _delete_df(self) -> pl.LazyFrame:
         df_keys = self.df.select(self.KEY_FIELDS).unique()
@@ -114,60 +138,47 @@ class BalanceSynchronizer:
         if df.is_empty():
             return
 
-        category_ids = df["category_id"].unique().to_list()
-        years = df["year"].unique().to_list()
         self.model_service_class(self.user).objects.filter(
-            **{f"{self.fk_field}__in": category_ids, "year__in": years}
+            id__in=df["id"].to_list()
         ).delete()
 
-    def _insert_records(self, data: pl.LazyFrame) -> None:
+    def _upsert_records(self, data: pl.LazyFrame) -> None:
+        """Insert new rows and update changed ones in one batch, matched on the
+        (category, year) unique key. MySQL takes no conflict target: its
+        ON DUPLICATE KEY UPDATE matches on that key by itself."""
         df = data.collect()
 
         if df.is_empty():
             return
 
-        if objects := [self._create_object(row) for row in df.to_dicts()]:
-            self.model_service_class(self.user).objects.bulk_create(objects)
-
-    def _update_records(self, data: pl.LazyFrame) -> None:
-        if data.limit(1).collect().is_empty():
-            return
-
-        df_map = self.df_db.select(["id", "year", "category_id"])
-
-        updates_with_id = (
-            data.join(df_map, on=self.KEY_FIELDS, how="left").collect().to_dicts()
+        model = self.model_service_class(self.user).objects.model
+        rows = df.select(
+            pl.col("category_id").alias(self.fk_field),
+            "year",
+            *self.fields,
+        ).with_columns(
+            pl.col("latest_check")
+            .cast(pl.Datetime)
+            .dt.replace_time_zone(timezone.get_current_timezone_name())
         )
 
-        if objects := [
-            self._create_object(row, update=True) for row in updates_with_id
-        ]:
-            self.model_service_class(self.user).objects.bulk_update(
-                objects, self.fields
-            )
-
-    def _create_object(self, row: dict, update: bool = False):
-        """Create an self.model_service_class object from a row."""
-        fields = {field: row[field] for field in self.fields}
-        fields["latest_check"] = (
-            timezone.make_aware(row["latest_check"]) if row["latest_check"] else None
+        features = connections[router.db_for_write(model)].features
+        unique_fields = (
+            [self.fk_field.removesuffix("_id"), "year"]
+            if features.supports_update_conflicts_with_target
+            else None
         )
-        fields[self.fk_field] = row["category_id"]
-        fields["year"] = row["year"]
-
-        # Set the ID from database for updates
-        if update:
-            fields["id"] = row["id"]
 
-        service = self.model_service_class(self.user)
-        model_class = service.objects.model
-
-        return model_class(**fields)
+        model.objects.bulk_create(
+            [model(**row) for row in rows.iter_rows(named=True)],
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=self.fields,
+        )
 
     def sync(self) -> None:
-        inserts, updates, deletes = self._identify_operations()
+        upserts, deletes = self._identify_operations()
 
         with django_transaction.atomic():
             self._delete_records(deletes)
-            self._insert_records(inserts)
-            self._update_records(updates)
+            self._upsert_records(upserts)
@@ -0,0 +1,101 @@
+"""
+Which dashboard fragments a write makes stale.
+
+Every write marks the kind of data it changed. When an HTMX request that wrote
+something ends, its response triggers the reload event of each fragment that
+depends on one of those kinds, e.g. `fragmentAccounts`, and of no other. A
+fragment listens to its event with `hx-trigger="fragmentAccounts from:body"`.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from django.db import models
+
+from ...accounts import models as account
+from ...bookkeeping import models as bookkeeping
+from ...debts import models as debt
+from ...expenses import models as expense
+from ...incomes import models as income
+from ...pensions import models as pension
+from ...savings import models as saving
+from ...transactions import models as transaction
+
+KINDS = {
+    income.Income: "incomes",
+    expense.Expense: "expenses",
+    saving.Saving: "savings",
+    pension.Pension: "pensions",
+    transaction.Transaction: "transactions",
+    transaction.SavingClose: "transactions",
+    transaction.SavingChange: "transactions",
+    debt.Debt: "debts",
+    debt.DebtReturn: "debts",
+    bookkeeping.AccountWorth: "account_worth",
+    bookkeeping.SavingWorth: "saving_worth",
+    bookkeeping.PensionWorth: "pension_worth",
+    account.Account: "categories",
+    income.IncomeType: "categories",
+    expense.ExpenseType: "categories",
+    saving.SavingType: "categories",
+    pension.PensionType: "categories",
+}
+
+_ACCOUNTS = {
+    "incomes",
+    "expenses",
+    "savings",
+    "transactions",
+    "debts",
+    "account_worth",
+    "categories",
+}
+_SAVINGS = {"savings", "transactions", "saving_worth", "categories"}
+_PENSIONS = _SAVINGS | {"pensions", "pension_worth"}
+
+# fragment -> the kinds of data it is built from
+FRAGMENTS = {
+    "accounts": _ACCOUNTS,
+    "savings": _SAVINGS,
+    "pensions": _PENSIONS,
+    "wealth": _ACCOUNTS | _PENSIONS,
+    "no_incomes": _ACCOUNTS | _PENSIONS,
+    "balance": {
+        "incomes",
+        "expenses",
+        "savings",
+        "transactions",
+        "debts",
+        "categories",
+    },
+    "expenses": {"expenses", "categories"},
+}
+
+_changed: ContextVar[Optional[set]] = ContextVar("changed_data", default=None)
+
+
+@contextmanager
+def collect():
+    """Collect the kinds of data changed inside the block."""
+    token = _changed.set(set())
+    try:
+        yield _changed.get()
+    finally:
+        _changed.reset(token)
+
+
+def mark_changed(model: type[models.Model]) -> None:
+    """Note that rows of the model were written; outside `collect` a no-op."""
+    if (changed := _changed.get()) is not None and (kind := KINDS.get(model)):
+        changed.add(kind)
+
+
+def event(fragment: str) -> str:
+    """The reload event of a fragment, e.g. no_incomes -> fragmentNoIncomes."""
+    return "fragment" + fragment.title().replace("_", "")
+
+
+def events(changed: set[str]) -> list[str]:
+    """The reload events of the fragments built from the changed data."""
+    return [event(name) for name, kinds in FRAGMENTS.items() if kinds & changed]
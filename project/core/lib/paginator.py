@@ -1,8 +1,26 @@
 import collections
+import json
+from functools import reduce
+from operator import or_
+from typing import Optional
 
+from django.core import signing
 from django.core.paginator import EmptyPage, PageNotAnInteger
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, OrderBy, Q
 from django.utils.translation import gettext_lazy as _
 
+CURSOR_SALT = "paginator.cursor"
+
+
+class CursorSerializer(signing.JSONSerializer):
+    """JSON that takes dates too, as the ordering keys of a row often are."""
+
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(",", ":"), cls=DjangoJSONEncoder).encode(
+            "latin-1"
+        )
+
 
 class CountlessPage(collections.abc.Sequence):
     def __init__(
@@ -12,6 +30,10 @@ class CountlessPage(collections.abc.Sequence):
         self.current_page = current_page
         self.page_size = page_size
 
+        # opaque cursors to the pages around this one, set in the keyset mode
+        self.next_cursor = None
+        self.previous_cursor = None
+
         self._has_next = self.current_page < total_pages
         self._has_previous = self.current_page > 1
 
@@ -47,12 +69,25 @@ class CountlessPage(collections.abc.Sequence):
 
 
 class CountlessPaginator:
+    """
+    Paginator that is told the number of records instead of counting them.
+
+    In the keyset mode a queryset is read page by page on its ordering keys,
+    the primary key last, instead of LIMIT/OFFSET: the next and previous pages
+    are reached with the cursor the page hands out, which holds the keys of
+    its last or first row, so a deep page does not make the database read and
+    discard every earlier row. A page asked for by its number alone, like the
+    first and last pages of the elided range, is read with an offset from
+    whichever end of the results is nearer.
+    """
+
     ELLIPSIS = "…"
 
-    def __init__(self, query, total_records, per_page) -> None:
+    def __init__(self, query, total_records, per_page, keyset=False) -> None:
         self.query = query
         self.total_records = total_records
         self.per_page = per_page
+        self.keyset = keyset
 
     def validate_number(self, number):
         try:
@@ -67,19 +102,106 @@ class CountlessPaginator:
 
         return number
 
-    def get_page(self, page):
+    def get_page(self, page, cursor=None):
         try:
             page = self.validate_number(page)
         except (PageNotAnInteger, EmptyPage):
             page = 1
-        return self.page(page)
+        return self.page(page, cursor)
+
+    def page(self, current_page, cursor=None):
+        if not self.keyset or (keys := self._keys()) is None:
+            bottom = (current_page - 1) * self.per_page
+            top = bottom + self.per_page
+            query = self.query[bottom:top]
+
+            return CountlessPage(query, self.total_pages, current_page, self.per_page)
+
+        query = self.query.order_by(*(f"-{key}" if desc else key for key, desc in keys))
+        query, names = _with_keys(query, keys)
+
+        if seek := self._read_cursor(cursor, current_page, keys):
+            rows = self._seek(query, keys, seek["k"], seek["f"])
+        else:
+            rows = self._offset(query, current_page)
+
+        page = CountlessPage(rows, self.total_pages, current_page, self.per_page)
+
+        if rows and page.has_next():
+            page.next_cursor = _cursor(names, rows[-1], current_page + 1, True)
+
+        if rows and page.has_previous():
+            page.previous_cursor = _cursor(names, rows[0], current_page - 1, False)
+
+        return page
+
+    def _keys(self) -> Optional[list[tuple[str, bool]]]:
+        """(name, descending) of the ordering keys, ending with the primary
+        key; None if the ordering is not one of plain fields."""
+        sql = self.query.query
+        ordering = sql.order_by or (
+            self.query.model._meta.ordering if sql.default_ordering else ()
+        )
+        pk = self.query.model._meta.pk.name
 
-    def page(self, current_page):
+        keys = []
+        for item in ordering:
+            if isinstance(item, str) and item != "?":
+                keys.append((item.lstrip("-"), item.startswith("-")))
+            elif isinstance(item, OrderBy) and isinstance(item.expression, F):
+                keys.append((item.expression.name, item.descending))
+            else:
+                return None
+
+        names = {key for key, _ in keys}
+        if not names & {pk, "pk"}:
+            keys.append((pk, False))
+
+        return keys
+
+    def _read_cursor(self, cursor, page, keys) -> Optional[dict]:
+        """The cursor's data if it is one of ours leading to the page."""
+        if not cursor:
+            return None
+
+        try:
+            data = signing.loads(cursor, salt=CURSOR_SALT, serializer=CursorSerializer)
+        except signing.BadSignature:
+            return None
+
+        if data.get("p") != page or len(data.get("k", [])) != len(keys):
+            return None
+
+        return data
+
+    def _seek(self, query, keys, values, forward) -> list:
+        """The page after the row with the key values, or before it."""
+        equal = {}
+        conditions = []
+        for (key, desc), value in zip(keys, values):
+            lookup = "lt" if desc == forward else "gt"
+            conditions.append(Q(**equal, **{f"{key}__{lookup}": value}))
+            equal[key] = value
+
+        if not forward:
+            query = query.reverse()
+
+        rows = list(query.filter(reduce(or_, conditions))[: self.per_page])
+
+        return rows if forward else rows[::-1]
+
+    def _offset(self, query, current_page) -> list:
         bottom = (current_page - 1) * self.per_page
-        top = bottom + self.per_page
-        query = self.query[bottom:top]
+        top = min(bottom + self.per_page, self.count)
+
+        if bottom >= top:
+            return []
+
+        # a page nearer the end is read backwards, skipping the fewer rows
+        if self.count - top < bottom:
+            return list(query.reverse()[self.count - top : self.count - bottom])[::-1]
 
-        return CountlessPage(query, self.total_pages, current_page, self.per_page)
+        return list(query[bottom:top])
 
     @property
     def page_range(self):
@@ -123,3 +245,39 @@ class CountlessPaginator:
             yield from range(self.total_pages - on_ends + 1, self.total_pages + 1)
         else:
             yield from range(page + 1, self.total_pages + 1)
+
+
+def _value(row, key: str):
+    if isinstance(row, dict):
+        return row[key]
+
+    return reduce(getattr, key.split("__"), row)
+
+
+def _with_keys(query, keys) -> tuple:
+    """The queryset with the ordering keys in its rows and the name of each
+    key there; a values() queryset gets the keys it lacks as annotations."""
+    names = [key for key, _ in keys]
+
+    if not getattr(query, "_fields", None):
+        return query, names
+
+    missing = {key: f"cursor_{key}" for key in names if key not in query._fields}
+    query = query.annotate(**{alias: F(key) for key, alias in missing.items()})
+
+    return query, [missing.get(key, key) for key in names]
+
+
+def _cursor(names, row, page: int, forward: bool) -> Optional[str]:
+    """Cursor to the page after the row, or before it; None if a key of the
+    row is null, as null does not compare."""
+    values = [_value(row, name) for name in names]
+
+    if any(value is None for value in values):
+        return None
+
+    return signing.dumps(
+        {"p": page, "f": forward, "k": values},
+        salt=CURSOR_SALT,
+        serializer=CursorSerializer,
+    )
@@ -0,0 +1,40 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_memo: ContextVar[Optional[dict]] = ContextVar("request_memo", default=None)
+
+
+@contextmanager
+def scope():
+    """Share what `memoize` builds inside the block; a nested scope reuses the
+    outer one."""
+    if _memo.get() is not None:
+        yield
+        return
+
+    token = _memo.set({})
+    try:
+        yield
+    finally:
+        _memo.reset(token)
+
+
+def memoize(key: Hashable, build: Callable[[], T]) -> T:
+    """Build the value behind `key` once per scope. Outside a scope it is
+    built on every call."""
+    if (memo := _memo.get()) is None:
+        return build()
+
+    if key not in memo:
+        memo[key] = build()
+
+    return memo[key]
+
+
+def clear() -> None:
+    """Forget what the current scope built, e.g. after its data was written."""
+    if (memo := _memo.get()) is not None:
+        memo.clear()
@@ -1,36 +1,53 @@
 import argparse
+import hashlib
+import json
 import re
 from functools import reduce
-from operator import and_, or_
+from operator import add, or_
 
-from django.db.models import Q
+from django.db.models import Case, Q, When
 
 from ...books.services.model_services import BookModelService
-from ...expenses.services.model_services import ExpenseModelService
-from ...incomes.services.model_services import IncomeModelService
+from ...expenses.services.model_services import (
+    ExpenseModelService,
+    ExpenseNameModelService,
+    ExpenseTypeModelService,
+)
+from ...incomes.services.model_services import (
+    IncomeModelService,
+    IncomeTypeModelService,
+)
+from ..models import SearchDocument, SearchGram
+from ..services import search_index
+from .context_cache import journal_cache
 
 SEARCH_DICT = {"category": None, "year": None, "month": None, "remark": None}
 
+# search kind -> the categories titling a row, by the row's relation to them
+CATEGORIES = {
+    SearchDocument.Kind.EXPENSES: {
+        "expense_type": ExpenseTypeModelService,
+        "expense_name": ExpenseNameModelService,
+    },
+    SearchDocument.Kind.INCOMES: {"income_type": IncomeTypeModelService},
+}
+
 
 # -------------------------------------------------------------------------------------
 #                                                                        Public Methods
 # -------------------------------------------------------------------------------------
 def search_expenses(user, search_str):
-    category_list = ["expense_type__title", "expense_name__title"]
-
     service = ExpenseModelService(user)
     qs = service.items()
-    qs = _generic_search(qs, search_str, category_list)
+    qs = _generic_search(qs, search_str, user, SearchDocument.Kind.EXPENSES)
 
     return service.expenses_list(qs)
 
 
 def search_incomes(user, search_str):
-    category_list = ["income_type__title"]
-
     service = IncomeModelService(user)
     qs = service.items()
-    qs = _generic_search(qs, search_str, category_list)
+    qs = _generic_search(qs, search_str, user, SearchDocument.Kind.INCOMES)
 
     return qs.values(
         "id",
@@ -43,11 +60,9 @@ def search_incomes(user, search_str):
 
 
 def search_books(user, search_str):
-    category_list = ["author", "title"]
-
     service = BookModelService(user)
     qs = service.items()
-    qs = _generic_search(qs, search_str, category_list, "started")
+    qs = _generic_search(qs, search_str, user, SearchDocument.Kind.BOOKS, "started")
 
     return qs.values(
         "id",
@@ -59,6 +74,19 @@ def search_books(user, search_str):
     )
 
 
+def search_key(search_str):
+    """Digest of the parsed search, the same for strings that search alike,
+    e.g. ones differing only in case or in punctuation."""
+    search_dict, search_type = _make_search_dict(search_str)
+    words = {
+        key: [word.casefold() for word in value] if isinstance(value, list) else value
+        for key, value in search_dict.items()
+    }
+    parts = json.dumps([search_type, words], sort_keys=True)
+
+    return hashlib.blake2b(parts.encode(), digest_size=16).hexdigest()
+
+
 # -------------------------------------------------------------------------------------
 #                                                                       Private Methods
 # -------------------------------------------------------------------------------------
@@ -148,7 +176,7 @@ def _get_value(search_dict, key, default_value):
     return value or default_value
 
 
-def _generic_search(query, search_str, category_list, date_field="date"):
+def _generic_search(query, search_str, user, kind, date_field="date"):
     search_dict, search_type = _make_search_dict(search_str)
 
     if not any(search_dict.values()):
@@ -156,14 +184,26 @@ def _generic_search(query, search_str, category_list, date_field="date"):
 
     query = _apply_date_filters(query, search_dict, date_field)
 
-    combined_filters = _build_category_filters(search_dict, category_list)
-    combined_filters += _build_remark_filters(search_dict)
+    matches = _find_matches(search_dict, user, kind)
+
+    if not matches:
+        return query.order_by(f"-{date_field}")
+
+    # with arguments a row has to match every word
+    if search_type == "with_args":
+        for match in matches:
+            query = query.filter(match)
+
+        return query.order_by(f"-{date_field}")
 
-    if combined_filters:
-        operator_ = and_ if search_type == "with_args" else or_
-        query = query.filter(reduce(operator_, combined_filters))
+    # without them any word will do, the rows matching more of them go first
+    rank = reduce(add, (Case(When(match, then=1), default=0) for match in matches))
 
-    return query.order_by(f"-{date_field}")
+    return (
+        query.filter(reduce(or_, matches))
+        .annotate(rank=rank)
+        .order_by("-rank", f"-{date_field}")
+    )
 
 
 def _apply_date_filters(query, search_dict, date_field):
@@ -174,21 +214,43 @@ def _apply_date_filters(query, search_dict, date_field):
     return query
 
 
-def _build_category_filters(search_dict, category_list):
-    return [
-        reduce(
-            or_,
-            (
-                Q(**{f"{category}__icontains": search_word})
-                for category in category_list
-            ),
-        )
-        for search_word in _get_value(search_dict, "category", [])
-    ]
-
-
-def _build_remark_filters(search_dict):
-    return [
-        Q(remark__icontains=search_word)
-        for search_word in _get_value(search_dict, "remark", [])
-    ]
+def _find_matches(search_dict, user, kind):
+    """A filter per category and remark word. Category words are matched
+    against the titles of the journal's categories first, so the rows are
+    filtered by category ids; the rest go through the search index."""
+    matches = []
+
+    for field in [SearchGram.Field.CATEGORY, SearchGram.Field.REMARK]:
+        for search_word in _get_value(search_dict, field, []):
+            if field == SearchGram.Field.CATEGORY and kind in CATEGORIES:
+                matches.append(_category_filter(user, kind, search_word))
+            else:
+                ids = search_index.find(user.journal_id, kind, field, search_word)
+                matches.append(Q(pk__in=ids))
+
+    return matches
+
+
+def _category_filter(user, kind, search_word):
+    word = search_index.normalize(search_word)
+
+    return reduce(
+        or_,
+        (
+            Q(**{f"{relation}_id__in": [pk for pk, title in titles if word in title]})
+            for relation, titles in _category_titles(user, kind).items()
+        ),
+    )
+
+
+@journal_cache("search_categories")
+def _category_titles(user, kind):
+    """(id, case folded title) of the journal's categories of the kind, by
+    the row's relation to them."""
+    titles = {}
+
+    for relation, service in CATEGORIES[kind].items():
+        rows = service(user).objects.prefetch_related(None).values_list("pk", "title")
+        titles[relation] = [(pk, search_index.normalize(title)) for pk, title in rows]
+
+    return titles
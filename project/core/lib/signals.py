@@ -1,30 +1,151 @@
-import itertools as it
+import hashlib
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
 
 import polars as pl
+from django.db.models import QuerySet, Value
 
 from ...users.models import User
 
 
+@dataclass(frozen=True)
+class SyncScope:
+    """The slice of a balance table a write can change: the categories it
+    touched, from the earliest year it touched onwards.
+
+    `vacated_years` are the years a row left, by being deleted or moved to
+    another date. Only through them can the journal's year range shrink.
+    """
+
+    category_ids: frozenset[int]
+    years: frozenset[int]
+    vacated_years: frozenset[int] = frozenset()
+
+    @property
+    def first_year(self) -> int:
+        return min(self.years)
+
+    @property
+    def last_year(self) -> int:
+        return max(self.years)
+
+    def __or__(self, other: "SyncScope") -> "SyncScope":
+        return SyncScope(
+            category_ids=self.category_ids | other.category_ids,
+            years=self.years | other.years,
+            vacated_years=self.vacated_years | other.vacated_years,
+        )
+
+    def to_json(self) -> dict:
+        return {
+            "category_ids": sorted(self.category_ids),
+            "years": sorted(self.years),
+            "vacated_years": sorted(self.vacated_years),
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "SyncScope":
+        return cls(**{key: frozenset(values) for key, values in data.items()})
+
+
 class GetData:
-    def __init__(self, user: User, conf: dict):
-        self.incomes = list(self._get_data(user, conf.get("incomes")))
-        self.expenses = list(self._get_data(user, conf.get("expenses")))
+    """Reads the sources of a balance table.
+
+    The yearly sums of all `incomes` (and all `expenses`) sources come from one
+    UNION ALL query each, read into a frame with the SUMS columns; `have` and
+    `types` stay lists.
+    """
+
+    SUMS = ("incomes", "expenses", "fee")
+
+    def __init__(self, user: User, conf: dict, scope: Optional[SyncScope] = None):
+        self._scope = scope
+
+        self.incomes = self._get_sums(user, conf.get("incomes"))
+        self.expenses = self._get_sums(user, conf.get("expenses"))
         self.have = list(self._get_data(user, conf.get("have")))
-        self.types = list(self._get_data(user, conf.get("types")))
+        self.types = list(self._get_data(user, conf.get("types"), is_types=True))
+
+    def fingerprint(self) -> str:
+        """A hash of the data read, the same for the same yearly sums, worth
+        checks and categories whatever order they were read in."""
+        sums = [
+            df.group_by("category_id", "year").sum().sort("category_id", "year")
+            for df in (self.incomes, self.expenses)
+        ]
+        have = sorted(
+            (row["category_id"], row["year"], row["have"], str(row["latest_check"]))
+            for row in self.have
+        )
+        types = sorted((row.pk, row.closed) for row in self.types)
+
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (*(df.write_csv() for df in sums), repr(have), repr(types)):
+            digest.update(part.encode())
+
+        return digest.hexdigest()
+
+    def _get_sums(self, user: User, sources: tuple) -> pl.DataFrame:
+        columns = ["category_id", "year", *self.SUMS]
+
+        querysets = [self._as_sums(source(user)) for source in sources or ()]
+        if not querysets:
+            return pl.DataFrame(schema=columns)
+
+        qs = querysets[0].union(*querysets[1:], all=True)
+
+        return pl.DataFrame(list(qs), schema=columns, orient="row")
+
+    def _as_sums(self, qs: QuerySet) -> QuerySet:
+        """Line up a source's columns with the other sources of the union;
+        the sums it has not got are zeros."""
+        if self._scope:
+            qs = self._narrow(qs, is_types=False)
 
-    @staticmethod
-    def _get_data(user: User, sources: tuple):
+        missing = {
+            name: Value(0) for name in self.SUMS if name not in qs.query.annotations
+        }
+
+        return (
+            qs.annotate(**missing)
+            .order_by()
+            .values_list("category_id", "year", *self.SUMS)
+        )
+
+    def _get_data(self, user: User, sources: tuple, is_types: bool = False):
         if not sources:
             return
 
         for source_callable in sources:
             # Execute the lambda, passing the user.
-            if _qs := source_callable(user):
+            _qs = source_callable(user)
+
+            if isinstance(_qs, QuerySet) and self._scope:
+                _qs = self._narrow(_qs, is_types)
+
+            if _qs:
                 yield from _qs
 
+    def _narrow(self, qs: QuerySet, is_types: bool) -> QuerySet:
+        if is_types:
+            return qs.filter(pk__in=self._scope.category_ids)
+
+        return qs.filter(
+            date__year__gte=self._scope.first_year,
+            category_id__in=self._scope.category_ids,
+        )
+
 
 class SignalBase(ABC):
+    """Builds a balance table from yearly sums.
+
+    `seed` are the stored balance rows of the year before the slice being
+    rebuilt; their cumulative columns are carried forward instead of summing
+    history again. `last_year` is the last year the stored table reaches, so a
+    slice is padded as far as the rows around it.
+    """
+
     @property
     def schema(self) -> dict:
         return {
@@ -41,12 +162,19 @@ class SignalBase(ABC):
     @abstractmethod
     def make_table(self, df: pl.LazyFrame) -> pl.LazyFrame: ...
 
-    def _make_df(self, arr: list[dict]) -> pl.LazyFrame:
-        if not arr:
-            return pl.LazyFrame(arr, schema=self.schema)
+    def _make_df(self, *parts: pl.DataFrame | list[dict]) -> pl.LazyFrame:
+        frames = [
+            part.select(list(self.schema)).cast(self.schema)
+            if isinstance(part, pl.DataFrame)
+            else pl.from_dicts(part, schema=self.schema)
+            for part in parts
+            if len(part)
+        ]
+        if not frames:
+            return pl.LazyFrame(schema=self.schema)
 
         return (
-            pl.from_dicts(arr, schema=self.schema)
+            pl.concat(frames)
             .lazy()
             .with_columns(
                 [pl.col("incomes").fill_null(0), pl.col("expenses").fill_null(0)]
@@ -72,7 +200,10 @@ class SignalBase(ABC):
         global_max_year = df.select(pl.col("year").max()).collect().item()
         global_min_year = df.select(pl.col("year").min()).collect().item()
 
-        years_df = pl.LazyFrame({"year": range(global_min_year, global_max_year + 2)})
+        # a slice reaches as far as the stored table around it
+        last_year = max(global_max_year + 1, self._last_year or 0)
+
+        years_df = pl.LazyFrame({"year": range(global_min_year, last_year + 1)})
 
         #  lazyframe of categories with closed dates
         closed = pl.from_dicts(
@@ -92,19 +223,50 @@ class SignalBase(ABC):
             .select(df.collect_schema().names())
         )
 
+    @abstractmethod
+    def _make_seed(self, seed: list[dict]) -> pl.LazyFrame:
+        """Stored rows of the year before the slice, as one more year of sums
+        whose values are everything accumulated up to it."""
+
+    def _build(self, df: pl.LazyFrame, seed: list[dict]) -> pl.LazyFrame:
+        if seed:
+            seed_df = self._make_seed(seed)
+            df = pl.concat(
+                [df, seed_df.select(df.collect_schema().names())],
+                how="vertical_relaxed",
+            )
+
+        try:
+            table = self.make_table(df)
+        except TypeError:
+            return df
+
+        if not seed:
+            return table
+
+        # seed rows were only a starting point; they are stored already
+        return table.join(
+            seed_df.select(["category_id", "year"]),
+            on=["category_id", "year"],
+            how="anti",
+        ).sort(["category_id", "year"])
+
 
 class Accounts(SignalBase):
-    def __init__(self, data: GetData):
-        _df = self._make_df(it.chain(data.incomes, data.expenses))
+    def __init__(
+        self,
+        data: GetData,
+        seed: Optional[list[dict]] = None,
+        last_year: Optional[int] = None,
+    ):
+        _df = self._make_df(data.incomes, data.expenses)
         _hv = self._make_have(data.have)
         _df = self._join_df(_df, _hv)
 
         self._types = data.types
+        self._last_year = last_year
 
-        try:
-            self._table = self.make_table(_df)
-        except TypeError:
-            self._table = _df
+        self._table = self._build(_df, seed)
 
     def _fill_missing_past_future_rows(self, df: pl.LazyFrame) -> pl.LazyFrame:
         numeric_columns = [
@@ -158,6 +320,23 @@ class Accounts(SignalBase):
             .sort(["category_id", "year"])
         )
 
+    def _make_seed(self, seed: list[dict]) -> pl.LazyFrame:
+        schema = {
+            "category_id": pl.UInt16,
+            "year": pl.UInt16,
+            "balance": pl.Int32,
+            "have": pl.UInt32,
+            "latest_check": pl.Datetime,
+        }
+        return pl.LazyFrame(seed, schema=schema).select(
+            "category_id",
+            "year",
+            pl.col("balance").alias("incomes"),
+            pl.lit(0, dtype=pl.Int32).alias("expenses"),
+            "have",
+            "latest_check",
+        )
+
     def _join_df(self, df: pl.LazyFrame, hv: pl.LazyFrame) -> pl.LazyFrame:
         # how = "full" because if df is empty, but hv is not, return df will be empty
         return df.join(
@@ -174,18 +353,21 @@ class Savings(SignalBase):
     def schema(self) -> dict:
         return super().schema | {"fee": pl.Int32}
 
-    def __init__(self, data: GetData):
+    def __init__(
+        self,
+        data: GetData,
+        seed: Optional[list[dict]] = None,
+        last_year: Optional[int] = None,
+    ):
         _in = self._make_df(data.incomes)
         _ex = self._make_df(data.expenses)
         _hv = self._make_have(data.have)
         _df = self._join_df(_in, _ex, _hv)
 
         self._types = data.types
+        self._last_year = last_year
 
-        try:
-            self._table = self.make_table(_df)
-        except TypeError:
-            self._table = _df
+        self._table = self._build(_df, seed)
 
     def _fill_missing_past_future_rows(self, df: pl.LazyFrame) -> pl.LazyFrame:
         # Define columns to fill
@@ -249,6 +431,19 @@ class Savings(SignalBase):
             .sort(["category_id", "year"])
         )
 
+    def _make_seed(self, seed: list[dict]) -> pl.LazyFrame:
+        schema = {
+            "category_id": pl.UInt16,
+            "year": pl.UInt16,
+            "incomes": pl.Int32,
+            "fee": pl.Int32,
+            "sold": pl.Int32,
+            "sold_fee": pl.Int32,
+            "market_value": pl.UInt32,
+            "latest_check": pl.Datetime,
+        }
+        return pl.LazyFrame(seed, schema=schema)
+
     def _join_df(
         self, inc: pl.LazyFrame, exp: pl.LazyFrame, hv: pl.LazyFrame
     ) -> pl.LazyFrame:
@@ -0,0 +1,109 @@
+import threading
+from contextlib import contextmanager
+from functools import partial
+from typing import Callable, Hashable, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .signals import SyncScope
+
+_state = threading.local()
+
+
+@contextmanager
+def batch():
+    """Hold back the syncs scheduled inside the block and run each dirty
+    ledger once when it ends (or when the transaction around it commits)."""
+    _state.depth = getattr(_state, "depth", 0) + 1
+    try:
+        yield
+    finally:
+        _state.depth -= 1
+        if not _state.depth:
+            transaction.on_commit(flush)
+
+
+def schedule(
+    key: Hashable,
+    run: Callable[[Optional[SyncScope]], None],
+    scope: Optional[SyncScope],
+) -> None:
+    """Mark the ledger behind `key` dirty and run its sync once per request or
+    transaction, over the union of the scopes it was marked with.
+
+    A None scope stands for a full rebuild and absorbs every other scope.
+    Outside a request batch and a transaction the sync runs straight away.
+    Inside a transaction the mark belongs to its innermost savepoint and is
+    dropped with it by a rollback.
+    """
+    if not _is_deferred():
+        run(scope)
+        return
+
+    pending = _transaction_pending() if connection.in_atomic_block else _pending()
+    _mark(pending, key, run, scope)
+
+
+def _mark(
+    pending: dict, key: Hashable, run: Callable, scope: Optional[SyncScope]
+) -> None:
+    if key in pending:
+        _, queued = pending[key]
+        scope = queued | scope if queued and scope else None
+
+    pending[key] = (run, scope)
+
+
+def flush() -> None:
+    pending = _pending()
+    _state.pending = {}
+
+    for run, scope in pending.values():
+        run(scope)
+
+
+def _commit(pending: dict) -> None:
+    # inside a request batch the syncs wait for its end with the others
+    if getattr(_state, "depth", 0):
+        for key, (run, scope) in pending.items():
+            _mark(_pending(), key, run, scope)
+        return
+
+    for run, scope in pending.values():
+        run(scope)
+
+
+def _transaction_pending() -> dict:
+    """The marks of the innermost savepoint, or of the transaction outside
+    any, kept by the on_commit callback that runs them: Django drops the
+    callback of a rolled back savepoint or transaction, and its marks with
+    it."""
+    callbacks = [func for _, func, _ in connection.run_on_commit]
+    groups = {
+        level: callback
+        for level, callback in getattr(_state, "groups", {}).items()
+        if callback in callbacks
+    }
+    _state.groups = groups
+
+    savepoints = [sid for sid in connection.savepoint_ids if sid]
+    level = savepoints[-1] if savepoints else None
+    if level not in groups:
+        groups[level] = partial(_commit, {})
+        transaction.on_commit(groups[level])
+
+    return groups[level].args[0]
+
+
+def _pending() -> dict:
+    if not hasattr(_state, "pending"):
+        _state.pending = {}
+    return _state.pending
+
+
+def _is_deferred() -> bool:
+    if not getattr(settings, "BALANCE_SYNC_ON_COMMIT", False):
+        return False
+
+    return bool(getattr(_state, "depth", 0)) or connection.in_atomic_block
@@ -1,11 +1,18 @@
 import contextlib
+import contextvars
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
+from typing import Any, Callable
 from urllib.parse import urlparse
 
+from django.conf import settings
+from django.db import connections
 from django.http import HttpResponse
 from django.template.loader import render_to_string
 from django.urls import Resolver404, resolve, reverse
+from django.utils import timezone, translation
 from django.utils.http import url_has_allowed_host_and_scheme
 
 
@@ -106,6 +113,50 @@ def rendered_content(request, view_class, **kwargs):
     return view_class.as_view()(request, **kwargs).rendered_content
 
 
+def render_panels(request, panels: dict[str, Callable[[], Any]]) -> dict[str, Any]:
+    """
+    Evaluate the independent panels of a page and return their results by name.
+
+    With settings.PANEL_WORKERS above 1 the panels run on that many threads,
+    each with its own database connection, so the page costs about as much as
+    its slowest panel. The seconds each panel took are kept in
+    request.panel_timings.
+    """
+    workers = min(settings.PANEL_WORKERS, len(panels))
+    language = translation.get_language()
+    tz = timezone.get_current_timezone()
+
+    request.panel_timings = {}
+
+    # each panel gets a copy of the request's context, so the panels share
+    # its memo (core.lib.request_memo) from any thread
+    contexts = {name: contextvars.copy_context() for name in panels}
+
+    def _run(name: str) -> Any:
+        start = time.perf_counter()
+        try:
+            # the active language and time zone are per thread
+            with translation.override(language), timezone.override(tz):
+                return contexts[name].run(panels[name])
+        finally:
+            request.panel_timings[name] = time.perf_counter() - start
+            if workers > 1:
+                connections.close_all()
+
+    if workers <= 1:
+        return {name: _run(name) for name in panels}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(panels, pool.map(_run, panels)))
+
+
+def server_timing(timings: dict[str, float]) -> str:
+    """Timings as a Server-Timing header, shown by the browser's dev tools."""
+    return ", ".join(
+        f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()
+    )
+
+
 def http_htmx_response(hx_trigger_name=None, status_code=204):
     headers = {}
     if hx_trigger_name:
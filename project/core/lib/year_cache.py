@@ -0,0 +1,134 @@
+"""
+Permanent cache of the yearly aggregates of finished years.
+
+The summary pages aggregate every year of a journal, though only the running
+year normally changes. A finished year's rows are kept without a timeout under
+the year's own data version, which only a write of a row dated in that year
+bumps; the running and later years are always aggregated live. A write to a
+category (a rename, a closed saving type) bumps the whole journal.
+
+With a cache that keeps nothing there are no versions and every year is
+aggregated live.
+"""
+
+import hashlib
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Iterable, Optional
+
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import models
+from django.db.models import Q, QuerySet
+
+from ...users.models import User
+
+
+def _version_key(journal_id: int, year: Optional[int] = None) -> str:
+    return f"year-data:{journal_id}:{'all' if year is None else year}"
+
+
+def bump(journal_id: int, years: Iterable[Optional[int]] = (None,)) -> None:
+    """Mark the journal's data of the years as changed; None is every year."""
+    token = time.time_ns()
+    cache.set_many({_version_key(journal_id, year): token for year in years}, None)
+
+
+def _versions(journal_id: int, years: list[int]) -> Optional[dict]:
+    """Versions of the years and of the whole journal (None key); None if the
+    cache keeps nothing."""
+    keys = {_version_key(journal_id, year): year for year in [None, *years]}
+    versions = cache.get_many(keys)
+
+    if missing := {key: time.time_ns() for key in keys if key not in versions}:
+        for key, token in missing.items():
+            cache.add(key, token, None)
+        versions |= cache.get_many(missing)
+
+    if len(versions) < len(keys):
+        return None
+
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def mark_written(instance: models.Model) -> None:
+    """Bump the years of a saved or deleted row, and of the version it had
+    before an update.
+
+    Years before the journal's first record are not among the cached ones, so
+    a row dated there bumps the whole journal: the balances of the later
+    years are built on it.
+    """
+    journal = _journal(instance)
+    if journal is None:
+        return
+
+    rows = [instance, getattr(instance, "_previous_state", None)]
+    years = {row.date.year for row in rows if row}
+    if min(years) < journal.first_record.year:
+        years = {None}
+
+    bump(journal.pk, years)
+
+
+def _journal(instance: models.Model):
+    """The journal of the first category or account the row belongs to."""
+    for field in instance._meta.concrete_fields:
+        if field.many_to_one and hasattr(field.related_model, "journal"):
+            try:
+                return getattr(instance, field.name).journal
+            except ObjectDoesNotExist:
+                # the category is gone with its journal
+                return None
+
+    return None
+
+
+def _year(row: dict) -> int:
+    return row["year"] if "year" in row else row["date"].year
+
+
+def rows_by_year(
+    user: User,
+    name: str,
+    queryset: QuerySet,
+    lookup: str = "year",
+    cumulative: bool = False,
+) -> list[dict]:
+    """The queryset's rows, those of the finished years from the cache.
+
+    `lookup` filters the queryset by year and each row has its year in a
+    `year` or `date` value. The rows of a `cumulative` aggregate, like
+    balances, depend on the earlier years too, so they are kept under the
+    versions of every year up to theirs.
+    """
+    this_year = date.today().year
+    first = min(user.journal.first_record.year, this_year)
+    closed = list(range(first, this_year))
+
+    if (versions := _versions(user.journal_id, closed)) is None:
+        return list(queryset)
+
+    keys = {}
+    for year in closed:
+        years = [y for y in closed if y <= year] if cumulative else [year]
+        parts = ":".join([name, *(str(versions[y]) for y in [None, *years])])
+        digest = hashlib.blake2b(parts.encode(), digest_size=16).hexdigest()
+        keys[year] = f"year-rows:{user.journal_id}:{year}:{digest}"
+
+    cached = cache.get_many(keys.values())
+    missing = [year for year in closed if keys[year] not in cached]
+
+    rows = defaultdict(list)
+    for row in queryset.filter(
+        Q(**{f"{lookup}__lt": first})
+        | Q(**{f"{lookup}__in": missing})
+        | Q(**{f"{lookup}__gte": this_year})
+    ):
+        rows[_year(row)].append(row)
+
+    cache.set_many({keys[year]: rows[year] for year in missing}, None)
+    rows |= {year: cached[key] for year, key in keys.items() if key in cached}
+
+    return [row for year in sorted(rows) for row in rows[year]]
@@ -0,0 +1,70 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+
+from ...models import BalanceJob
+from ...services import balance_jobs, signals_service
+
+
+def _run(job_id: int) -> None:
+    if job := BalanceJob.objects.select_related("journal").filter(pk=job_id).first():
+        signals_service.run_job(job)
+
+
+class Command(BaseCommand):
+    help = (
+        "Drains the queued balance syncs in a pool of processes. "
+        "Each journal's ledger is synced by one process at a time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of processes; 1 syncs in this process (default: CPUs).",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the queue is empty (default: 1).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        workers = max(options["workers"], 1)
+
+        if workers == 1:
+            self._drain(map, 1, options)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        ) as pool:
+            self._drain(pool.map, workers, options)
+
+    def _drain(self, run_all, workers: int, options: dict) -> None:
+        while True:
+            if jobs := balance_jobs.claim(workers):
+                # a failed job stays claimed and is retried once it goes stale
+                try:
+                    list(run_all(_run, [job.pk for job in jobs]))
+                except Exception as e:
+                    self.stderr.write(f"Balance sync failed: {e!r}")
+                continue
+
+            if options["once"]:
+                return
+
+            time.sleep(options["sleep"])
@@ -0,0 +1,105 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ....journals.models import Journal
+from ...models import BalanceJob
+from ...services import signals_service
+
+
+def _rebuild(journal_id: int, kinds: list[str]) -> dict:
+    """Rebuild the journal's ledgers of the given kinds from scratch, even
+    when their data has not changed."""
+    journal = Journal.objects.get(pk=journal_id)
+    report = {"journal": str(journal), "pk": journal_id, "rows": {}}
+
+    if not (user := journal.users.first()):
+        return report
+
+    start = time.perf_counter()
+    with CaptureQueriesContext(connection) as queries:
+        for kind in kinds:
+            signals_service.sync_ledger(user, kind, force=True)
+
+    report["seconds"] = time.perf_counter() - start
+    report["queries"] = len(queries)
+
+    for kind in kinds:
+        _, _, sync_model_service = signals_service.LEDGERS[kind]
+        report["rows"][kind] = sync_model_service(user).objects.count()
+
+    return report
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the balance ledgers of every journal, or of the given ones, "
+        "in a pool of processes and reports rows, queries and time per journal."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--journal",
+            type=int,
+            action="append",
+            help="Journal id to rebuild; may be repeated (default: all).",
+        )
+        parser.add_argument(
+            "--kind",
+            action="append",
+            choices=BalanceJob.Kind.values,
+            help="Ledger to rebuild; may be repeated (default: all).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of processes; 1 rebuilds in this process (default: CPUs).",
+        )
+
+    def handle(self, *args, **options):
+        kinds = options["kind"] or BalanceJob.Kind.values
+        journals = Journal.objects.order_by("pk")
+        if options["journal"]:
+            journals = journals.filter(pk__in=options["journal"])
+
+        journal_ids = list(journals.values_list("pk", flat=True))
+        workers = max(min(options["workers"], len(journal_ids)), 1)
+
+        start = time.perf_counter()
+
+        if workers == 1:
+            reports = map(_rebuild, journal_ids, [kinds] * len(journal_ids))
+            self._write(reports)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=django.setup,
+            ) as pool:
+                self._write(pool.map(_rebuild, journal_ids, [kinds] * len(journal_ids)))
+
+        self.stdout.write(
+            f"Rebuilt {len(journal_ids)} journal(s) in "
+            f"{time.perf_counter() - start:.2f}s"
+        )
+
+    def _write(self, reports) -> None:
+        for report in reports:
+            name = f"{report['journal']} (#{report['pk']})"
+
+            if "seconds" not in report:
+                self.stdout.write(f"{name}: skipped, journal has no users")
+                continue
+
+            rows = ", ".join(f"{kind} {n}" for kind, n in report["rows"].items())
+            self.stdout.write(
+                f"{name}: {rows} rows, {report['queries']} queries, "
+                f"{report['seconds']:.2f}s"
+            )
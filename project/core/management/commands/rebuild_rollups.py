@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from ...services import monthly_rollup
+
+
+class Command(BaseCommand):
+    help = (
+        "Recounts the monthly rollups of every journal, or of the given ones, "
+        "from their incomes, expenses and savings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--journal",
+            type=int,
+            action="append",
+            help="Journal id to recount; may be repeated (default: all).",
+        )
+
+    def handle(self, *args, **options):
+        rows = monthly_rollup.rebuild(options["journal"])
+
+        self.stdout.write(f"Wrote {rows} monthly rollup row(s)")
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from ...services import search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Indexes again the expenses, incomes and books of every journal, or of "
+        "the given ones, for the search."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--journal",
+            type=int,
+            action="append",
+            help="Journal id to index; may be repeated (default: all).",
+        )
+
+    def handle(self, *args, **options):
+        documents = search_index.rebuild(options["journal"])
+
+        self.stdout.write(f"Indexed {documents} search document(s)")
@@ -0,0 +1,45 @@
+from django_htmx.http import trigger_client_event
+
+from .lib import fragments, request_memo, sync_scheduler
+
+
+class BalanceSyncMiddleware:
+    """Run the balance syncs a request triggers once per ledger, after the
+    view is done writing."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with sync_scheduler.batch():
+            return self.get_response(request)
+
+
+class RequestMemoMiddleware:
+    """Share the data a request's services build once, e.g. a year's monthly
+    totals, between all of them."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with request_memo.scope():
+            return self.get_response(request)
+
+
+class FragmentTriggerMiddleware:
+    """Trigger the reload of the fragments an HTMX request's writes made
+    stale (see core.lib.fragments)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with fragments.collect() as changed:
+            response = self.get_response(request)
+
+        if changed and request.htmx:
+            for event in fragments.events(changed):
+                trigger_client_event(response, event)
+
+        return response
@@ -0,0 +1,55 @@
+# Generated by Django 6.0.7 on 2026-10-18 18:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("journals", "0002_alter_journal_slug_alter_journal_title"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BalanceJob",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("accounts", "Accounts"),
+                            ("savings", "Savings"),
+                            ("pensions", "Pensions"),
+                        ],
+                        max_length=8,
+                    ),
+                ),
+                ("scope", models.JSONField(blank=True, null=True)),
+                ("version", models.PositiveIntegerField(default=1)),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("started", models.DateTimeField(blank=True, null=True)),
+                (
+                    "journal",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="balance_jobs",
+                        to="journals.journal",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("journal", "kind")},
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 6.0.7 on 2026-10-18 19:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0001_initial"),
+        ("journals", "0002_alter_journal_slug_alter_journal_title"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BalanceLedger",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("accounts", "Accounts"),
+                            ("savings", "Savings"),
+                            ("pensions", "Pensions"),
+                        ],
+                        max_length=8,
+                    ),
+                ),
+                ("closed_year", models.PositiveIntegerField(blank=True, null=True)),
+                (
+                    "journal",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="balance_ledgers",
+                        to="journals.journal",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("journal", "kind")},
+            },
+        ),
+    ]
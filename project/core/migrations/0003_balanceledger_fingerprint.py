@@ -0,0 +1,17 @@
+# Generated by Django 6.0.7 on 2026-10-18 20:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0002_balanceledger"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="balanceledger",
+            name="fingerprint",
+            field=models.CharField(blank=True, max_length=32),
+        ),
+    ]
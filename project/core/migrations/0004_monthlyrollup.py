@@ -0,0 +1,57 @@
+# Generated by Django 6.0.7 on 2026-10-18 20:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0003_balanceledger_fingerprint"),
+        ("journals", "0002_alter_journal_slug_alter_journal_title"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlyRollup",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year", models.PositiveIntegerField()),
+                ("month", models.PositiveSmallIntegerField()),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("incomes", "Incomes"),
+                            ("expenses", "Expenses"),
+                            ("savings", "Savings"),
+                        ],
+                        max_length=8,
+                    ),
+                ),
+                ("category_id", models.PositiveIntegerField()),
+                ("sum", models.BigIntegerField(default=0)),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "journal",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_rollups",
+                        to="journals.journal",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {
+                    ("journal", "year", "month", "kind", "category_id")
+                },
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Coalesce, ExtractMonth, ExtractYear
+
+ROLLUPS = [
+    ("incomes", "incomes.Income", "income_type"),
+    ("expenses", "expenses.Expense", "expense_type"),
+    ("savings", "savings.Saving", "saving_type"),
+]
+
+
+def fill(apps, schema_editor):
+    MonthlyRollup = apps.get_model("core", "MonthlyRollup")
+
+    for kind, model_name, category in ROLLUPS:
+        model = apps.get_model(model_name)
+
+        MonthlyRollup.objects.bulk_create(
+            MonthlyRollup(kind=kind, **row)
+            for row in model.objects.values(
+                journal_id=F(f"{category}__journal_id"),
+                year=ExtractYear("date"),
+                month=ExtractMonth("date"),
+                category_id=F(f"{category}_id"),
+            )
+            .annotate(sum=Coalesce(Sum("price"), 0), count=Count("id"))
+            .order_by()
+        )
+
+
+def empty(apps, schema_editor):
+    apps.get_model("core", "MonthlyRollup").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0004_monthlyrollup"),
+        ("incomes", "0004_alter_incometype_slug_alter_incometype_title"),
+        ("expenses", "0004_alter_expensename_slug_alter_expensetype_slug_and_more"),
+        ("savings", "0017_alter_savingbalance_unique_together"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill, empty),
+    ]
@@ -0,0 +1,110 @@
+# Generated by Django 6.0.7 on 2026-10-18 21:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0005_fill_monthlyrollup"),
+        ("journals", "0002_alter_journal_slug_alter_journal_title"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("expenses", "Expenses"),
+                            ("incomes", "Incomes"),
+                            ("books", "Books"),
+                        ],
+                        max_length=8,
+                    ),
+                ),
+                ("object_id", models.PositiveIntegerField()),
+                ("category", models.TextField(blank=True)),
+                ("remark", models.TextField(blank=True)),
+                (
+                    "journal",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_documents",
+                        to="journals.journal",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("kind", "object_id")},
+            },
+        ),
+        migrations.CreateModel(
+            name="SearchGram",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("expenses", "Expenses"),
+                            ("incomes", "Incomes"),
+                            ("books", "Books"),
+                        ],
+                        max_length=8,
+                    ),
+                ),
+                (
+                    "field",
+                    models.CharField(
+                        choices=[("category", "Category"), ("remark", "Remark")],
+                        max_length=8,
+                    ),
+                ),
+                ("gram", models.CharField(max_length=3)),
+                (
+                    "document",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="grams",
+                        to="core.searchdocument",
+                    ),
+                ),
+                (
+                    "journal",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="journals.journal",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["journal", "kind", "field", "gram"],
+                        name="core_search_journal_90d89e_idx",
+                    )
+                ],
+            },
+        ),
+    ]
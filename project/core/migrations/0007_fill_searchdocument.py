@@ -0,0 +1,79 @@
+from django.db import migrations
+from django.db.models import F
+
+# kind, model, fields of the category text, the related row holding the journal
+DOCUMENTS = [
+    ("expenses", "expenses.Expense", [], "expense_type"),
+    ("incomes", "incomes.Income", [], "income_type"),
+    ("books", "books.Book", ["author", "title"], "user"),
+]
+
+
+def _trigrams(text):
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def fill(apps, schema_editor):
+    SearchDocument = apps.get_model("core", "SearchDocument")
+    SearchGram = apps.get_model("core", "SearchGram")
+
+    for kind, model_name, category, owner in DOCUMENTS:
+        model = apps.get_model(model_name)
+
+        SearchDocument.objects.bulk_create(
+            (
+                SearchDocument(
+                    journal_id=row["journal_id"],
+                    kind=kind,
+                    object_id=row["id"],
+                    category="\n".join(
+                        (row[field] or "").casefold() for field in category
+                    ),
+                    remark=(row["remark"] or "").casefold(),
+                )
+                for row in model.objects.values(
+                    "id", "remark", *category, journal_id=F(f"{owner}__journal_id")
+                )
+            ),
+            batch_size=1000,
+        )
+
+        # read back, as MySQL returns no ids from a bulk insert
+        documents = (
+            SearchDocument.objects.filter(kind=kind)
+            .only("journal_id", "category", "remark")
+            .iterator(chunk_size=1000)
+        )
+
+        SearchGram.objects.bulk_create(
+            (
+                SearchGram(
+                    document=document,
+                    journal_id=document.journal_id,
+                    kind=kind,
+                    field=field,
+                    gram=gram,
+                )
+                for document in documents
+                for field in ("category", "remark")
+                for gram in _trigrams(getattr(document, field))
+            ),
+            batch_size=1000,
+        )
+
+
+def empty(apps, schema_editor):
+    apps.get_model("core", "SearchDocument").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0006_searchdocument_searchgram"),
+        ("books", "0002_initial"),
+        ("incomes", "0004_alter_incometype_slug_alter_incometype_title"),
+        ("expenses", "0004_alter_expensename_slug_alter_expensetype_slug_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill, empty),
+    ]
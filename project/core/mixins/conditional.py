@@ -0,0 +1,77 @@
+import hashlib
+import os
+from datetime import date
+from functools import lru_cache
+from typing import Optional
+
+from django.template.loader import select_template
+from django.utils import translation
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from ..lib import context_cache
+from ..services import balance_jobs
+
+
+@lru_cache
+def _template_version(names: tuple[str, ...]) -> float:
+    """When the view's template last changed, so a deploy with new markup
+    never answers 304 with the old fragment."""
+    return os.path.getmtime(select_template(names).origin.name)
+
+
+class ConditionalGetMixin:
+    """Answer a GET with 304 Not Modified, without building the context, while
+    the client already has the fragment the journal's data would render.
+
+    The ETag covers the journal data version, the user's year, month and
+    drink type, the language, today's date, the url, the template and which
+    balances are being recalculated or wait for a worker, as a job can finish
+    or stall without changing the data. With a cache that keeps nothing there
+    is no version and no ETag.
+    """
+
+    def get(self, request, *args, **kwargs):
+        if not (etag := self.get_etag()):
+            return super().get(request, *args, **kwargs)
+
+        # 304 without building the context when the client's copy is current
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+
+        response["ETag"] = etag
+        # the browser keeps the fragment, but asks whether it is still fresh
+        response["Cache-Control"] = "private, no-cache"
+
+        return response
+
+    def get_etag(self) -> Optional[str]:
+        user = self.request.user
+
+        if (version := context_cache.get_version(user.journal_id)) is None:
+            return None
+
+        headers = self.request.headers
+        recalculating = balance_jobs.recalculating(user)
+        parts = (
+            version,
+            user.pk,
+            user.year,
+            user.month,
+            user.drink_type,
+            translation.get_language(),
+            date.today(),
+            self.request.get_full_path(),
+            headers.get("HX-Request"),
+            headers.get("HX-History-Restore-Request"),
+            self.request.session.session_key,
+            _template_version(tuple(self.get_template_names())),
+            recalculating,
+            recalculating and balance_jobs.stalled(user),
+        )
+        digest = hashlib.blake2b(
+            ":".join(str(part) for part in parts).encode(), digest_size=16
+        )
+
+        return quote_etag(digest.hexdigest())
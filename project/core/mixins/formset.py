@@ -7,6 +7,7 @@ from django.utils.translation import gettext as _
 
 from ...bookkeeping.models import AccountWorth, PensionWorth, SavingWorth
 from ...core import signals
+from ...core.lib import fragments, year_cache
 from ...core.lib.utils import http_htmx_response
 
 SIGNALS = {
@@ -15,6 +16,9 @@ SIGNALS = {
     PensionWorth: signals.pensions_signal,
 }
 
+# worth rows aggregated in the summaries of the finished years
+YEAR_DATA = {SavingWorth, PensionWorth}
+
 
 class BaseTypeFormSet(BaseModelFormSet):
     def _get_relation_field_name(self) -> str:
@@ -120,8 +124,16 @@ class FormsetMixin:
         ]:
             self.service_instance.objects.bulk_create(objects)
 
+            # bulk_create skips the signals; each row syncs its own category
             if signal := SIGNALS.get(self.model_class):
-                signal(sender=self.model_class, instance=next(iter(objects)))
+                for obj in objects:
+                    signal(sender=self.model_class, instance=obj)
+
+            if self.model_class in YEAR_DATA:
+                for obj in objects:
+                    year_cache.mark_written(obj)
+
+            fragments.mark_changed(self.model_class)
 
         return http_htmx_response(self.get_hx_trigger_django())
 
@@ -3,7 +3,7 @@ from django.db.models import Count, F, Sum
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
-from ...core.lib import search
+from ...core.lib import context_cache, search
 from ...core.lib.utils import add_fast_urls, get_action_buttons_html
 from ..lib.paginator import CountlessPaginator
 
@@ -58,20 +58,41 @@ class SearchMixin:
 
         return q[0] if q else {}
 
+    def search_summary(self, sql, search_str):
+        """
+        Count and statistic of the search result, cached per user and parsed
+        search until the journal's data changes, so paging through the result
+        only reads the page.
+
+        :return: a dictionary with count and stats
+        :rtype: dict
+        """
+        user = self.request.user
+
+        def build(user, *args):
+            stats = self.search_statistic(sql)
+            return {"count": stats.get("count") or sql.count(), "stats": stats}
+
+        return context_cache.journal_cache(f"search:{self.search_method}")(build)(
+            user, user.pk, search.search_key(search_str)
+        )
+
     def search(self):
         search_str = self.request.GET.get("search")
 
         sql = self.get_search_method()(self.request.user, search_str)
-        stats = self.search_statistic(sql)
+        summary = self.search_summary(sql, search_str)
+        stats = summary["stats"]
 
         page = self.request.GET.get("page", 1)
         paginator = CountlessPaginator(
             query=sql,
-            total_records=stats.get("count") or sql.count(),
+            total_records=summary["count"],
             per_page=self.per_page,
+            keyset=True,
         )
         page_range = paginator.get_elided_page_range(page)
-        page_obj = paginator.get_page(page)
+        page_obj = paginator.get_page(page, self.request.GET.get("cursor"))
 
         app = self.request.resolver_match.app_name
 
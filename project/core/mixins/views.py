@@ -9,6 +9,7 @@ from vanilla import (
     UpdateView,
 )
 
+from ..lib import context_cache
 from .create_update import CreateUpdateMixin
 from .delete import DeleteMixin
 from .kwargs import AddUserToKwargsMixin
@@ -69,7 +70,10 @@ class TemplateViewMixin(TemplateView):
 
 
 class ListViewMixin(GetQuerysetMixin, ListView):
-    pass
+    def get_count(self, queryset) -> int:
+        """Number of records of a paginated list, cached until the journal's
+        data changes, so only the page is read from the database."""
+        return context_cache.journal_count(self.request.user, queryset)
 
 
 class FormViewMixin(AddUserToKwargsMixin, FormView):
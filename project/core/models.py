@@ -25,3 +25,143 @@ class TitleAbstract(models.Model):
 
     def __str__(self):
         return str(self.title)
+
+
+class BalanceJob(models.Model):
+    """A balance ledger of a journal waiting for the balance_worker.
+
+    There is one row per journal and ledger: a write while the job is queued
+    merges its scope into the row and bumps `version`, so the worker knows the
+    job has to run again once it finishes the current pass.
+    """
+
+    class Kind(models.TextChoices):
+        ACCOUNTS = "accounts"
+        SAVINGS = "savings"
+        PENSIONS = "pensions"
+
+    journal = models.ForeignKey(
+        "journals.Journal", on_delete=models.CASCADE, related_name="balance_jobs"
+    )
+    kind = models.CharField(max_length=8, choices=Kind.choices)
+    scope = models.JSONField(null=True, blank=True)
+    version = models.PositiveIntegerField(default=1)
+    created = models.DateTimeField(auto_now_add=True)
+    started = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ["journal", "kind"]
+
+    def __str__(self):
+        return f"{self.journal} {self.kind}"
+
+
+class BalanceLedger(models.Model):
+    """Sync state of a journal's balance ledger.
+
+    The stored balance rows of `closed_year` and earlier are the year-close
+    snapshots: a sync that would otherwise rebuild the whole ledger starts
+    from the rows of `closed_year` and only rolls the later years forward.
+
+    `fingerprint` is a hash of the data the last full rebuild read; a full
+    sync reading the same data has nothing to change.
+    """
+
+    journal = models.ForeignKey(
+        "journals.Journal", on_delete=models.CASCADE, related_name="balance_ledgers"
+    )
+    kind = models.CharField(max_length=8, choices=BalanceJob.Kind.choices)
+    closed_year = models.PositiveIntegerField(null=True, blank=True)
+    fingerprint = models.CharField(max_length=32, blank=True)
+
+    class Meta:
+        unique_together = ["journal", "kind"]
+
+    def __str__(self):
+        return f"{self.journal} {self.kind}"
+
+
+class MonthlyRollup(models.Model):
+    """Sum and count of a journal's incomes, expenses or savings of one
+    category in one month.
+
+    The signals add the delta of every saved or deleted row, so the charts
+    read months × categories rows instead of every row ever recorded.
+    `category_id` is the row's income, expense or saving type.
+    """
+
+    class Kind(models.TextChoices):
+        INCOMES = "incomes"
+        EXPENSES = "expenses"
+        SAVINGS = "savings"
+
+    journal = models.ForeignKey(
+        "journals.Journal", on_delete=models.CASCADE, related_name="monthly_rollups"
+    )
+    year = models.PositiveIntegerField()
+    month = models.PositiveSmallIntegerField()
+    kind = models.CharField(max_length=8, choices=Kind.choices)
+    category_id = models.PositiveIntegerField()
+    sum = models.BigIntegerField(default=0)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ["journal", "year", "month", "kind", "category_id"]
+
+    def __str__(self):
+        return f"{self.journal} {self.year}-{self.month:02d} {self.kind}"
+
+
+class SearchDocument(models.Model):
+    """The searchable texts of one expense, income or book, case folded.
+
+    `category` holds the author and title of a book one per line; expenses
+    and incomes are searched by category through the category titles. Each
+    text is indexed by its trigrams in SearchGram, so a search word finds the
+    documents holding all of its trigrams instead of scanning every row with
+    LIKE '%word%'.
+    """
+
+    class Kind(models.TextChoices):
+        EXPENSES = "expenses"
+        INCOMES = "incomes"
+        BOOKS = "books"
+
+    journal = models.ForeignKey(
+        "journals.Journal", on_delete=models.CASCADE, related_name="search_documents"
+    )
+    kind = models.CharField(max_length=8, choices=Kind.choices)
+    object_id = models.PositiveIntegerField()
+    category = models.TextField(blank=True)
+    remark = models.TextField(blank=True)
+
+    class Meta:
+        unique_together = ["kind", "object_id"]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}"
+
+
+class SearchGram(models.Model):
+    """A trigram of a search document's text. The journal and kind are
+    repeated from the document, so a lookup stays within one index range."""
+
+    class Field(models.TextChoices):
+        CATEGORY = "category"
+        REMARK = "remark"
+
+    document = models.ForeignKey(
+        SearchDocument, on_delete=models.CASCADE, related_name="grams"
+    )
+    journal = models.ForeignKey(
+        "journals.Journal", on_delete=models.CASCADE, related_name="+"
+    )
+    kind = models.CharField(max_length=8, choices=SearchDocument.Kind.choices)
+    field = models.CharField(max_length=8, choices=Field.choices)
+    gram = models.CharField(max_length=3)
+
+    class Meta:
+        indexes = [models.Index(fields=["journal", "kind", "field", "gram"])]
+
+    def __str__(self):
+        return f"{self.field} {self.gram}"
@@ -0,0 +1,105 @@
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ...users.models import User
+from ..lib.signals import SyncScope
+from ..models import BalanceJob
+
+# a job claimed longer ago than this belongs to a worker that died
+STALE_AFTER = timedelta(minutes=10)
+
+
+def enqueue(journal_id: int, kind: str, scope: Optional[SyncScope]) -> None:
+    """Queue a sync of the journal's ledger, merging it into the queued job.
+
+    A None scope, or a None stored in the job, stands for a full rebuild.
+    """
+    with transaction.atomic():
+        job, created = BalanceJob.objects.select_for_update().get_or_create(
+            journal_id=journal_id,
+            kind=kind,
+            defaults={"scope": scope.to_json() if scope else None},
+        )
+        if created:
+            return
+
+        queued = SyncScope.from_json(job.scope) if job.scope else None
+        merged = queued | scope if queued and scope else None
+
+        BalanceJob.objects.filter(pk=job.pk).update(
+            scope=merged.to_json() if merged else None,
+            version=F("version") + 1,
+        )
+
+
+def claim(limit: int) -> list[BalanceJob]:
+    """Mark up to `limit` waiting jobs as started and return them. A job is
+    only handed out once, so one ledger never syncs in two workers at once."""
+    now = timezone.now()
+    waiting = BalanceJob.objects.filter(
+        Q(started__isnull=True) | Q(started__lt=now - STALE_AFTER)
+    ).order_by("created")
+
+    jobs = []
+    for job in waiting[:limit]:
+        # another worker may have claimed it since the select
+        if BalanceJob.objects.filter(pk=job.pk, started=job.started).update(
+            started=now
+        ):
+            job.started = now
+            jobs.append(job)
+
+    return jobs
+
+
+def finish(job: BalanceJob) -> None:
+    """Drop the job, unless a write queued more work for it meanwhile: then
+    release it for the next pass."""
+    if BalanceJob.objects.filter(pk=job.pk, version=job.version).delete()[0]:
+        return
+
+    BalanceJob.objects.filter(pk=job.pk).update(started=None)
+
+
+def is_recalculating(user: User, kind: str) -> bool:
+    if not settings.BALANCE_SYNC_IN_WORKER:
+        return False
+
+    return BalanceJob.objects.filter(journal=user.journal, kind=kind).exists()
+
+
+def is_stalled(user: User, kind: str) -> bool:
+    """The ledger's job has waited longer than STALE_AFTER without a worker
+    taking it, e.g. as no balance_worker runs."""
+    return kind in stalled(user)
+
+
+def recalculating(user: User) -> list[str]:
+    """Kinds of the journal's ledgers with a sync waiting or running."""
+    if not settings.BALANCE_SYNC_IN_WORKER:
+        return []
+
+    return sorted(
+        BalanceJob.objects.filter(journal_id=user.journal_id).values_list(
+            "kind", flat=True
+        )
+    )
+
+
+def stalled(user: User) -> list[str]:
+    """Kinds of the journal's ledgers whose sync no worker has taken for
+    longer than STALE_AFTER."""
+    if not settings.BALANCE_SYNC_IN_WORKER:
+        return []
+
+    stale = timezone.now() - STALE_AFTER
+    return sorted(
+        BalanceJob.objects.filter(journal_id=user.journal_id, created__lt=stale)
+        .filter(Q(started__isnull=True) | Q(started__lt=stale))
+        .values_list("kind", flat=True)
+    )
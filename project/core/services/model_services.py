@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
 from typing import Generic, TypeVar
 
+from django.db.models import Sum
+
 from ...users.models import User
+from ..models import MonthlyRollup
 
 _QS = TypeVar("_QS")
 
@@ -29,3 +32,24 @@ class BaseModelService(ABC, Generic[_QS]):
 
     @abstractmethod
     def items(self) -> _QS: ...
+
+
+class MonthlyRollupModelService(BaseModelService):
+    def get_queryset(self):
+        return MonthlyRollup.objects.filter(journal=self.user.journal)
+
+    def year(self, year: int):
+        return self.objects.filter(year=year)
+
+    def items(self):
+        return self.objects.all()
+
+    def sum_by_year(self, kind: str):
+        """Same rows as SumMixin.year_sum: {'year': int, 'sum': int}"""
+        return (
+            self.objects.filter(kind=kind)
+            .values("year")
+            .annotate(sum=Sum("sum"))
+            .order_by("year")
+            .values("year", "sum")
+        )
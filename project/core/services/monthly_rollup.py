@@ -0,0 +1,136 @@
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Coalesce, ExtractMonth, ExtractYear
+
+from ...expenses.models import Expense
+from ...incomes.models import Income
+from ...savings.models import Saving
+from ..models import MonthlyRollup
+
+# model -> (rollup kind, its category field)
+ROLLUPS = {
+    Income: (MonthlyRollup.Kind.INCOMES, "income_type"),
+    Expense: (MonthlyRollup.Kind.EXPENSES, "expense_type"),
+    Saving: (MonthlyRollup.Kind.SAVINGS, "saving_type"),
+}
+
+
+def apply(instance: models.Model, deleted: bool = False) -> None:
+    """Add the change a saved or deleted row makes to its journal's rollup.
+
+    An update moves the row's previous version (kept by the pre_save signal)
+    out of its month and category and the new one in.
+    """
+    kind, category = ROLLUPS[type(instance)]
+
+    try:
+        journal_id = getattr(instance, category).journal_id
+    except ObjectDoesNotExist:
+        # the category is gone with its journal
+        return
+
+    deltas = defaultdict(lambda: [0, 0])
+
+    def _add(row: models.Model, sign: int) -> None:
+        key = (row.date.year, row.date.month, getattr(row, f"{category}_id"))
+        deltas[key][0] += sign * (row.price or 0)
+        deltas[key][1] += sign
+
+    _add(instance, -1 if deleted else 1)
+    if not deleted and (previous := getattr(instance, "_previous_state", None)):
+        _add(previous, -1)
+
+    for (year, month, category_id), (total, count) in deltas.items():
+        if total or count:
+            _apply_delta(
+                type(instance), journal_id, year, month, category_id, total, count
+            )
+
+
+def _apply_delta(
+    model: type[models.Model],
+    journal_id: int,
+    year: int,
+    month: int,
+    category_id: int,
+    total: int,
+    count: int,
+) -> None:
+    kind, category = ROLLUPS[model]
+    rows = MonthlyRollup.objects.filter(
+        journal_id=journal_id,
+        year=year,
+        month=month,
+        kind=kind,
+        category_id=category_id,
+    )
+    change = {"sum": F("sum") + total, "count": F("count") + count}
+
+    if rows.update(**change):
+        if count < 0:
+            rows.filter(count__lte=0).delete()
+        return
+
+    # the month is new, or its row went missing under writes the signals did
+    # not see, e.g. bulk updates; either way it is counted from its rows
+    totals = (
+        model.objects.filter(
+            **{f"{category}_id": category_id},
+            date__year=year,
+            date__month=month,
+        )
+        .order_by()
+        .aggregate(sum=Coalesce(Sum("price"), 0), count=Count("id"))
+    )
+    if not totals["count"]:
+        return
+
+    try:
+        with transaction.atomic():
+            rows.create(
+                journal_id=journal_id,
+                year=year,
+                month=month,
+                kind=kind,
+                category_id=category_id,
+                **totals,
+            )
+    except IntegrityError:
+        # another request opened the month meanwhile
+        rows.update(**change)
+
+
+def rebuild(journal_ids: Optional[Iterable[int]] = None) -> int:
+    """Recount the rollups of the given journals, or of all, from their rows;
+    returns the number of rollup rows written."""
+    rollups = MonthlyRollup.objects.all()
+    if journal_ids is not None:
+        rollups = rollups.filter(journal_id__in=list(journal_ids))
+
+    objects = []
+    for model, (kind, category) in ROLLUPS.items():
+        rows = model.objects.all()
+        if journal_ids is not None:
+            rows = rows.filter(**{f"{category}__journal_id__in": list(journal_ids)})
+
+        objects += [
+            MonthlyRollup(kind=kind, **row)
+            for row in rows.values(
+                journal_id=F(f"{category}__journal_id"),
+                year=ExtractYear("date"),
+                month=ExtractMonth("date"),
+                category_id=F(f"{category}_id"),
+            )
+            .annotate(sum=Coalesce(Sum("price"), 0), count=Count("id"))
+            .order_by()
+        ]
+
+    with transaction.atomic():
+        rollups.delete()
+        MonthlyRollup.objects.bulk_create(objects)
+
+    return len(objects)
@@ -0,0 +1,168 @@
+from typing import Iterable, Optional
+
+from django.db import models, transaction
+from django.db.models import Count
+
+from ...books.models import Book
+from ...expenses.models import Expense
+from ...incomes.models import Income
+from ..models import SearchDocument, SearchGram
+
+Kind = SearchDocument.Kind
+Field = SearchGram.Field
+
+BATCH_SIZE = 1000
+
+# model -> (document kind, fields of its category text, the related row the
+# journal is read from); expense and income category words are matched to
+# the category titles by the search itself, so they have no category text
+DOCUMENTS = {
+    Expense: (Kind.EXPENSES, [], "expense_type"),
+    Income: (Kind.INCOMES, [], "income_type"),
+    Book: (Kind.BOOKS, ["author", "title"], "user"),
+}
+
+
+def normalize(text: Optional[str]) -> str:
+    return (text or "").casefold()
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _document(row: dict, kind: str, category: list[str]) -> SearchDocument:
+    return SearchDocument(
+        journal_id=row["journal_id"],
+        kind=kind,
+        object_id=row["id"],
+        category="\n".join(normalize(row[field]) for field in category),
+        remark=normalize(row["remark"]),
+    )
+
+
+def _grams(document: SearchDocument) -> list[SearchGram]:
+    return [
+        SearchGram(
+            document=document,
+            journal_id=document.journal_id,
+            kind=document.kind,
+            field=field,
+            gram=gram,
+        )
+        for field in Field.values
+        for gram in trigrams(getattr(document, field))
+    ]
+
+
+def _rows(model: type[models.Model], queryset: models.QuerySet) -> Iterable[dict]:
+    _, category, owner = DOCUMENTS[model]
+    return queryset.values(
+        "id", "remark", *category, journal_id=models.F(f"{owner}__journal_id")
+    )
+
+
+def _read_ids(documents: list[SearchDocument]) -> None:
+    """Set the ids of inserted documents where the backend returns no rows
+    from a bulk insert, as MySQL; a kind and row id are one document."""
+    missing = [document for document in documents if document.pk is None]
+
+    for i in range(0, len(missing), BATCH_SIZE):
+        batch = {
+            document.object_id: document for document in missing[i : i + BATCH_SIZE]
+        }
+        ids = SearchDocument.objects.filter(
+            kind=missing[i].kind, object_id__in=batch
+        ).values_list("object_id", "id")
+
+        for object_id, pk in ids:
+            batch[object_id].pk = pk
+
+
+def _save(documents: list[SearchDocument], replace: bool = True) -> int:
+    """Write the documents of one kind with their trigrams, in place of the
+    ones the rows had unless told there are none."""
+    with transaction.atomic():
+        if replace and documents:
+            SearchDocument.objects.filter(
+                kind=documents[0].kind,
+                object_id__in=[document.object_id for document in documents],
+            ).delete()
+
+        SearchDocument.objects.bulk_create(documents, batch_size=BATCH_SIZE)
+        _read_ids(documents)
+        SearchGram.objects.bulk_create(
+            (gram for document in documents for gram in _grams(document)),
+            batch_size=BATCH_SIZE,
+        )
+
+    return len(documents)
+
+
+def _documents(
+    model: type[models.Model], queryset: models.QuerySet
+) -> list[SearchDocument]:
+    kind, category, _ = DOCUMENTS[model]
+    return [_document(row, kind, category) for row in _rows(model, queryset)]
+
+
+def update(instance: models.Model, deleted: bool = False) -> None:
+    """Index a saved row again, or drop a deleted one. An update that leaves
+    the texts as they were, like a new price, writes nothing."""
+    model = type(instance)
+    kind, _, _ = DOCUMENTS[model]
+    old = SearchDocument.objects.filter(kind=kind, object_id=instance.pk)
+
+    if deleted:
+        old.delete()
+        return
+
+    documents = _documents(model, model.objects.filter(pk=instance.pk))
+    texts = old.values_list("category", "remark").first()
+
+    if texts and documents and texts == (documents[0].category, documents[0].remark):
+        return
+
+    _save(documents, replace=texts is not None)
+
+
+def rebuild(journal_ids: Optional[Iterable[int]] = None) -> int:
+    """Index again every row of the given journals, or of all; returns the
+    number of documents written."""
+    documents = SearchDocument.objects.all()
+    if journal_ids is not None:
+        documents = documents.filter(journal_id__in=list(journal_ids))
+
+    with transaction.atomic():
+        documents.delete()
+
+        total = 0
+        for model, (_, _, owner) in DOCUMENTS.items():
+            rows = model.objects.all()
+            if journal_ids is not None:
+                rows = rows.filter(**{f"{owner}__journal_id__in": list(journal_ids)})
+            total += _save(_documents(model, rows), replace=False)
+
+    return total
+
+
+def find(journal_id: int, kind: str, field: str, word: str) -> models.QuerySet:
+    """Ids of the journal's rows whose field contains the word, case folded,
+    as a subquery; the word needs at least three characters."""
+    word = normalize(word)
+    grams = trigrams(word)
+
+    candidates = (
+        SearchGram.objects.filter(
+            journal_id=journal_id, kind=kind, field=field, gram__in=grams
+        )
+        .values("document")
+        .annotate(matched=Count("gram"))
+        .filter(matched=len(grams))
+        .values("document")
+    )
+
+    # all trigrams of the word do not make the word; the text has the last say
+    return SearchDocument.objects.filter(
+        pk__in=candidates, **{f"{field}__contains": word}
+    ).values("object_id")
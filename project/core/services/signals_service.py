@@ -1,6 +1,11 @@
-from typing import Optional
+from functools import partial
+from typing import Iterable, Optional
 
+import polars as pl
+from django.conf import settings
 from django.db import models
+from django.db.models import QuerySet
+from django.utils import timezone
 
 from ...accounts.services.model_services import (
     AccountBalanceModelService,
@@ -30,8 +35,11 @@ from ...transactions.services.model_services import (
     TransactionModelService,
 )
 from ...users.models import User
-from ..lib.db_sync import BalanceSynchronizer
-from ..lib.signals import Accounts, GetData, Savings
+from ..lib import context_cache, sync_scheduler, year_cache
+from ..lib.db_sync import BalanceSynchronizer, balance_fields
+from ..lib.signals import Accounts, GetData, Savings, SyncScope
+from ..models import BalanceJob, BalanceLedger
+from . import balance_jobs
 
 ACCOUNTS_CONF = {
     "incomes": (
@@ -74,31 +82,270 @@ PENSIONS_CONF = {
 }
 
 
-def sync_accounts(instance: models.Model, user: Optional[User] = None):
-    _sync_data(instance, user, ACCOUNTS_CONF, Accounts, AccountBalanceModelService)
+LEDGERS = {
+    BalanceJob.Kind.ACCOUNTS: (ACCOUNTS_CONF, Accounts, AccountBalanceModelService),
+    BalanceJob.Kind.SAVINGS: (SAVINGS_CONF, Savings, SavingBalanceModelService),
+    BalanceJob.Kind.PENSIONS: (PENSIONS_CONF, Savings, PensionBalanceModelService),
+}
+
+
+def sync_accounts(
+    instance: models.Model, user: Optional[User] = None, deleted: bool = False
+):
+    _sync_data(instance, user, BalanceJob.Kind.ACCOUNTS, deleted)
+
+
+def sync_savings(
+    instance: models.Model, user: Optional[User] = None, deleted: bool = False
+):
+    _sync_data(instance, user, BalanceJob.Kind.SAVINGS, deleted)
+
 
+def sync_pensions(
+    instance: models.Model, user: Optional[User] = None, deleted: bool = False
+):
+    _sync_data(instance, user, BalanceJob.Kind.PENSIONS, deleted)
+
+
+def sync_ledger(
+    user: User, kind: str, scope: Optional[SyncScope] = None, force: bool = False
+):
+    """Recalculate the journal's balance table of the given kind, all of it or
+    only the slice `scope` covers.
 
-def sync_savings(instance: models.Model, user: Optional[User] = None):
-    _sync_data(instance, user, SAVINGS_CONF, Savings, SavingBalanceModelService)
+    A full sync is skipped when the data it reads has not changed since the
+    last rebuild and the table is there, unless it is `force`d.
+    """
+    conf, signal_cls, sync_model_service = LEDGERS[kind]
+
+    is_full = scope is None
+    balances = sync_model_service(user).objects
+    scope, seed, stored, last_year = _get_slice(user, kind, scope, balances)
+
+    source = GetData(user, conf, scope)
+    fingerprint = source.fingerprint() if scope is None else ""
+
+    if (
+        is_full
+        and not force
+        and fingerprint == _get_fingerprint(user, kind)
+        and balances.exists()
+    ):
+        return
 
+    data = signal_cls(source, seed=seed, last_year=last_year)
+    BalanceSynchronizer(sync_model_service, user, data.df, scope, stored)
+    context_cache.bump(user.journal_id)
+    # a worker writes the balances after the write that queued it bumped the
+    # years, so a summary in between has cached the old balances
+    year_cache.bump(user.journal_id, _get_written_years(scope))
 
-def sync_pensions(instance: models.Model, user: Optional[User] = None):
-    _sync_data(instance, user, PENSIONS_CONF, Savings, PensionBalanceModelService)
+    # a slice keeps the ledger's year range, so only a rebuild moves the close
+    if last_year is None:
+        _save_ledger(user, kind, data.df, fingerprint)
+
+
+def run_job(job: BalanceJob) -> None:
+    if user := job.journal.users.first():
+        scope = SyncScope.from_json(job.scope) if job.scope else None
+        sync_ledger(user, job.kind, scope)
+
+    balance_jobs.finish(job)
+
+
+def remember_previous_state(instance: models.Model) -> None:
+    """Keep the stored version of a row about to be updated, so the sync after
+    the save also covers the category and year the row is moving out of."""
+    instance._previous_state = (
+        type(instance)._default_manager.filter(pk=instance.pk).first()
+        if instance.pk
+        else None
+    )
 
 
 def _sync_data(
     instance: models.Model,
     user: Optional[User],
-    conf: dict,
-    signal_cls,
-    sync_model_service,
+    kind: str,
+    deleted: bool = False,
 ):
     user = user or _get_user_from_instance(instance)
     if not user:
         return
 
-    data = signal_cls(GetData(user, conf))
-    BalanceSynchronizer(sync_model_service, user, data.df)
+    # a written row changes the contexts built from it at once; a sync asked
+    # for without one bumps the version only if it writes the balances
+    if isinstance(instance, models.Model):
+        context_cache.bump(user.journal_id)
+
+    _, _, sync_model_service = LEDGERS[kind]
+    scope = _get_scope(instance, sync_model_service(user).objects.model, deleted)
+
+    run = (
+        partial(balance_jobs.enqueue, user.journal_id, kind)
+        if settings.BALANCE_SYNC_IN_WORKER
+        else partial(sync_ledger, user, kind)
+    )
+    sync_scheduler.schedule((user.journal_id, kind), run, scope)
+
+
+def _get_slice(
+    user: User, kind: str, scope: Optional[SyncScope], balances: QuerySet
+) -> tuple:
+    """The part of the balance table a write can change: its scope, the stored
+    rows it starts from, the stored rows it replaces and the last year the
+    table reaches.
+
+    A write that can change the journal's year range, which every category's
+    rows follow, rolls all categories forward from the closed year instead.
+    All four are None when the whole table has to be rebuilt: without a scope,
+    or when that write reaches into the closed years or vacates a year.
+    """
+    full = None, None, None, None
+
+    if not scope:
+        return full
+
+    fk_field, fields = balance_fields(balances.model)
+    rows = list(
+        balances.filter(
+            **{
+                f"{fk_field}__in": scope.category_ids,
+                "year__gte": scope.first_year - 1,
+            }
+        ).values("id", fk_field, "year", *fields)
+    )
+
+    # an open category runs as far as the whole table: one year past the
+    # newest data. A write into that year widens the table, and one leaving
+    # the newest data year may narrow it
+    last_year = max((row["year"] for row in rows), default=None)
+    if (
+        not last_year
+        or scope.last_year >= last_year
+        or (last_year - 1) in scope.vacated_years
+    ):
+        return _get_open_years(user, kind, scope, balances) or full
+
+    seed = [
+        row | {"category_id": row[fk_field]}
+        for row in rows
+        if row["year"] < scope.first_year
+    ]
+    stored = [row for row in rows if row["year"] >= scope.first_year]
+
+    return scope, seed, stored, last_year
+
+
+def _get_open_years(
+    user: User, kind: str, scope: SyncScope, balances: QuerySet
+) -> Optional[tuple]:
+    """The slice of every category from the year after the closed one, seeded
+    with the stored rows of the closed year.
+
+    A vacated year may leave the newest data in a closed year, where the
+    rolled forward table would not end, so such writes rebuild everything.
+    """
+    if scope.vacated_years:
+        return None
+
+    closed_year = (
+        BalanceLedger.objects.filter(journal_id=user.journal_id, kind=kind)
+        .values_list("closed_year", flat=True)
+        .first()
+    )
+    if not closed_year or scope.first_year <= closed_year:
+        return None
+
+    fk_field, fields = balance_fields(balances.model)
+    rows = list(
+        balances.filter(year__gte=closed_year).values("id", fk_field, "year", *fields)
+    )
+
+    # a category without rows has no data, unless the write brought it
+    scope = SyncScope(
+        category_ids=scope.category_ids | {row[fk_field] for row in rows},
+        years=scope.years | {closed_year + 1},
+    )
+    seed = [
+        row | {"category_id": row[fk_field]}
+        for row in rows
+        if row["year"] == closed_year
+    ]
+    stored = [row for row in rows if row["year"] > closed_year]
+
+    # the table reaches past the closed year, so without its rows there is
+    # no snapshot to start from
+    if not seed:
+        return None
+
+    return scope, seed, stored, None
+
+
+def _get_written_years(scope: Optional[SyncScope]) -> Iterable[Optional[int]]:
+    """The years a sync rewrote the balances of: a slice rolls forward from its
+    first year, a rebuild rewrites all of them."""
+    if scope is None:
+        return (None,)
+
+    return range(scope.first_year, timezone.now().year + 1)
+
+
+def _get_fingerprint(user: User, kind: str) -> Optional[str]:
+    return (
+        BalanceLedger.objects.filter(journal_id=user.journal_id, kind=kind)
+        .values_list("fingerprint", flat=True)
+        .first()
+    )
+
+
+def _save_ledger(user: User, kind: str, df: pl.LazyFrame, fingerprint: str) -> None:
+    """Move the ledger's close to the last finished year, which the table has
+    to reach for its rows to be a snapshot, and keep the fingerprint of the
+    data a full rebuild read."""
+    last_year = df.select(pl.col("year").max()).collect().item()
+    if last_year is None:
+        return
+
+    values = {
+        "closed_year": min(timezone.now().year - 1, last_year - 1),
+        "fingerprint": fingerprint,
+    }
+
+    # one row per journal and kind, made by the ledger's first full rebuild
+    ledger = BalanceLedger.objects.filter(journal_id=user.journal_id, kind=kind)
+    if not ledger.update(**values):
+        BalanceLedger.objects.create(journal_id=user.journal_id, kind=kind, **values)
+
+
+def _get_scope(
+    instance: models.Model, balance_model, deleted: bool
+) -> Optional[SyncScope]:
+    if not isinstance(instance, models.Model):
+        return None
+
+    fk_field, _ = balance_fields(balance_model)
+    category_model = balance_model._meta.get_field(fk_field).related_model
+
+    previous = None if deleted else getattr(instance, "_previous_state", None)
+    rows = [row for row in (instance, previous) if row]
+
+    category_ids = frozenset(
+        getattr(row, field.attname)
+        for row in rows
+        for field in row._meta.concrete_fields
+        if field.many_to_one and field.related_model is category_model
+    )
+    if not category_ids:
+        return None
+
+    years = frozenset(row.date.year for row in rows)
+
+    return SyncScope(
+        category_ids=category_ids,
+        years=years,
+        vacated_years=years if deleted else years - {instance.date.year},
+    )
 
 
 def _get_user_from_instance(instance: models.Model) -> Optional[User]:
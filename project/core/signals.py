@@ -1,15 +1,41 @@
 from django.db import models
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
+from ..accounts import models as account
 from ..bookkeeping import models as bookkeeping
+from ..books import models as book
+from ..counts import models as count
 from ..debts import models as debt
+from ..drinks import models as drink
 from ..expenses import models as expense
 from ..incomes import models as income
+from ..journals import models as journal
 from ..pensions import models as pension
+from ..plans import models as plan
 from ..savings import models as saving
 from ..transactions import models as transaction
-from .services import signals_service
+from .lib import context_cache, fragments, year_cache
+from .services import monthly_rollup, search_index, signals_service
+
+
+# -------------------------------------------------------------------------------------
+#                                                       Previous state of updated rows
+# -------------------------------------------------------------------------------------
+@receiver(pre_save, sender=income.Income)
+@receiver(pre_save, sender=expense.Expense)
+@receiver(pre_save, sender=saving.Saving)
+@receiver(pre_save, sender=transaction.Transaction)
+@receiver(pre_save, sender=transaction.SavingClose)
+@receiver(pre_save, sender=transaction.SavingChange)
+@receiver(pre_save, sender=debt.Debt)
+@receiver(pre_save, sender=debt.DebtReturn)
+@receiver(pre_save, sender=pension.Pension)
+@receiver(pre_save, sender=bookkeeping.AccountWorth)
+@receiver(pre_save, sender=bookkeeping.SavingWorth)
+@receiver(pre_save, sender=bookkeeping.PensionWorth)
+def previous_state_signal(sender: object, instance: models.Model, *args, **kwargs):
+    signals_service.remember_previous_state(instance)
 
 
 # -------------------------------------------------------------------------------------
@@ -31,7 +57,7 @@ from .services import signals_service
 @receiver(post_delete, sender=debt.DebtReturn)
 @receiver(post_save, sender=bookkeeping.AccountWorth)
 def accounts_signal(sender: object, instance: models.Model, *args, **kwargs):
-    signals_service.sync_accounts(instance)
+    signals_service.sync_accounts(instance, deleted=kwargs.get("signal") is post_delete)
 
 
 # -------------------------------------------------------------------------------------
@@ -45,7 +71,7 @@ def accounts_signal(sender: object, instance: models.Model, *args, **kwargs):
 @receiver(post_delete, sender=transaction.SavingChange)
 @receiver(post_save, sender=bookkeeping.SavingWorth)
 def savings_signal(sender: object, instance: models.Model, *args, **kwargs):
-    signals_service.sync_savings(instance)
+    signals_service.sync_savings(instance, deleted=kwargs.get("signal") is post_delete)
 
 
 # -------------------------------------------------------------------------------------
@@ -55,7 +81,166 @@ def savings_signal(sender: object, instance: models.Model, *args, **kwargs):
 @receiver(post_delete, sender=pension.Pension)
 @receiver(post_save, sender=bookkeeping.PensionWorth)
 def pensions_signal(sender: object, instance: models.Model, *args, **kwargs):
-    signals_service.sync_pensions(instance)
+    signals_service.sync_pensions(instance, deleted=kwargs.get("signal") is post_delete)
+
+
+# -------------------------------------------------------------------------------------
+#                                                                       Monthly rollups
+# -------------------------------------------------------------------------------------
+@receiver(post_save, sender=income.Income)
+@receiver(post_delete, sender=income.Income)
+@receiver(post_save, sender=expense.Expense)
+@receiver(post_delete, sender=expense.Expense)
+@receiver(post_save, sender=saving.Saving)
+@receiver(post_delete, sender=saving.Saving)
+def monthly_rollup_signal(sender: object, instance: models.Model, *args, **kwargs):
+    monthly_rollup.apply(instance, deleted=kwargs.get("signal") is post_delete)
+
+
+# -------------------------------------------------------------------------------------
+#          Categories, plans, drinks, counts and books behind cached contexts and pages
+# -------------------------------------------------------------------------------------
+@receiver(post_save, sender=account.Account)
+@receiver(post_delete, sender=account.Account)
+@receiver(post_save, sender=saving.SavingType)
+@receiver(post_delete, sender=saving.SavingType)
+@receiver(post_save, sender=pension.PensionType)
+@receiver(post_delete, sender=pension.PensionType)
+@receiver(post_save, sender=income.IncomeType)
+@receiver(post_delete, sender=income.IncomeType)
+@receiver(post_save, sender=expense.ExpenseType)
+@receiver(post_delete, sender=expense.ExpenseType)
+@receiver(post_save, sender=expense.ExpenseName)
+@receiver(post_delete, sender=expense.ExpenseName)
+@receiver(post_save, sender=plan.IncomePlan)
+@receiver(post_delete, sender=plan.IncomePlan)
+@receiver(post_save, sender=plan.ExpensePlan)
+@receiver(post_delete, sender=plan.ExpensePlan)
+@receiver(post_save, sender=plan.SavingPlan)
+@receiver(post_delete, sender=plan.SavingPlan)
+@receiver(post_save, sender=plan.DayPlan)
+@receiver(post_delete, sender=plan.DayPlan)
+@receiver(post_save, sender=plan.NecessaryPlan)
+@receiver(post_delete, sender=plan.NecessaryPlan)
+@receiver(post_save, sender=drink.Drink)
+@receiver(post_delete, sender=drink.Drink)
+@receiver(post_save, sender=drink.DrinkTarget)
+@receiver(post_delete, sender=drink.DrinkTarget)
+@receiver(post_save, sender=count.Count)
+@receiver(post_delete, sender=count.Count)
+@receiver(post_save, sender=count.CountType)
+@receiver(post_delete, sender=count.CountType)
+@receiver(post_save, sender=book.Book)
+@receiver(post_delete, sender=book.Book)
+@receiver(post_save, sender=journal.Journal)
+def journal_data_signal(sender: object, instance: models.Model, *args, **kwargs):
+    if isinstance(instance, journal.Journal):
+        journal_id = instance.pk
+    elif isinstance(instance, expense.ExpenseName):
+        journal_id = instance.parent.journal_id
+    elif hasattr(instance, "journal_id"):
+        journal_id = instance.journal_id
+    else:
+        # drinks, counts and books belong to a user of the journal
+        journal_id = instance.user.journal_id
+
+    context_cache.bump(journal_id)
+
+
+# -------------------------------------------------------------------------------------
+#                                               Finished years cached for the summaries
+# -------------------------------------------------------------------------------------
+@receiver(post_save, sender=income.Income)
+@receiver(post_delete, sender=income.Income)
+@receiver(post_save, sender=expense.Expense)
+@receiver(post_delete, sender=expense.Expense)
+@receiver(post_save, sender=saving.Saving)
+@receiver(post_delete, sender=saving.Saving)
+@receiver(post_save, sender=pension.Pension)
+@receiver(post_delete, sender=pension.Pension)
+@receiver(post_save, sender=transaction.SavingClose)
+@receiver(post_delete, sender=transaction.SavingClose)
+@receiver(post_save, sender=transaction.SavingChange)
+@receiver(post_delete, sender=transaction.SavingChange)
+@receiver(post_save, sender=bookkeeping.SavingWorth)
+@receiver(post_delete, sender=bookkeeping.SavingWorth)
+@receiver(post_save, sender=bookkeeping.PensionWorth)
+@receiver(post_delete, sender=bookkeeping.PensionWorth)
+def year_data_signal(sender: object, instance: models.Model, *args, **kwargs):
+    year_cache.mark_written(instance)
+
+
+@receiver(post_save, sender=income.IncomeType)
+@receiver(post_delete, sender=income.IncomeType)
+@receiver(post_save, sender=expense.ExpenseType)
+@receiver(post_delete, sender=expense.ExpenseType)
+@receiver(post_save, sender=expense.ExpenseName)
+@receiver(post_delete, sender=expense.ExpenseName)
+@receiver(post_save, sender=saving.SavingType)
+@receiver(post_delete, sender=saving.SavingType)
+@receiver(post_save, sender=pension.PensionType)
+@receiver(post_delete, sender=pension.PensionType)
+def year_data_category_signal(sender: object, instance: models.Model, *args, **kwargs):
+    if isinstance(instance, expense.ExpenseName):
+        journal_id = instance.parent.journal_id
+    else:
+        journal_id = instance.journal_id
+
+    year_cache.bump(journal_id)
+
+
+# -------------------------------------------------------------------------------------
+#                                                                          Search index
+# -------------------------------------------------------------------------------------
+@receiver(post_save, sender=income.Income)
+@receiver(post_delete, sender=income.Income)
+@receiver(post_save, sender=expense.Expense)
+@receiver(post_delete, sender=expense.Expense)
+@receiver(post_save, sender=book.Book)
+@receiver(post_delete, sender=book.Book)
+def search_index_signal(sender: object, instance: models.Model, *args, **kwargs):
+    search_index.update(instance, deleted=kwargs.get("signal") is post_delete)
+
+
+# -------------------------------------------------------------------------------------
+#                                                                   Fragments to reload
+# -------------------------------------------------------------------------------------
+@receiver(post_save, sender=income.Income)
+@receiver(post_delete, sender=income.Income)
+@receiver(post_save, sender=expense.Expense)
+@receiver(post_delete, sender=expense.Expense)
+@receiver(post_save, sender=saving.Saving)
+@receiver(post_delete, sender=saving.Saving)
+@receiver(post_save, sender=pension.Pension)
+@receiver(post_delete, sender=pension.Pension)
+@receiver(post_save, sender=transaction.Transaction)
+@receiver(post_delete, sender=transaction.Transaction)
+@receiver(post_save, sender=transaction.SavingClose)
+@receiver(post_delete, sender=transaction.SavingClose)
+@receiver(post_save, sender=transaction.SavingChange)
+@receiver(post_delete, sender=transaction.SavingChange)
+@receiver(post_save, sender=debt.Debt)
+@receiver(post_delete, sender=debt.Debt)
+@receiver(post_save, sender=debt.DebtReturn)
+@receiver(post_delete, sender=debt.DebtReturn)
+@receiver(post_save, sender=bookkeeping.AccountWorth)
+@receiver(post_delete, sender=bookkeeping.AccountWorth)
+@receiver(post_save, sender=bookkeeping.SavingWorth)
+@receiver(post_delete, sender=bookkeeping.SavingWorth)
+@receiver(post_save, sender=bookkeeping.PensionWorth)
+@receiver(post_delete, sender=bookkeeping.PensionWorth)
+@receiver(post_save, sender=account.Account)
+@receiver(post_delete, sender=account.Account)
+@receiver(post_save, sender=income.IncomeType)
+@receiver(post_delete, sender=income.IncomeType)
+@receiver(post_save, sender=expense.ExpenseType)
+@receiver(post_delete, sender=expense.ExpenseType)
+@receiver(post_save, sender=saving.SavingType)
+@receiver(post_delete, sender=saving.SavingType)
+@receiver(post_save, sender=pension.PensionType)
+@receiver(post_delete, sender=pension.PensionType)
+def fragments_signal(sender: object, instance: models.Model, *args, **kwargs):
+    fragments.mark_changed(sender)
 
 
 # -------------------------------------------------------------------------------------
@@ -0,0 +1,48 @@
+import json
+import os
+import platform
+from datetime import datetime
+
+import polars as pl
+import pytest
+from django import get_version
+from django.db import connection
+
+# where the results of a run are written; compare them with an earlier run's
+RESULTS_FILE = os.environ.get("BENCHMARK_RESULTS", "benchmark-results.json")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Benchmarks seed up to millions of rows, so they only run when they are
+    selected with `-m benchmark`."""
+    if "benchmark" in (config.getoption("markexpr") or ""):
+        return
+
+    skip = pytest.mark.skip(reason="benchmarks run with -m benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def benchmark_results():
+    results = []
+
+    yield results
+
+    if not results:
+        return
+
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "django": get_version(),
+                "polars": pl.__version__,
+                "database": connection.vendor,
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
@@ -0,0 +1,139 @@
+"""Synthetic journals for the benchmarks.
+
+Rows are bulk inserted, so no signal syncs any balance while seeding.
+"""
+
+import random
+from datetime import date, datetime, timezone
+
+from ....accounts.models import Account
+from ....bookkeeping.models import AccountWorth, PensionWorth, SavingWorth
+from ....expenses.models import Expense, ExpenseName, ExpenseType
+from ....incomes.models import Income, IncomeType
+from ....pensions.models import Pension, PensionType
+from ....savings.models import Saving, SavingType
+from ....transactions.models import SavingChange, SavingClose, Transaction
+from ....users.models import User
+
+BATCH_SIZE = 10_000
+
+# share of the seeded rows per model
+SHARES = {
+    Income: 0.25,
+    Expense: 0.40,
+    Transaction: 0.15,
+    Saving: 0.10,
+    SavingClose: 0.02,
+    SavingChange: 0.03,
+    Pension: 0.05,
+}
+
+
+def seed_journal(
+    user: User, rows: int, categories: int = 20, years: int = 20
+) -> dict[str, int]:
+    """Fill the user's journal with `rows` incomes, expenses, transactions,
+    savings and pensions spread over `categories` accounts and saving and
+    pension types each and `years` years, plus a worth check per category and
+    year. Returns the number of rows seeded per model."""
+    rnd = random.Random(rows)
+    journal = user.journal
+    first_year = date.today().year - years
+
+    accounts = Account.objects.bulk_create(
+        Account(title=f"Account {i}", slug=f"account-{i}", journal=journal)
+        for i in range(categories)
+    )
+    saving_types = SavingType.objects.bulk_create(
+        SavingType(title=f"Saving {i}", slug=f"saving-{i}", journal=journal)
+        for i in range(categories)
+    )
+    pension_types = PensionType.objects.bulk_create(
+        PensionType(title=f"Pension {i}", slug=f"pension-{i}", journal=journal)
+        for i in range(categories)
+    )
+    income_type = IncomeType.objects.create(title="Salary", journal=journal)
+    expense_type = ExpenseType.objects.create(title="Food", journal=journal)
+    expense_name = ExpenseName.objects.create(title="Bread", parent=expense_type)
+
+    def _date():
+        return date(first_year + rnd.randrange(years), rnd.randint(1, 12), 1)
+
+    def _price():
+        return rnd.randint(1, 100_000)
+
+    makers = {
+        Income: lambda: Income(
+            date=_date(),
+            price=_price(),
+            account=rnd.choice(accounts),
+            income_type=income_type,
+        ),
+        Expense: lambda: Expense(
+            date=_date(),
+            price=_price(),
+            account=rnd.choice(accounts),
+            expense_type=expense_type,
+            expense_name=expense_name,
+        ),
+        Transaction: lambda: Transaction(
+            date=_date(),
+            price=_price(),
+            from_account=rnd.choice(accounts),
+            to_account=rnd.choice(accounts),
+        ),
+        Saving: lambda: Saving(
+            date=_date(),
+            price=_price(),
+            fee=rnd.randint(0, 100),
+            account=rnd.choice(accounts),
+            saving_type=rnd.choice(saving_types),
+        ),
+        SavingClose: lambda: SavingClose(
+            date=_date(),
+            price=_price(),
+            fee=rnd.randint(0, 100),
+            from_account=rnd.choice(saving_types),
+            to_account=rnd.choice(accounts),
+        ),
+        SavingChange: lambda: SavingChange(
+            date=_date(),
+            price=_price(),
+            fee=rnd.randint(0, 100),
+            from_account=rnd.choice(saving_types),
+            to_account=rnd.choice(saving_types),
+        ),
+        Pension: lambda: Pension(
+            date=_date(),
+            price=_price(),
+            fee=rnd.randint(0, 100),
+            pension_type=rnd.choice(pension_types),
+        ),
+    }
+
+    seeded = {}
+    for model, share in SHARES.items():
+        count = int(rows * share)
+        model.objects.bulk_create(
+            (makers[model]() for _ in range(count)), batch_size=BATCH_SIZE
+        )
+        seeded[model._meta.label] = count
+
+    for model, field, items in (
+        (AccountWorth, "account", accounts),
+        (SavingWorth, "saving_type", saving_types),
+        (PensionWorth, "pension_type", pension_types),
+    ):
+        checks = [
+            model(
+                date=datetime(year, 12, 31, tzinfo=timezone.utc),
+                price=_price(),
+                **{field: item},
+            )
+            for item in items
+            for year in range(first_year, first_year + years)
+        ]
+        model.objects.bulk_create(checks, batch_size=BATCH_SIZE)
+        seeded[model._meta.label] = len(checks)
+
+    return seeded
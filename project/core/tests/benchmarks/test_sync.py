@@ -0,0 +1,132 @@
+import time
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from ....incomes.models import Income, IncomeType
+from ....pensions.models import Pension, PensionType
+from ....savings.models import Saving, SavingType
+from ...lib.db_sync import BalanceSynchronizer
+from ...lib.signals import GetData
+from ...services import signals_service
+from .seed import seed_journal
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+
+class StagedSynchronizer(BalanceSynchronizer):
+    """Stops after the diff, so the write is timed as a stage of its own."""
+
+    def sync(self) -> None:
+        self.operations = [op.collect().lazy() for op in self._identify_operations()]
+
+    def write(self) -> None:
+        upserts, deletes = self.operations
+
+        with transaction.atomic():
+            self._delete_records(deletes)
+            self._upsert_records(upserts)
+
+
+@contextmanager
+def measure(report: dict, name: str):
+    start = time.perf_counter()
+
+    with CaptureQueriesContext(connection) as queries:
+        yield
+
+    report[name] = {
+        "seconds": round(time.perf_counter() - start, 4),
+        "queries": len(queries),
+    }
+
+
+def _rebuild_by_stage(user, kind: str) -> dict:
+    conf, signal_cls, sync_model_service = signals_service.LEDGERS[kind]
+    sync_model_service(user).objects.all().delete()
+
+    stages = {}
+    with measure(stages, "fetch"):
+        data = GetData(user, conf)
+
+    with measure(stages, "build"):
+        table = signal_cls(data).df.collect().lazy()
+
+    with measure(stages, "diff"):
+        sync = StagedSynchronizer(sync_model_service, user, table)
+
+    with measure(stages, "write"):
+        sync.write()
+
+    stages["rows"] = len(table.collect())
+
+    return stages
+
+
+def _one_write(user, kind: str):
+    """A save of one row, with the sync its signals run."""
+    journal = user.journal
+    day = date(date.today().year - 1, 6, 1)
+
+    match kind:
+        case "accounts":
+            return lambda: Income.objects.create(
+                date=day,
+                price=1,
+                account=journal.accounts.first(),
+                income_type=IncomeType.objects.filter(journal=journal).first(),
+            )
+        case "savings":
+            return lambda: Saving.objects.create(
+                date=day,
+                price=1,
+                account=journal.accounts.first(),
+                saving_type=SavingType.objects.filter(journal=journal).first(),
+            )
+        case "pensions":
+            return lambda: Pension.objects.create(
+                date=day,
+                price=1,
+                pension_type=PensionType.objects.filter(journal=journal).first(),
+            )
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_sync(size, main_user, benchmark_results):
+    start = time.perf_counter()
+    seeded = seed_journal(main_user, SIZES[size])
+    seconds = round(time.perf_counter() - start, 2)
+
+    print(f"\n{size}: seeded {sum(seeded.values())} rows in {seconds}s")
+
+    for kind in signals_service.LEDGERS:
+        sync = getattr(signals_service, f"sync_{kind}")
+        write = _one_write(main_user, kind)
+
+        report = {"size": size, "kind": kind, "seeded": seeded}
+        report["stages"] = _rebuild_by_stage(main_user, kind)
+
+        with measure(report, "resync"):
+            sync(instance=None, user=main_user)
+
+        with measure(report, "one_write"):
+            write()
+
+        benchmark_results.append(report)
+
+        print(
+            f"{kind}: "
+            + ", ".join(
+                f"{name} {value['seconds']}s/{value['queries']}q"
+                for name, value in report["stages"].items()
+                if isinstance(value, dict)
+            )
+            + f", resync {report['resync']['seconds']}s"
+            + f", one write {report['one_write']['seconds']}s"
+        )
@@ -0,0 +1,132 @@
+import pytest
+from django.core.cache import cache
+from django.utils import translation
+from mock import Mock
+
+from ....accounts.tests.factories import AccountFactory
+from ....books.models import Book
+from ....books.tests.factories import BookFactory
+from ....incomes.tests.factories import IncomeFactory
+from ...lib import context_cache
+
+
+@pytest.fixture
+def locmem(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+
+
+def _service():
+    func = Mock(side_effect=lambda user, *args, **kwargs: {"args": args})
+    return func, context_cache.journal_cache("service")(func)
+
+
+def test_dummy_cache_is_bypassed(main_user):
+    func, cached = _service()
+
+    cached(main_user, 1999)
+    cached(main_user, 1999)
+
+    assert func.call_count == 2
+
+
+def test_context_is_cached(main_user, locmem):
+    func, cached = _service()
+
+    assert cached(main_user, 1999) == {"args": (1999,)}
+    assert cached(main_user, 1999) == {"args": (1999,)}
+
+    assert func.call_count == 1
+
+
+def test_bump_makes_context_stale(main_user, locmem):
+    func, cached = _service()
+
+    cached(main_user, 1999)
+    context_cache.bump(main_user.journal_id)
+    cached(main_user, 1999)
+
+    assert func.call_count == 2
+
+
+@pytest.mark.parametrize("args", [(2000,), (1999, "x")])
+def test_arguments_are_part_of_key(main_user, locmem, args):
+    func, cached = _service()
+
+    cached(main_user, 1999)
+    cached(main_user, *args)
+
+    assert func.call_count == 2
+
+
+def test_language_is_part_of_key(main_user, locmem):
+    func, cached = _service()
+
+    with translation.override("en"):
+        cached(main_user, 1999)
+    with translation.override("lt"):
+        cached(main_user, 1999)
+
+    assert func.call_count == 2
+
+
+def test_user_year_is_part_of_key(main_user, locmem):
+    func, cached = _service()
+
+    cached(main_user)
+    main_user.year = 2000
+    cached(main_user)
+
+    assert func.call_count == 2
+
+
+@pytest.mark.django_db
+def test_journal_count_is_cached(main_user, locmem, django_assert_num_queries):
+    BookFactory()
+    queryset = Book.objects.filter(user=main_user)
+
+    with django_assert_num_queries(1):
+        assert context_cache.journal_count(main_user, queryset) == 1
+        assert context_cache.journal_count(main_user, queryset) == 1
+
+
+@pytest.mark.django_db
+def test_journal_count_is_keyed_by_queryset(main_user, locmem):
+    BookFactory(title="A")
+    BookFactory(title="B")
+    books = Book.objects.filter(user=main_user)
+
+    assert context_cache.journal_count(main_user, books) == 2
+    assert context_cache.journal_count(main_user, books.filter(title="A")) == 1
+    assert context_cache.journal_count(main_user, books.filter(title="X")) == 0
+
+
+@pytest.mark.django_db
+def test_save_bumps_version(main_user, locmem):
+    version = context_cache.get_version(main_user.journal_id)
+
+    IncomeFactory()
+
+    assert context_cache.get_version(main_user.journal_id) != version
+
+
+@pytest.mark.django_db
+def test_category_save_bumps_version(main_user, locmem):
+    account = AccountFactory()
+    version = context_cache.get_version(main_user.journal_id)
+
+    account.title = "New Title"
+    account.save()
+
+    assert context_cache.get_version(main_user.journal_id) != version
+
+
+@pytest.mark.django_db
+def test_book_save_bumps_version(main_user, locmem):
+    version = context_cache.get_version(main_user.journal_id)
+
+    BookFactory(user=main_user)
+
+    assert context_cache.get_version(main_user.journal_id) != version
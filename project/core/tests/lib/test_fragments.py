@@ -0,0 +1,112 @@
+import json
+
+import pytest
+import time_machine
+from django.urls import reverse
+
+from ....accounts.tests.factories import AccountFactory
+from ....bookkeeping.models import SavingWorth
+from ....expenses.models import Expense
+from ....incomes.models import Income
+from ....incomes.tests.factories import IncomeTypeFactory
+from ....savings.tests.factories import SavingTypeFactory
+from ...lib import fragments
+
+
+@pytest.mark.parametrize(
+    "fragment, expect",
+    [
+        ("accounts", "fragmentAccounts"),
+        ("no_incomes", "fragmentNoIncomes"),
+    ],
+)
+def test_event(fragment, expect):
+    assert fragments.event(fragment) == expect
+
+
+def test_events_of_expenses():
+    actual = fragments.events({"expenses"})
+
+    assert "fragmentExpenses" in actual
+    assert "fragmentBalance" in actual
+    assert "fragmentSavings" not in actual
+
+
+def test_events_of_saving_worth():
+    actual = fragments.events({"saving_worth"})
+
+    assert set(actual) == {
+        "fragmentSavings",
+        "fragmentPensions",
+        "fragmentWealth",
+        "fragmentNoIncomes",
+    }
+
+
+def test_mark_changed():
+    with fragments.collect() as changed:
+        fragments.mark_changed(Income)
+        fragments.mark_changed(Expense)
+
+    assert changed == {"incomes", "expenses"}
+
+
+def test_mark_changed_outside_collect():
+    fragments.mark_changed(Income)
+
+
+@pytest.mark.django_db
+def test_write_triggers_its_fragments(client_logged):
+    data = {
+        "date": "1999-01-01",
+        "price": "111",
+        "account": AccountFactory().pk,
+        "income_type": IncomeTypeFactory().pk,
+    }
+
+    response = client_logged.post(
+        reverse("incomes:new"), data, **{"HTTP_HX-Request": "true"}
+    )
+    actual = json.loads(response["HX-Trigger"])
+
+    assert "fragmentAccounts" in actual
+    assert "fragmentBalance" in actual
+    assert "fragmentExpenses" not in actual
+    assert "fragmentSavings" not in actual
+
+
+@pytest.mark.django_db
+@time_machine.travel("1999-2-3")
+def test_worth_triggers_its_fragments(client_logged):
+    data = {
+        "form-TOTAL_FORMS": 1,
+        "form-INITIAL_FORMS": 0,
+        "form-0-date": "1999-2-3",
+        "form-0-price": "0.01",
+        "form-0-saving_type": SavingTypeFactory().pk,
+    }
+
+    response = client_logged.post(
+        reverse("bookkeeping:savings_worth_new"), data, **{"HTTP_HX-Request": "true"}
+    )
+    actual = json.loads(response["HX-Trigger"])
+
+    assert SavingWorth.objects.exists()
+    assert "afterSavingWorthNew" in actual
+    assert "fragmentSavings" in actual
+    assert "fragmentExpenses" not in actual
+    assert "fragmentBalance" not in actual
+
+
+@pytest.mark.django_db
+def test_no_trigger_without_htmx(client_logged):
+    data = {
+        "date": "1999-01-01",
+        "price": "111",
+        "account": AccountFactory().pk,
+        "income_type": IncomeTypeFactory().pk,
+    }
+
+    response = client_logged.post(reverse("incomes:new"), data)
+
+    assert not response.has_header("HX-Trigger")
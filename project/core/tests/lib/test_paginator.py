@@ -1,6 +1,12 @@
+from datetime import date
+
 import pytest
 from django.core.paginator import EmptyPage, PageNotAnInteger
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
+from ....books.models import Book
+from ....books.tests.factories import BookFactory
 from ...lib.paginator import CountlessPage, CountlessPaginator
 
 
@@ -146,3 +152,115 @@ def test_total_pages(object_list, total_records, per_page, expected):
     paginator = CountlessPaginator(object_list, total_records, per_page)
 
     assert paginator.total_pages == expected
+
+
+# -------------------------------------------------------------------------------------
+#                                                                           Keyset mode
+# -------------------------------------------------------------------------------------
+@pytest.fixture
+def books(main_user):
+    # two books a day, so the author and the id break the ties of the date
+    for i in range(7):
+        BookFactory(started=date(1999, 1, 1 + i // 2), author=f"A{i % 2}")
+
+    return Book.objects.filter(user=main_user)
+
+
+def _titles(page):
+    return [(book.started.day, book.author) for book in page]
+
+
+def _keyset(query, per_page=3):
+    return CountlessPaginator(query, query.count(), per_page, keyset=True)
+
+
+def _offset(query, per_page=3):
+    return CountlessPaginator(query, query.count(), per_page)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("number", [1, 2, 3])
+def test_keyset_page_by_number_matches_offset(books, number):
+    assert _titles(_keyset(books).page(number)) == _titles(_offset(books).page(number))
+
+
+@pytest.mark.django_db
+def test_keyset_next_cursor(books):
+    paginator = _keyset(books)
+    first = paginator.page(1)
+
+    actual = paginator.page(2, first.next_cursor)
+
+    assert _titles(actual) == _titles(_offset(books).page(2))
+    assert _titles(actual) == [(2, "A0"), (2, "A1"), (1, "A0")]
+
+
+@pytest.mark.django_db
+def test_keyset_previous_cursor(books):
+    paginator = _keyset(books)
+    last = paginator.page(3)
+
+    actual = paginator.page(2, last.previous_cursor)
+
+    assert _titles(actual) == _titles(_offset(books).page(2))
+
+
+@pytest.mark.django_db
+def test_keyset_seeks_instead_of_offset(books):
+    paginator = _keyset(books)
+    cursor = paginator.page(1).next_cursor
+
+    with CaptureQueriesContext(connection) as queries:
+        list(paginator.page(2, cursor))
+
+    assert "OFFSET" not in queries.captured_queries[-1]["sql"]
+
+
+@pytest.mark.django_db
+def test_keyset_last_page_read_from_the_end(books):
+    with CaptureQueriesContext(connection) as queries:
+        actual = _titles(_keyset(books).page(3))
+
+    assert actual == [(1, "A1")]
+    assert "OFFSET" not in queries.captured_queries[-1]["sql"]
+
+
+@pytest.mark.django_db
+def test_keyset_cursors_at_the_ends(books):
+    paginator = _keyset(books)
+
+    assert paginator.page(1).previous_cursor is None
+    assert paginator.page(3).next_cursor is None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("cursor", ["x", "x:y:z"])
+def test_keyset_bad_cursor_falls_back_to_offset(books, cursor):
+    assert _titles(_keyset(books).page(2, cursor)) == _titles(_offset(books).page(2))
+
+
+@pytest.mark.django_db
+def test_keyset_cursor_of_another_page_is_ignored(books):
+    paginator = _keyset(books)
+    cursor = paginator.page(1).next_cursor
+
+    actual = paginator.page(3, cursor)
+
+    assert _titles(actual) == _titles(_offset(books).page(3))
+
+
+@pytest.mark.django_db
+def test_keyset_values_rows_get_the_keys(books):
+    paginator = _keyset(books.values("title"))
+
+    first = paginator.page(1)
+    actual = paginator.page(2, first.next_cursor)
+
+    assert [row["cursor_id"] for row in actual] == [
+        row["id"] for row in _offset(books.values("id")).page(2)
+    ]
+
+
+@pytest.mark.django_db
+def test_keyset_page_beyond_the_last(books):
+    assert list(_keyset(books).page(9)) == []
@@ -0,0 +1,44 @@
+from unittest.mock import Mock
+
+from ...lib import request_memo
+
+
+def test_memoize_builds_once_per_scope():
+    build = Mock(return_value=1)
+
+    with request_memo.scope():
+        assert request_memo.memoize("key", build) == 1
+        assert request_memo.memoize("key", build) == 1
+
+    assert build.call_count == 1
+
+
+def test_memoize_outside_scope_builds_every_time():
+    build = Mock(return_value=1)
+
+    request_memo.memoize("key", build)
+    request_memo.memoize("key", build)
+
+    assert build.call_count == 2
+
+
+def test_nested_scope_shares_memo():
+    build = Mock(return_value=1)
+
+    with request_memo.scope():
+        request_memo.memoize("key", build)
+        with request_memo.scope():
+            request_memo.memoize("key", build)
+
+    assert build.call_count == 1
+
+
+def test_clear():
+    build = Mock(return_value=1)
+
+    with request_memo.scope():
+        request_memo.memoize("key", build)
+        request_memo.clear()
+        request_memo.memoize("key", build)
+
+    assert build.call_count == 2
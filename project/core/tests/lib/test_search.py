@@ -1,8 +1,7 @@
 from datetime import date
 
-import factory
 import pytest
-from django.db.models.signals import post_save
+from django.core.cache import cache
 
 from ....books.tests.factories import BookFactory
 from ....expenses.tests.factories import (
@@ -193,11 +192,34 @@ def test_filter_short_search_words(search_dict, expect):
     assert expect == search._filter_short_search_words(search_dict)
 
 
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ("Type 1999", "type 1999"),
+        ("type, name", "type name"),
+        ("-c Type -y 1999", "-c type -y 1999"),
+    ],
+)
+def test_search_key_same_for_alike_searches(first, second):
+    assert search.search_key(first) == search.search_key(second)
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ("type", "name"),
+        ("type 1999", "type 2000"),
+        ("type", "-c type"),
+    ],
+)
+def test_search_key_differs(first, second):
+    assert search.search_key(first) != search.search_key(second)
+
+
 # -------------------------------------------------------------------------------------
 #                                                                               Expense
 # -------------------------------------------------------------------------------------
 @pytest.mark.django_db
-@factory.django.mute_signals(post_save)
 @pytest.mark.parametrize(
     "_search, expect",
     [
@@ -238,8 +260,8 @@ def test_filter_short_search_words(search_dict, expect):
         (
             "type_a name_b",
             [
-                {"type": "Type_B", "name": "Name_B", "remark": "WWW"},
                 {"type": "Type_A", "name": "Name_B", "remark": "YYY"},
+                {"type": "Type_B", "name": "Name_B", "remark": "WWW"},
                 {"type": "Type_A", "name": "Name_A", "remark": "XXX"},
             ],
         ),
@@ -252,8 +274,8 @@ def test_filter_short_search_words(search_dict, expect):
         (
             "type_a xxx",
             [
-                {"type": "Type_A", "name": "Name_B", "remark": "YYY"},
                 {"type": "Type_A", "name": "Name_A", "remark": "XXX"},
+                {"type": "Type_A", "name": "Name_B", "remark": "YYY"},
             ],
         ),
         ("-c type_a -r xxx", [{"type": "Type_A", "name": "Name_A", "remark": "XXX"}]),
@@ -330,6 +352,7 @@ def test_expense_search(main_user, _search, expect):
 
     q = search.search_expenses(main_user, _search)
 
+    assert len(q) == len(expect)
     for i in range(len(q)):
         assert q[i]["expense_type__title"] == expect[i]["type"]
         assert q[i]["expense_name__title"] == expect[i]["name"]
@@ -337,7 +360,16 @@ def test_expense_search(main_user, _search, expect):
 
 
 @pytest.mark.django_db
-@factory.django.mute_signals(post_save)
+def test_expense_search_ranks_rows_matching_more_words(main_user):
+    ExpenseFactory(date=date(2000, 1, 1), remark="one")
+    ExpenseFactory(date=date(1999, 1, 1), remark="one two")
+
+    q = search.search_expenses(main_user, "one two")
+
+    assert [row["remark"] for row in q] == ["one two", "one"]
+
+
+@pytest.mark.django_db
 def test_expense_search_ordering(main_user):
     ExpenseFactory(date=date(1000, 1, 1))
     ExpenseFactory()
@@ -352,7 +384,6 @@ def test_expense_search_ordering(main_user):
 #                                                                                Income
 # -------------------------------------------------------------------------------------
 @pytest.mark.django_db
-@factory.django.mute_signals(post_save)
 @pytest.mark.parametrize(
     "_search, cnt, income_type",
     [
@@ -391,7 +422,6 @@ def test_incomes_search(main_user, _search, cnt, income_type):
 
 
 @pytest.mark.django_db
-@factory.django.mute_signals(post_save)
 def test_incomes_search_ordering(main_user):
     IncomeFactory(date=date(1000, 1, 1))
     IncomeFactory()
@@ -454,3 +484,81 @@ def test_books_search_ordering(main_user):
 
     assert q[0]["started"] == date(1999, 1, 1)
     assert q[1]["started"] == date(1000, 1, 1)
+
+
+@pytest.mark.django_db
+def test_books_search_ranks_rows_matching_more_words(main_user):
+    BookFactory(started=date(2000, 1, 1), author="Xxx", remark="Zzz")
+    BookFactory(started=date(1999, 1, 1), author="Xxx", remark="Yyy")
+
+    q = search.search_books(main_user, "xxx yyy")
+
+    assert [row["started"] for row in q] == [date(1999, 1, 1), date(2000, 1, 1)]
+
+
+@pytest.mark.django_db
+def test_incomes_search_ignores_case_of_any_letter(main_user):
+    IncomeFactory(income_type=IncomeTypeFactory(title="Žvaigždė"))
+
+    assert search.search_incomes(main_user, "ŽVAIGŽ").count() == 1
+
+
+# -------------------------------------------------------------------------------------
+#                                                        Category words resolved to ids
+# -------------------------------------------------------------------------------------
+@pytest.fixture
+def locmem(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_expense_category_filtered_by_ids(main_user):
+    ExpenseFactory(expense_type=ExpenseTypeFactory(title="Food"))
+
+    actual = search.search_expenses(main_user, "-c foo")
+
+    assert len(actual) == 1
+    assert "searchgram" not in str(actual.query).lower()
+
+
+@pytest.mark.django_db
+def test_expense_category_matches_type_or_name(main_user):
+    food = ExpenseTypeFactory(title="Food")
+    ExpenseFactory(expense_type=food, expense_name=ExpenseNameFactory(title="Bread"))
+    ExpenseFactory(
+        expense_type=ExpenseTypeFactory(title="Other"),
+        expense_name=ExpenseNameFactory(title="Food Stamps"),
+    )
+
+    assert len(search.search_expenses(main_user, "-c food")) == 2
+    assert len(search.search_expenses(main_user, "-c bread")) == 1
+
+
+@pytest.mark.django_db
+def test_expense_category_of_no_title(main_user):
+    ExpenseFactory()
+
+    assert len(search.search_expenses(main_user, "-c zzz")) == 0
+
+
+@pytest.mark.django_db
+def test_category_titles_follow_new_name(main_user, locmem):
+    food = ExpenseTypeFactory(title="Food")
+    ExpenseFactory(expense_type=food)
+    search.search_expenses(main_user, "-c bread")
+
+    ExpenseFactory(expense_type=food, expense_name=ExpenseNameFactory(title="Bread"))
+
+    assert len(search.search_expenses(main_user, "-c bread")) == 1
+
+
+@pytest.mark.django_db
+def test_category_titles_of_journal_only(main_user, second_user):
+    ExpenseTypeFactory(title="Food", journal=second_user.journal)
+
+    actual = search._category_titles(main_user, "expenses")
+
+    assert actual == {"expense_type": [], "expense_name": []}
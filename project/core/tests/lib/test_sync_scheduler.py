@@ -0,0 +1,144 @@
+import pytest
+from django.db import transaction
+from mock import Mock
+
+from ....incomes.tests.factories import IncomeFactory
+from ...lib import sync_scheduler
+from ...lib.signals import SyncScope
+
+# a batch flushes through on_commit, which needs real commits
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def _scope(category_id, year):
+    return SyncScope(category_ids=frozenset({category_id}), years=frozenset({year}))
+
+
+@pytest.fixture
+def on_commit(settings):
+    settings.BALANCE_SYNC_ON_COMMIT = True
+
+
+def test_runs_straight_away_when_not_deferred(settings):
+    settings.BALANCE_SYNC_ON_COMMIT = False
+    run = Mock()
+
+    with sync_scheduler.batch():
+        sync_scheduler.schedule("key", run, _scope(1, 2000))
+        sync_scheduler.schedule("key", run, _scope(1, 2000))
+
+    assert run.call_count == 2
+
+
+def test_runs_straight_away_outside_batch_and_transaction(on_commit):
+    run = Mock()
+
+    sync_scheduler.schedule("key", run, _scope(1, 2000))
+
+    run.assert_called_once_with(_scope(1, 2000))
+
+
+def test_batch_runs_each_key_once_with_merged_scope(on_commit):
+    run, other = Mock(), Mock()
+
+    with sync_scheduler.batch():
+        sync_scheduler.schedule("key", run, _scope(1, 2000))
+        sync_scheduler.schedule("key", run, _scope(2, 1999))
+        sync_scheduler.schedule("other", other, None)
+
+        run.assert_not_called()
+
+    run.assert_called_once_with(
+        SyncScope(category_ids=frozenset({1, 2}), years=frozenset({1999, 2000}))
+    )
+    other.assert_called_once_with(None)
+
+
+def test_full_rebuild_absorbs_scopes(on_commit):
+    run = Mock()
+
+    with sync_scheduler.batch():
+        sync_scheduler.schedule("key", run, _scope(1, 2000))
+        sync_scheduler.schedule("key", run, None)
+        sync_scheduler.schedule("key", run, _scope(2, 2000))
+
+    run.assert_called_once_with(None)
+
+
+def test_nested_batch_flushes_at_outermost(on_commit):
+    run = Mock()
+
+    with sync_scheduler.batch():
+        with sync_scheduler.batch():
+            sync_scheduler.schedule("key", run, _scope(1, 2000))
+
+        run.assert_not_called()
+
+    run.assert_called_once()
+
+
+def test_transaction_flushes_on_commit(on_commit):
+    run = Mock()
+
+    with transaction.atomic():
+        sync_scheduler.schedule("key", run, _scope(1, 2000))
+        sync_scheduler.schedule("key", run, _scope(1, 2001))
+
+        run.assert_not_called()
+
+    run.assert_called_once_with(
+        SyncScope(category_ids=frozenset({1}), years=frozenset({2000, 2001}))
+    )
+
+
+def test_rolled_back_savepoint_keeps_outer_marks(on_commit):
+    run = Mock()
+
+    with transaction.atomic():
+        sync_scheduler.schedule("key", run, _scope(1, 2000))
+
+        with pytest.raises(ValueError), transaction.atomic():
+            sync_scheduler.schedule("key", run, _scope(2, 2000))
+            raise ValueError
+
+    run.assert_called_once_with(_scope(1, 2000))
+
+
+def test_rolled_back_transaction_drops_its_marks(on_commit):
+    run, other = Mock(), Mock()
+
+    with pytest.raises(ValueError), transaction.atomic():
+        sync_scheduler.schedule("key", run, _scope(1, 2000))
+        raise ValueError
+
+    with transaction.atomic():
+        sync_scheduler.schedule("other", other, None)
+
+    run.assert_not_called()
+    other.assert_called_once_with(None)
+
+
+def test_transaction_in_batch_flushes_with_batch(on_commit):
+    run = Mock()
+
+    with sync_scheduler.batch():
+        sync_scheduler.schedule("key", run, _scope(1, 2000))
+
+        with transaction.atomic():
+            sync_scheduler.schedule("key", run, _scope(1, 2001))
+
+        run.assert_not_called()
+
+    run.assert_called_once_with(
+        SyncScope(category_ids=frozenset({1}), years=frozenset({2000, 2001}))
+    )
+
+
+def test_saves_in_one_transaction_sync_ledger_once(on_commit, mocker):
+    sync = mocker.patch("project.core.services.signals_service.sync_ledger")
+
+    with transaction.atomic():
+        IncomeFactory()
+        IncomeFactory()
+
+    sync.assert_called_once()
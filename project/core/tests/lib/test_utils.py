@@ -1,7 +1,9 @@
+import threading
 from types import SimpleNamespace
 
 from django.test import override_settings
 from django.urls import Resolver404
+from django.utils import translation
 
 from ...lib import utils
 
@@ -125,3 +127,38 @@ def test_add_fast_urls_custom_pk_key(mocker):
 
     assert actual[0]["url_update"] == "/app/update/42/"
     assert actual[0]["url_delete"] == "/app/delete/42/"
+
+
+def test_render_panels_one_after_another(rf, settings):
+    settings.PANEL_WORKERS = 1
+    request = rf.get("/")
+
+    actual = utils.render_panels(
+        request, {"a": threading.get_ident, "b": threading.get_ident}
+    )
+
+    assert actual["a"] == actual["b"] == threading.get_ident()
+    assert set(request.panel_timings) == {"a", "b"}
+
+
+def test_render_panels_on_threads(rf, settings):
+    settings.PANEL_WORKERS = 2
+    request = rf.get("/")
+    barrier = threading.Barrier(2, timeout=5)
+
+    def _panel():
+        # both panels have to run at once to get past the barrier
+        barrier.wait()
+        return translation.get_language()
+
+    with translation.override("lt"):
+        actual = utils.render_panels(request, {"a": _panel, "b": _panel})
+
+    assert actual == {"a": "lt", "b": "lt"}
+    assert set(request.panel_timings) == {"a", "b"}
+
+
+def test_server_timing():
+    actual = utils.server_timing({"a": 0.0123, "b": 1})
+
+    assert actual == "a;dur=12.3, b;dur=1000.0"
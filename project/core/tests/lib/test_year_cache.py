@@ -0,0 +1,115 @@
+from datetime import date
+
+import pytest
+from django.core.cache import cache
+
+from ....incomes.models import Income
+from ....incomes.services.model_services import IncomeModelService
+from ....incomes.tests.factories import IncomeFactory, IncomeTypeFactory
+from ...lib import year_cache
+
+pytestmark = pytest.mark.django_db
+
+THIS_YEAR = date.today().year
+
+
+@pytest.fixture
+def locmem(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+
+
+def _rows(user, cumulative=False):
+    qs = IncomeModelService(user).sum_by_year()
+    rows = year_cache.rows_by_year(user, "incomes", qs, cumulative=cumulative)
+    return {row["year"]: row["sum"] for row in rows}
+
+
+def _silent_update(year, price):
+    # a write no signal sees, so only what the cache keeps stays stale
+    Income.objects.filter(date__year=year).update(price=price)
+
+
+@pytest.fixture
+def incomes(main_user):
+    IncomeFactory(date=date(1998, 1, 1), price=1)
+    IncomeFactory(date=date(1999, 1, 1), price=2)
+    IncomeFactory(date=date(THIS_YEAR, 1, 1), price=3)
+    main_user.journal.refresh_from_db()
+
+
+def test_dummy_cache_aggregates_live(main_user, incomes):
+    _rows(main_user)
+    _silent_update(1999, 5)
+
+    assert _rows(main_user) == {1998: 1, 1999: 5, THIS_YEAR: 3}
+
+
+def test_finished_years_are_cached(main_user, incomes, locmem):
+    assert _rows(main_user) == {1998: 1, 1999: 2, THIS_YEAR: 3}
+
+    _silent_update(1999, 5)
+    _silent_update(THIS_YEAR, 6)
+
+    assert _rows(main_user) == {1998: 1, 1999: 2, THIS_YEAR: 6}
+
+
+def test_write_bumps_only_its_year(main_user, incomes, locmem):
+    _rows(main_user)
+
+    _silent_update(1998, 5)
+    IncomeFactory(date=date(1999, 6, 1), price=10)
+
+    assert _rows(main_user) == {1998: 1, 1999: 12, THIS_YEAR: 3}
+
+
+def test_update_bumps_year_the_row_left(main_user, incomes, locmem):
+    _rows(main_user)
+
+    obj = Income.objects.get(date__year=1998)
+    obj.date = date(THIS_YEAR, 2, 1)
+    obj.save()
+
+    assert _rows(main_user) == {1999: 2, THIS_YEAR: 4}
+
+
+def test_cumulative_rows_follow_earlier_years(main_user, incomes, locmem):
+    _rows(main_user, cumulative=True)
+
+    _silent_update(1999, 5)
+    IncomeFactory(date=date(1998, 6, 1), price=10)
+
+    assert _rows(main_user, cumulative=True) == {1998: 11, 1999: 5, THIS_YEAR: 3}
+
+
+def test_row_before_first_record_bumps_every_year(main_user, incomes, locmem):
+    _rows(main_user)
+
+    _silent_update(1999, 5)
+    obj = Income.objects.get(date__year=1998)
+    obj.date = date(1990, 1, 1)
+    obj.save()
+
+    assert _rows(main_user) == {1990: 1, 1999: 5, THIS_YEAR: 3}
+
+
+def test_category_write_bumps_every_year(main_user, incomes, locmem):
+    _rows(main_user)
+
+    _silent_update(1999, 5)
+    IncomeTypeFactory(title="Other")
+
+    assert _rows(main_user) == {1998: 1, 1999: 5, THIS_YEAR: 3}
+
+
+def test_rows_by_date(main_user, incomes, locmem):
+    qs = IncomeModelService(main_user).sum_by_year_and_type()
+
+    expect = list(qs)
+    year_cache.rows_by_year(main_user, "types", qs, lookup="date__year")
+
+    assert year_cache.rows_by_year(main_user, "types", qs, lookup="date__year") == (
+        expect
+    )
@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+
+from ....drinks.tests.factories import DrinkFactory
+from ....incomes.tests.factories import IncomeFactory
+from ....plans.tests.factories import IncomePlanFactory
+from ...models import BalanceJob
+
+pytestmark = pytest.mark.django_db
+
+ACCOUNTS = "project.bookkeeping.views.services.accounts.load_service"
+
+
+@pytest.fixture
+def locmem(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+
+
+def _get(client, url, etag=None):
+    headers = {"If-None-Match": etag} if etag else {}
+    return client.get(url, headers=headers)
+
+
+def test_no_etag_without_cache(client_logged):
+    response = _get(client_logged, reverse("bookkeeping:accounts"))
+
+    assert response.status_code == 200
+    assert not response.has_header("ETag")
+
+
+def test_not_modified(client_logged, locmem, mocker):
+    url = reverse("bookkeeping:accounts")
+    etag = _get(client_logged, url)["ETag"]
+    load_service = mocker.patch(ACCOUNTS)
+
+    response = _get(client_logged, url, etag)
+
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+    load_service.assert_not_called()
+
+
+def test_modified_after_journal_write(client_logged, locmem):
+    url = reverse("bookkeeping:accounts")
+    etag = _get(client_logged, url)["ETag"]
+
+    IncomeFactory()
+    response = _get(client_logged, url, etag)
+
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+def test_modified_after_plan_write(client_logged, locmem):
+    url = reverse("bookkeeping:forecast")
+    etag = _get(client_logged, url)["ETag"]
+
+    IncomePlanFactory()
+
+    assert _get(client_logged, url, etag).status_code == 200
+
+
+def test_modified_after_year_change(client_logged, locmem, main_user):
+    url = reverse("bookkeeping:accounts")
+    etag = _get(client_logged, url)["ETag"]
+
+    main_user.year = 2000
+    main_user.save()
+
+    assert _get(client_logged, url, etag).status_code == 200
+
+
+def test_drinks_tab_modified_after_drink_write(client_logged, locmem):
+    url = reverse("drinks:tab_index")
+    etag = _get(client_logged, url)["ETag"]
+
+    assert _get(client_logged, url, etag).status_code == 304
+
+    DrinkFactory()
+
+    assert _get(client_logged, url, etag).status_code == 200
+
+
+def test_modified_after_job_finished_without_write(
+    client_logged, main_user, locmem, settings
+):
+    settings.BALANCE_SYNC_IN_WORKER = True
+    job = BalanceJob.objects.create(journal=main_user.journal, kind="accounts")
+    url = reverse("bookkeeping:accounts")
+    etag = _get(client_logged, url)["ETag"]
+
+    # the hourglass polls on; the job ends with nothing to write
+    job.delete()
+    response = _get(client_logged, url, etag)
+
+    assert response.status_code == 200
+    assert not response.context["recalculating"]
+
+
+def test_modified_when_job_stalls(client_logged, main_user, locmem, settings):
+    settings.BALANCE_SYNC_IN_WORKER = True
+    BalanceJob.objects.create(journal=main_user.journal, kind="accounts")
+    url = reverse("bookkeeping:accounts")
+    etag = _get(client_logged, url)["ETag"]
+
+    # no worker took the job
+    BalanceJob.objects.update(created=timezone.now() - timedelta(hours=1))
+    response = _get(client_logged, url, etag)
+
+    assert response.status_code == 200
+    assert response.context["stalled"]
@@ -338,6 +338,66 @@ def test_post_saves_valid_prices_and_triggers_signals(mocker):
     )
 
 
+def test_post_triggers_signal_for_every_created_object(mocker):
+    view = TestView()
+    view.request = mocker.Mock()
+
+    forms = [
+        mocker.Mock(cleaned_data={"price": 100, "account": "A1"}),
+        mocker.Mock(cleaned_data={"price": 200, "account": "A2"}),
+    ]
+    mock_formset = mocker.Mock()
+    mock_formset.is_valid.return_value = True
+    mock_formset.__iter__ = mocker.Mock(return_value=iter(forms))
+
+    mocker.patch.object(TestView, "get_formset", return_value=mock_formset)
+    mocker.patch(
+        "project.core.mixins.formset.http_htmx_response", return_value="hx_success"
+    )
+    dummy_service = DummyService("user")
+    mock_bulk_create = mocker.patch.object(dummy_service.objects, "bulk_create")
+    view.service_class = mocker.Mock(return_value=dummy_service)
+
+    mock_signal = mocker.Mock()
+    mocker.patch("project.core.mixins.formset.SIGNALS", {DummyModel: mock_signal})
+
+    view.post(mocker.Mock())
+
+    created = mock_bulk_create.call_args[0][0]
+    assert mock_signal.call_args_list == [
+        mocker.call(sender=DummyModel, instance=created[0]),
+        mocker.call(sender=DummyModel, instance=created[1]),
+    ]
+
+
+def test_post_marks_year_data_of_worth_rows(mocker):
+    view = TestView()
+    view.request = mocker.Mock()
+
+    mock_formset = mocker.Mock()
+    mock_formset.is_valid.return_value = True
+    mock_formset.__iter__ = mocker.Mock(
+        return_value=iter([mocker.Mock(cleaned_data={"price": 100, "account": "A1"})])
+    )
+
+    mocker.patch.object(TestView, "get_formset", return_value=mock_formset)
+    mocker.patch(
+        "project.core.mixins.formset.http_htmx_response", return_value="hx_success"
+    )
+    dummy_service = DummyService("user")
+    mock_bulk_create = mocker.patch.object(dummy_service.objects, "bulk_create")
+    view.service_class = mocker.Mock(return_value=dummy_service)
+
+    mocker.patch("project.core.mixins.formset.SIGNALS", {})
+    mocker.patch("project.core.mixins.formset.YEAR_DATA", {DummyModel})
+    mock_mark = mocker.patch("project.core.mixins.formset.year_cache.mark_written")
+
+    view.post(mocker.Mock())
+
+    created = mock_bulk_create.call_args[0][0]
+    mock_mark.assert_called_once_with(created[0])
+
+
 # ==========================================
 # 6. CONTEXT DATA TESTS
 # ==========================================
@@ -0,0 +1,190 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from ....accounts.models import AccountBalance
+from ....incomes.tests.factories import IncomeFactory
+from ...lib.signals import SyncScope
+from ...models import BalanceJob
+from ...services import balance_jobs, signals_service
+
+pytestmark = pytest.mark.django_db
+
+
+def _scope(category_id, year):
+    return SyncScope(category_ids=frozenset({category_id}), years=frozenset({year}))
+
+
+def test_sync_scope_json_round_trip():
+    scope = SyncScope(
+        category_ids=frozenset({2, 1}),
+        years=frozenset({1999}),
+        vacated_years=frozenset({1998}),
+    )
+
+    assert scope.to_json() == {
+        "category_ids": [1, 2],
+        "years": [1999],
+        "vacated_years": [1998],
+    }
+    assert SyncScope.from_json(scope.to_json()) == scope
+
+
+def test_enqueue_creates_job(main_user):
+    balance_jobs.enqueue(main_user.journal_id, "accounts", _scope(1, 1999))
+
+    job = BalanceJob.objects.get()
+
+    assert job.journal == main_user.journal
+    assert job.kind == "accounts"
+    assert SyncScope.from_json(job.scope) == _scope(1, 1999)
+    assert job.version == 1
+
+
+def test_enqueue_merges_into_queued_job(main_user):
+    balance_jobs.enqueue(main_user.journal_id, "accounts", _scope(1, 1999))
+    balance_jobs.enqueue(main_user.journal_id, "accounts", _scope(2, 2000))
+    balance_jobs.enqueue(main_user.journal_id, "savings", _scope(3, 2000))
+
+    job = BalanceJob.objects.get(kind="accounts")
+
+    assert BalanceJob.objects.count() == 2
+    assert job.scope == {
+        "category_ids": [1, 2],
+        "years": [1999, 2000],
+        "vacated_years": [],
+    }
+    assert job.version == 2
+
+
+def test_enqueue_full_rebuild_absorbs_scope(main_user):
+    balance_jobs.enqueue(main_user.journal_id, "accounts", None)
+    balance_jobs.enqueue(main_user.journal_id, "accounts", _scope(1, 1999))
+
+    assert BalanceJob.objects.get().scope is None
+
+
+def test_claim_hands_job_out_once(main_user):
+    balance_jobs.enqueue(main_user.journal_id, "accounts", None)
+
+    assert len(balance_jobs.claim(5)) == 1
+    assert balance_jobs.claim(5) == []
+
+
+def test_claim_takes_over_stale_job(main_user):
+    balance_jobs.enqueue(main_user.journal_id, "accounts", None)
+    BalanceJob.objects.update(started=timezone.now() - timedelta(hours=1))
+
+    assert len(balance_jobs.claim(5)) == 1
+
+
+def test_finish_drops_job(main_user):
+    balance_jobs.enqueue(main_user.journal_id, "accounts", None)
+    job = balance_jobs.claim(1)[0]
+
+    balance_jobs.finish(job)
+
+    assert not BalanceJob.objects.exists()
+
+
+def test_finish_releases_job_queued_again_meanwhile(main_user):
+    balance_jobs.enqueue(main_user.journal_id, "accounts", _scope(1, 1999))
+    job = balance_jobs.claim(1)[0]
+    balance_jobs.enqueue(main_user.journal_id, "accounts", _scope(1, 1999))
+
+    balance_jobs.finish(job)
+
+    job = BalanceJob.objects.get()
+    assert job.started is None
+    assert job.version == 2
+
+
+def test_is_recalculating(main_user, settings):
+    settings.BALANCE_SYNC_IN_WORKER = True
+    balance_jobs.enqueue(main_user.journal_id, "accounts", None)
+
+    assert balance_jobs.is_recalculating(main_user, "accounts")
+    assert not balance_jobs.is_recalculating(main_user, "savings")
+
+
+def test_is_recalculating_without_worker(
+    main_user, settings, django_assert_num_queries
+):
+    settings.BALANCE_SYNC_IN_WORKER = False
+
+    with django_assert_num_queries(0):
+        assert not balance_jobs.is_recalculating(main_user, "accounts")
+
+
+def test_recalculating(main_user, settings):
+    settings.BALANCE_SYNC_IN_WORKER = True
+    balance_jobs.enqueue(main_user.journal_id, "savings", None)
+    balance_jobs.enqueue(main_user.journal_id, "accounts", None)
+
+    assert balance_jobs.recalculating(main_user) == ["accounts", "savings"]
+
+
+def test_recalculating_without_worker(main_user, settings, django_assert_num_queries):
+    settings.BALANCE_SYNC_IN_WORKER = False
+
+    with django_assert_num_queries(0):
+        assert balance_jobs.recalculating(main_user) == []
+
+
+def test_stalled(main_user, settings):
+    settings.BALANCE_SYNC_IN_WORKER = True
+    balance_jobs.enqueue(main_user.journal_id, "accounts", None)
+    balance_jobs.enqueue(main_user.journal_id, "savings", None)
+    balance_jobs.enqueue(main_user.journal_id, "pensions", None)
+    BalanceJob.objects.update(created=timezone.now() - timedelta(hours=1))
+    # a worker is on the savings
+    BalanceJob.objects.filter(kind="savings").update(started=timezone.now())
+
+    assert balance_jobs.stalled(main_user) == ["accounts", "pensions"]
+    assert balance_jobs.is_stalled(main_user, "accounts")
+    assert not balance_jobs.is_stalled(main_user, "savings")
+
+
+def test_stalled_not_before_timeout(main_user, settings):
+    settings.BALANCE_SYNC_IN_WORKER = True
+    balance_jobs.enqueue(main_user.journal_id, "accounts", None)
+
+    assert balance_jobs.stalled(main_user) == []
+
+
+def test_stalled_without_worker(main_user, settings, django_assert_num_queries):
+    settings.BALANCE_SYNC_IN_WORKER = False
+
+    with django_assert_num_queries(0):
+        assert balance_jobs.stalled(main_user) == []
+
+
+def test_signal_queues_job_in_worker_mode(settings):
+    settings.BALANCE_SYNC_IN_WORKER = True
+
+    IncomeFactory()
+
+    assert BalanceJob.objects.filter(kind="accounts").exists()
+    assert not AccountBalance.objects.exists()
+
+
+def test_run_job_syncs_ledger(settings):
+    settings.BALANCE_SYNC_IN_WORKER = True
+    IncomeFactory()
+
+    signals_service.run_job(BalanceJob.objects.get(kind="accounts"))
+
+    assert AccountBalance.objects.exists()
+    assert not BalanceJob.objects.exists()
+
+
+def test_balance_worker_drains_queue(settings):
+    settings.BALANCE_SYNC_IN_WORKER = True
+    IncomeFactory()
+
+    call_command("balance_worker", workers=1, once=True)
+
+    assert AccountBalance.objects.exists()
+    assert not BalanceJob.objects.exists()
@@ -0,0 +1,132 @@
+from datetime import date
+
+import pytest
+
+from ....expenses.tests.factories import ExpenseFactory, ExpenseTypeFactory
+from ....incomes.tests.factories import IncomeFactory
+from ....savings.tests.factories import SavingFactory
+from ...models import MonthlyRollup
+from ...services import monthly_rollup
+
+pytestmark = pytest.mark.django_db
+
+
+def _rollups():
+    return list(
+        MonthlyRollup.objects.order_by("kind", "year", "month").values(
+            "kind", "year", "month", "sum", "count"
+        )
+    )
+
+
+def test_new_rows_are_added(main_user):
+    IncomeFactory(date=date(1999, 1, 1), price=1)
+    IncomeFactory(date=date(1999, 1, 31), price=2)
+    SavingFactory(date=date(1999, 2, 1), price=3)
+
+    assert _rollups() == [
+        {"kind": "incomes", "year": 1999, "month": 1, "sum": 3, "count": 2},
+        {"kind": "savings", "year": 1999, "month": 2, "sum": 3, "count": 1},
+    ]
+
+
+def test_rollup_belongs_to_journal_and_category(main_user):
+    obj = ExpenseFactory()
+
+    rollup = MonthlyRollup.objects.get()
+
+    assert rollup.journal_id == main_user.journal_id
+    assert rollup.category_id == obj.expense_type_id
+
+
+def test_update_changes_sum(main_user):
+    obj = IncomeFactory(date=date(1999, 1, 1), price=1)
+
+    obj.price = 5
+    obj.save()
+
+    assert _rollups() == [
+        {"kind": "incomes", "year": 1999, "month": 1, "sum": 5, "count": 1},
+    ]
+
+
+def test_update_moves_row_to_other_month(main_user):
+    obj = IncomeFactory(date=date(1999, 1, 1), price=1)
+    IncomeFactory(date=date(1999, 1, 1), price=2)
+
+    obj.date = date(2000, 3, 1)
+    obj.save()
+
+    assert _rollups() == [
+        {"kind": "incomes", "year": 1999, "month": 1, "sum": 2, "count": 1},
+        {"kind": "incomes", "year": 2000, "month": 3, "sum": 1, "count": 1},
+    ]
+
+
+def test_update_moves_row_to_other_category(main_user):
+    obj = ExpenseFactory(price=1)
+    other = ExpenseTypeFactory(title="Other")
+
+    obj.expense_type = other
+    obj.save()
+
+    rollup = MonthlyRollup.objects.get()
+    assert rollup.category_id == other.pk
+    assert rollup.sum == 1
+
+
+def test_delete_drops_empty_month(main_user):
+    obj = IncomeFactory(date=date(1999, 1, 1), price=1)
+    IncomeFactory(date=date(1999, 2, 1), price=2)
+
+    obj.delete()
+
+    assert _rollups() == [
+        {"kind": "incomes", "year": 1999, "month": 2, "sum": 2, "count": 1},
+    ]
+
+
+def test_missing_month_is_recounted(main_user):
+    obj = IncomeFactory(date=date(1999, 1, 1), price=1)
+    IncomeFactory(date=date(1999, 1, 2), price=2)
+    IncomeFactory(date=date(1999, 1, 3), price=4)
+    MonthlyRollup.objects.all().delete()
+
+    obj.delete()
+
+    assert _rollups() == [
+        {"kind": "incomes", "year": 1999, "month": 1, "sum": 6, "count": 2},
+    ]
+
+
+def test_new_row_recounts_missing_month(main_user):
+    IncomeFactory(date=date(1999, 1, 1), price=1)
+    MonthlyRollup.objects.all().delete()
+
+    IncomeFactory(date=date(1999, 1, 2), price=2)
+
+    assert _rollups() == [
+        {"kind": "incomes", "year": 1999, "month": 1, "sum": 3, "count": 2},
+    ]
+
+
+def test_rebuild_matches_signals(main_user, second_user):
+    IncomeFactory(date=date(1999, 1, 1), price=1)
+    ExpenseFactory(date=date(1999, 1, 1), price=2)
+    obj = SavingFactory(date=date(1999, 1, 1), price=3)
+    obj.price = 4
+    obj.save()
+    expect = _rollups()
+
+    monthly_rollup.rebuild()
+
+    assert _rollups() == expect
+
+
+def test_rebuild_one_journal(main_user, second_user):
+    IncomeFactory()
+    MonthlyRollup.objects.all().delete()
+
+    monthly_rollup.rebuild([second_user.journal_id])
+
+    assert not MonthlyRollup.objects.exists()
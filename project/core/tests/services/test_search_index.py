@@ -0,0 +1,131 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ....books.tests.factories import BookFactory
+from ....expenses.tests.factories import ExpenseFactory, ExpenseNameFactory
+from ....incomes.tests.factories import IncomeFactory
+from ...models import SearchDocument, SearchGram
+from ...services import search_index
+
+pytestmark = pytest.mark.django_db
+
+Kind = SearchDocument.Kind
+Field = SearchGram.Field
+
+
+def _find(user, kind, field, word):
+    return set(
+        search_index.find(user.journal_id, kind, field, word).values_list(
+            "object_id", flat=True
+        )
+    )
+
+
+def test_trigrams():
+    assert search_index.trigrams("abcd") == {"abc", "bcd"}
+    assert search_index.trigrams("ab") == set()
+
+
+def test_saved_row_is_indexed(main_user):
+    obj = ExpenseFactory(remark="Some Remark")
+
+    document = SearchDocument.objects.get()
+
+    assert document.journal_id == main_user.journal_id
+    assert document.kind == Kind.EXPENSES
+    assert document.object_id == obj.pk
+    assert document.category == ""
+    assert document.remark == "some remark"
+    assert not SearchGram.objects.filter(field=Field.CATEGORY).exists()
+
+
+def test_find_infix(main_user):
+    obj = ExpenseFactory(remark="Some Remark")
+
+    assert _find(main_user, Kind.EXPENSES, Field.REMARK, "EMAR") == {obj.pk}
+
+
+def test_find_book_by_author(main_user):
+    obj = BookFactory(author="Some Author")
+
+    assert _find(main_user, Kind.BOOKS, Field.CATEGORY, "me au") == {obj.pk}
+
+
+def test_find_needs_the_whole_word(main_user):
+    # all trigrams of "abcab" are in "abcxbca", the word is not
+    ExpenseFactory(remark="abcxbca")
+
+    assert _find(main_user, Kind.EXPENSES, Field.REMARK, "abcab") == set()
+
+
+def test_find_within_journal_and_kind(main_user, second_user):
+    IncomeFactory(remark="remark")
+    BookFactory(remark="remark")
+
+    assert _find(second_user, Kind.INCOMES, Field.REMARK, "remark") == set()
+    assert len(_find(main_user, Kind.BOOKS, Field.REMARK, "remark")) == 1
+
+
+def test_update_reindexes_row(main_user):
+    obj = IncomeFactory(remark="old")
+
+    obj.remark = "new"
+    obj.save()
+
+    assert _find(main_user, Kind.INCOMES, Field.REMARK, "old") == set()
+    assert _find(main_user, Kind.INCOMES, Field.REMARK, "new") == {obj.pk}
+    assert SearchDocument.objects.count() == 1
+
+
+def test_delete_drops_document(main_user):
+    obj = BookFactory()
+
+    obj.delete()
+
+    assert not SearchDocument.objects.exists()
+    assert not SearchGram.objects.exists()
+
+
+def test_category_rename_writes_no_index(main_user):
+    name = ExpenseNameFactory()
+    ExpenseFactory(expense_name=name)
+
+    name.title = "Renamed"
+    with CaptureQueriesContext(connection) as queries:
+        name.save()
+
+    assert not [q for q in queries if "core_search" in q["sql"]]
+
+
+def test_index_without_ids_from_bulk_insert(main_user, mocker):
+    # MySQL returns no rows from a bulk insert
+    mocker.patch.object(
+        type(connection.features), "can_return_rows_from_bulk_insert", False
+    )
+
+    obj = ExpenseFactory(remark="remark")
+    ExpenseFactory(remark="other")
+    search_index.rebuild()
+
+    assert not SearchGram.objects.filter(document__isnull=True).exists()
+    assert _find(main_user, Kind.EXPENSES, Field.REMARK, "remark") == {obj.pk}
+
+
+def test_rebuild(main_user, second_user):
+    ExpenseFactory()
+    IncomeFactory()
+    BookFactory()
+    expect = set(SearchGram.objects.values_list("kind", "field", "gram"))
+    SearchDocument.objects.all().delete()
+
+    assert search_index.rebuild() == 3
+    assert set(SearchGram.objects.values_list("kind", "field", "gram")) == expect
+
+
+def test_rebuild_one_journal(main_user, second_user):
+    IncomeFactory()
+    SearchDocument.objects.all().delete()
+
+    assert search_index.rebuild([second_user.journal_id]) == 0
+    assert not SearchDocument.objects.exists()
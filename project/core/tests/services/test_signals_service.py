@@ -1,10 +1,33 @@
+from datetime import date, datetime, timezone
+
 import pytest
+import time_machine
+from django.core.cache import cache
 from mock import Mock
 
+from ....accounts.models import AccountBalance
+from ....accounts.tests.factories import AccountFactory
+from ....bookkeeping.tests.factories import AccountWorthFactory, SavingWorthFactory
+from ....expenses.tests.factories import ExpenseFactory
+from ....incomes.models import Income
 from ....incomes.tests.factories import IncomeFactory
+from ....savings.models import SavingBalance
+from ....savings.tests.factories import SavingFactory, SavingTypeFactory
+from ....transactions.tests.factories import (
+    SavingChangeFactory,
+    SavingCloseFactory,
+    TransactionFactory,
+)
+from ...lib import context_cache, year_cache
+from ...lib.db_sync import ACCOUNT_FIELDS, SAVING_FIELDS
+from ...lib.signals import GetData, SyncScope
+from ...models import BalanceLedger
 from ...services.signals_service import (
+    ACCOUNTS_CONF,
     _get_user_from_instance,
+    remember_previous_state,
     sync_accounts,
+    sync_ledger,
     sync_pensions,
     sync_savings,
 )
@@ -92,3 +115,355 @@ def test__get_user_from_instance_returns_user_successfully(main_user):
     result = _get_user_from_instance(instance)
 
     assert result == main_user
+
+
+def _balances(model, fk_field, fields):
+    return list(
+        model.objects.order_by(fk_field, "year").values(fk_field, "year", *fields)
+    )
+
+
+@pytest.mark.django_db
+def test_incremental_accounts_sync_matches_full_rebuild(main_user):
+    a1 = AccountFactory(title="A1")
+    a2 = AccountFactory(title="A2")
+
+    IncomeFactory(date=date(1999, 1, 1), account=a1, price=100)
+    IncomeFactory(date=date(2001, 1, 1), account=a2, price=50)
+    ExpenseFactory(date=date(2003, 1, 1), account=a1, price=10)
+    AccountWorthFactory(date=datetime(2000, 1, 1, tzinfo=timezone.utc), account=a1)
+
+    obj = ExpenseFactory(date=date(2000, 5, 5), account=a1, price=7)
+    obj.account = a2
+    obj.date = date(2002, 5, 5)
+    obj.save()
+    TransactionFactory(date=date(2001, 2, 2), from_account=a2, to_account=a1)
+    IncomeFactory(date=date(2000, 1, 1), account=a2, price=33).delete()
+
+    incremental = _balances(AccountBalance, "account_id", ACCOUNT_FIELDS)
+
+    sync_accounts(instance=None, user=main_user)
+
+    assert incremental == _balances(AccountBalance, "account_id", ACCOUNT_FIELDS)
+
+
+@pytest.mark.django_db
+def test_incremental_savings_sync_matches_full_rebuild(main_user):
+    s1 = SavingTypeFactory(title="S1")
+    s2 = SavingTypeFactory(title="S2")
+
+    SavingFactory(date=date(1999, 1, 1), saving_type=s1, price=100, fee=3)
+    SavingFactory(date=date(2002, 1, 1), saving_type=s2, price=40, fee=1)
+    SavingWorthFactory(date=datetime(2000, 1, 1, tzinfo=timezone.utc), saving_type=s1)
+
+    SavingCloseFactory(date=date(2001, 1, 1), from_account=s1, price=20, fee=2)
+    SavingChangeFactory(
+        date=date(2000, 1, 1), from_account=s1, to_account=s2, price=10, fee=1
+    )
+    obj = SavingFactory(date=date(2000, 6, 6), saving_type=s2, price=5, fee=0)
+    obj.price = 15
+    obj.save()
+
+    incremental = _balances(SavingBalance, "saving_type_id", SAVING_FIELDS)
+
+    sync_savings(instance=None, user=main_user)
+
+    assert incremental == _balances(SavingBalance, "saving_type_id", SAVING_FIELDS)
+
+
+@pytest.mark.django_db
+def test_incremental_sync_leaves_rows_outside_the_slice(main_user):
+    a1 = AccountFactory(title="A1")
+    a2 = AccountFactory(title="A2")
+
+    IncomeFactory(date=date(1999, 1, 1), account=a1)
+    IncomeFactory(date=date(1999, 1, 1), account=a2)
+    IncomeFactory(date=date(2001, 1, 1), account=a1)
+
+    # rows the write cannot change are not recomputed
+    AccountBalance.objects.update(delta=666)
+
+    ExpenseFactory(date=date(2000, 1, 1), account=a1)
+
+    assert set(
+        AccountBalance.objects.filter(delta=666).values_list("account_id", "year")
+    ) == {(a1.pk, 1999), (a2.pk, 1999), (a2.pk, 2000), (a2.pk, 2001), (a2.pk, 2002)}
+
+
+@pytest.mark.django_db
+def test_incremental_sync_rebuilds_all_when_write_widens_years(main_user):
+    a1 = AccountFactory(title="A1")
+    a2 = AccountFactory(title="A2")
+
+    IncomeFactory(date=date(1999, 1, 1), account=a1)
+    IncomeFactory(date=date(1999, 1, 1), account=a2)
+
+    IncomeFactory(date=date(2001, 1, 1), account=a1)
+
+    # the other account is padded to the new last year too
+    assert list(
+        AccountBalance.objects.filter(account=a2).values_list("year", flat=True)
+    ) == [1999, 2000, 2001, 2002]
+
+
+@pytest.mark.django_db
+def test_incremental_sync_rebuilds_all_when_newest_data_year_is_vacated(main_user):
+    a1 = AccountFactory(title="A1")
+    a2 = AccountFactory(title="A2")
+
+    IncomeFactory(date=date(1999, 1, 1), account=a1)
+    IncomeFactory(date=date(1999, 1, 1), account=a2)
+    obj = IncomeFactory(date=date(2001, 1, 1), account=a1)
+
+    obj.delete()
+
+    assert list(
+        AccountBalance.objects.filter(account=a2).values_list("year", flat=True)
+    ) == [1999, 2000]
+
+
+def _closed_year():
+    return BalanceLedger.objects.values_list("closed_year", flat=True).get()
+
+
+@pytest.mark.django_db
+def test_rebuild_closes_years(main_user):
+    IncomeFactory(date=date(1999, 1, 1))
+    IncomeFactory(date=date(2001, 1, 1))
+
+    assert _closed_year() == 2001
+
+
+@pytest.mark.django_db
+@time_machine.travel("2000-06-01")
+def test_rebuild_closes_finished_years_only(main_user):
+    IncomeFactory(date=date(1999, 1, 1))
+    IncomeFactory(date=date(2000, 1, 1))
+
+    assert _closed_year() == 1999
+
+
+@pytest.mark.django_db
+def test_widening_write_rolls_forward_from_closed_year(main_user):
+    a1 = AccountFactory(title="A1")
+    a2 = AccountFactory(title="A2")
+
+    IncomeFactory(date=date(1999, 1, 1), account=a1, price=10)
+    IncomeFactory(date=date(2000, 1, 1), account=a2, price=20)
+    ExpenseFactory(date=date(2001, 1, 1), account=a1, price=5)
+
+    # the snapshots are not recomputed
+    AccountBalance.objects.filter(year__lt=2001).update(delta=666)
+
+    IncomeFactory(date=date(2003, 1, 1), account=a2, price=7)
+
+    assert _closed_year() == 2003
+    assert set(
+        AccountBalance.objects.filter(delta=666).values_list("account_id", "year")
+    ) == {(a1.pk, 1999), (a1.pk, 2000), (a2.pk, 2000)}
+    assert list(
+        AccountBalance.objects.filter(account=a1).values_list("year", "balance")
+    ) == [(1999, 10), (2000, 10), (2001, 5), (2002, 5), (2003, 5), (2004, 5)]
+
+
+@pytest.mark.django_db
+def test_rolled_forward_accounts_match_full_rebuild(main_user):
+    a1 = AccountFactory(title="A1")
+    a2 = AccountFactory(title="A2")
+
+    IncomeFactory(date=date(1999, 1, 1), account=a1, price=100)
+    AccountWorthFactory(date=datetime(2000, 1, 1, tzinfo=timezone.utc), account=a1)
+    IncomeFactory(date=date(2001, 1, 1), account=a1, price=50)
+    IncomeFactory(date=date(2003, 1, 1), account=a2, price=50)
+    ExpenseFactory(date=date(2004, 1, 1), account=a1, price=10)
+
+    rolled_forward = _balances(AccountBalance, "account_id", ACCOUNT_FIELDS)
+
+    sync_accounts(instance=None, user=main_user)
+
+    assert rolled_forward == _balances(AccountBalance, "account_id", ACCOUNT_FIELDS)
+
+
+@pytest.mark.django_db
+def test_rolled_forward_savings_match_full_rebuild(main_user):
+    s1 = SavingTypeFactory(title="S1")
+    s2 = SavingTypeFactory(title="S2")
+
+    SavingFactory(date=date(1999, 1, 1), saving_type=s1, price=100, fee=3)
+    SavingWorthFactory(date=datetime(2000, 1, 1, tzinfo=timezone.utc), saving_type=s1)
+    SavingFactory(date=date(2001, 1, 1), saving_type=s2, price=40, fee=1)
+    SavingCloseFactory(date=date(2002, 1, 1), from_account=s1, price=20, fee=2)
+
+    rolled_forward = _balances(SavingBalance, "saving_type_id", SAVING_FIELDS)
+
+    sync_savings(instance=None, user=main_user)
+
+    assert rolled_forward == _balances(SavingBalance, "saving_type_id", SAVING_FIELDS)
+
+
+@pytest.mark.django_db
+def test_write_into_closed_year_matches_full_rebuild(main_user):
+    a1 = AccountFactory(title="A1")
+    a2 = AccountFactory(title="A2")
+
+    IncomeFactory(date=date(1999, 1, 1), account=a1, price=100)
+    IncomeFactory(date=date(2002, 1, 1), account=a2, price=50)
+    assert _closed_year() == 2002
+
+    ExpenseFactory(date=date(2000, 1, 1), account=a1, price=10)
+    IncomeFactory(date=date(1998, 1, 1), account=a2, price=5)
+
+    written = _balances(AccountBalance, "account_id", ACCOUNT_FIELDS)
+
+    sync_accounts(instance=None, user=main_user)
+
+    assert written == _balances(AccountBalance, "account_id", ACCOUNT_FIELDS)
+
+
+@pytest.mark.django_db
+def test_full_sync_of_unchanged_data_is_skipped(main_user, django_assert_num_queries):
+    IncomeFactory()
+    sync_accounts(instance=None, user=main_user)
+    AccountBalance.objects.update(delta=666)
+
+    # the data, the stored fingerprint and whether the table is there
+    with django_assert_num_queries(6):
+        sync_accounts(instance=None, user=main_user)
+
+    assert not AccountBalance.objects.exclude(delta=666).exists()
+
+
+@pytest.fixture
+def locmem(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_full_sync_of_unchanged_data_keeps_version(main_user, locmem):
+    IncomeFactory()
+    sync_accounts(instance=None, user=main_user)
+    version = context_cache.get_version(main_user.journal_id)
+
+    sync_accounts(instance=None, user=main_user)
+
+    assert context_cache.get_version(main_user.journal_id) == version
+
+
+@pytest.mark.django_db
+def test_full_sync_of_changed_data_bumps_version(main_user, locmem):
+    IncomeFactory()
+    sync_accounts(instance=None, user=main_user)
+    version = context_cache.get_version(main_user.journal_id)
+
+    Income.objects.update(price=1)
+    sync_accounts(instance=None, user=main_user)
+
+    assert context_cache.get_version(main_user.journal_id) != version
+
+
+@pytest.mark.django_db
+def test_sync_makes_cached_balances_of_finished_years_stale(main_user, locmem):
+    SavingFactory(date=date(1999, 1, 1), price=1)
+    balances = SavingBalance.objects.values("year", "per_year_incomes")
+
+    # a summary loaded before a worker rewrites the balances
+    SavingBalance.objects.update(per_year_incomes=666)
+    year_cache.rows_by_year(main_user, "balances", balances, cumulative=True)
+
+    sync_ledger(main_user, "savings", force=True)
+    actual = year_cache.rows_by_year(main_user, "balances", balances, cumulative=True)
+
+    assert actual[0]["per_year_incomes"] == 1
+
+
+@pytest.mark.django_db
+def test_full_sync_of_changed_data_rebuilds(main_user):
+    IncomeFactory()
+    sync_accounts(instance=None, user=main_user)
+    AccountBalance.objects.update(delta=666)
+
+    # no signal syncs an update of the queryset
+    Income.objects.update(price=1)
+    sync_accounts(instance=None, user=main_user)
+
+    assert not AccountBalance.objects.filter(delta=666).exists()
+
+
+@pytest.mark.django_db
+def test_forced_full_sync_rebuilds(main_user):
+    IncomeFactory()
+    sync_accounts(instance=None, user=main_user)
+    AccountBalance.objects.update(delta=666)
+
+    sync_ledger(main_user, "accounts", force=True)
+
+    assert not AccountBalance.objects.filter(delta=666).exists()
+
+
+@pytest.mark.django_db
+def test_fingerprint_does_not_depend_on_order_of_sources(main_user):
+    IncomeFactory(price=1)
+    ExpenseFactory(price=2)
+
+    conf = ACCOUNTS_CONF | {"incomes": ACCOUNTS_CONF["incomes"][::-1]}
+
+    assert (
+        GetData(main_user, conf).fingerprint()
+        == GetData(main_user, ACCOUNTS_CONF).fingerprint()
+    )
+
+
+@pytest.mark.django_db
+def test_remember_previous_state(main_user):
+    obj = IncomeFactory(price=1)
+    obj.price = 2
+
+    remember_previous_state(obj)
+
+    assert obj._previous_state.price == 1
+
+
+def test_remember_previous_state_of_new_row():
+    obj = IncomeFactory.build()
+
+    remember_previous_state(obj)
+
+    assert obj._previous_state is None
+
+
+def test_sync_scope_union():
+    a = SyncScope(category_ids=frozenset({1}), years=frozenset({2001}))
+    b = SyncScope(
+        category_ids=frozenset({2}),
+        years=frozenset({1999, 2000}),
+        vacated_years=frozenset({1999}),
+    )
+
+    actual = a | b
+
+    assert actual.category_ids == {1, 2}
+    assert actual.first_year == 1999
+    assert actual.last_year == 2001
+    assert actual.vacated_years == {1999}
+
+
+@pytest.mark.django_db
+def test_get_data_reads_each_group_of_sums_in_one_query(
+    main_user, django_assert_num_queries
+):
+    IncomeFactory()
+    ExpenseFactory()
+    SavingFactory()
+    AccountWorthFactory()
+
+    # incomes, expenses, worth, account types
+    with django_assert_num_queries(4):
+        data = GetData(main_user, ACCOUNTS_CONF)
+
+    assert data.incomes.columns == ["category_id", "year", *GetData.SUMS]
+    assert data.incomes.rows() == [(1, 1999, 1000, 0, 0)]
+    # one row per source, summed up in polars
+    assert sorted(data.expenses.rows()) == [(1, 1999, 0, 112, 0), (1, 1999, 0, 150, 0)]
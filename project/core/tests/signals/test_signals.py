@@ -2,6 +2,9 @@ from datetime import datetime
 
 import polars as pl
 import pytest
+from django.db import connection
+from django.db.models import QuerySet
+from django.db.models.constants import OnConflict
 from django.utils import timezone
 
 from ....accounts.services.model_services import AccountBalanceModelService
@@ -227,6 +230,93 @@ def test_account_empty_dataframe_deletes_all(main_user):
     assert AccountBalance.objects.count() == 0
 
 
+def test_account_delete_only_exact_key_pairs(main_user):
+    account_1 = AccountFactory(title="A1")
+    account_2 = AccountFactory(title="A2")
+    kept_1 = AccountBalanceFactory(year=2000, account=account_1)
+    kept_2 = AccountBalanceFactory(year=1999, account=account_2)
+    AccountBalanceFactory(year=1999, account=account_1)
+    AccountBalanceFactory(year=2000, account=account_2)
+
+    df = pl.DataFrame(
+        {
+            "category_id": [account_1.pk, account_2.pk],
+            "year": [2000, 1999],
+            "incomes": [kept_1.incomes, kept_2.incomes],
+            "expenses": [kept_1.expenses, kept_2.expenses],
+            "have": [kept_1.have, kept_2.have],
+            "latest_check": [None, None],
+            "balance": [kept_1.balance, kept_2.balance],
+            "past": [kept_1.past, kept_2.past],
+            "delta": [kept_1.delta, kept_2.delta],
+        },
+        schema_overrides={"latest_check": pl.Datetime},
+    ).lazy()
+
+    BalanceSynchronizer(AccountBalanceModelService, main_user, df)
+
+    assert sorted(AccountBalance.objects.values_list("account", "year")) == [
+        (account_1.pk, 2000),
+        (account_2.pk, 1999),
+    ]
+
+
+def test_account_upsert_is_one_statement(main_user, django_assert_num_queries):
+    account = AccountFactory()
+    AccountBalanceFactory(year=1999, account=account)
+
+    df = pl.DataFrame(
+        {
+            "category_id": [account.pk] * 30,
+            "year": list(range(1999, 2029)),
+            "incomes": [1] * 30,
+            "expenses": [0] * 30,
+            "have": [0] * 30,
+            "latest_check": [None] * 30,
+            "balance": [1] * 30,
+            "past": [0] * 30,
+            "delta": [1] * 30,
+        },
+        schema_overrides={"latest_check": pl.Datetime},
+    ).lazy()
+
+    # stored rows, savepoint, upsert, release
+    with django_assert_num_queries(4):
+        BalanceSynchronizer(AccountBalanceModelService, main_user, df)
+
+    assert AccountBalance.objects.count() == 30
+    assert set(AccountBalance.objects.values_list("incomes", flat=True)) == {1}
+
+
+def test_account_upsert_without_conflict_target(main_user, mocker):
+    # MySQL and MariaDB upsert on any unique key and take no target
+    mocker.patch.object(
+        connection.features, "supports_update_conflicts_with_target", False
+    )
+    insert = mocker.patch.object(QuerySet, "_batched_insert", return_value=[])
+
+    account = AccountFactory()
+    df = pl.DataFrame(
+        {
+            "category_id": [account.pk],
+            "year": [1999],
+            "incomes": [1],
+            "expenses": [0],
+            "have": [0],
+            "latest_check": [None],
+            "balance": [1],
+            "past": [0],
+            "delta": [1],
+        },
+        schema_overrides={"latest_check": pl.Datetime},
+    ).lazy()
+
+    BalanceSynchronizer(AccountBalanceModelService, main_user, df)
+
+    assert insert.call_args.kwargs["on_conflict"] == OnConflict.UPDATE
+    assert not insert.call_args.kwargs["unique_fields"]
+
+
 def test_saving_insert_new_records_empty_db(main_user):
     saving_type = SavingTypeFactory()
 
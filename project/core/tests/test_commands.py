@@ -0,0 +1,84 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from ...accounts.models import AccountBalance
+from ...incomes.tests.factories import IncomeFactory
+from ...journals.tests.factories import JournalFactory
+from ...savings.models import SavingBalance
+from ...savings.tests.factories import SavingFactory
+from ..models import MonthlyRollup, SearchDocument
+
+pytestmark = pytest.mark.django_db
+
+
+def _rebuild(**options):
+    out = StringIO()
+    call_command("rebuild_balances", workers=1, stdout=out, **options)
+    return out.getvalue()
+
+
+def test_rebuild_balances(main_user):
+    IncomeFactory()
+    SavingFactory()
+    AccountBalance.objects.all().delete()
+    SavingBalance.objects.all().delete()
+
+    actual = _rebuild()
+
+    assert AccountBalance.objects.exists()
+    assert SavingBalance.objects.exists()
+    assert "accounts 2, savings 2, pensions 0 rows" in actual
+    assert "Rebuilt 1 journal(s)" in actual
+
+
+def test_rebuild_balances_of_one_kind(main_user):
+    IncomeFactory()
+    SavingFactory()
+    AccountBalance.objects.all().delete()
+    SavingBalance.objects.all().delete()
+
+    actual = _rebuild(kind=["accounts"])
+
+    assert AccountBalance.objects.exists()
+    assert not SavingBalance.objects.exists()
+    assert "accounts 2 rows" in actual
+
+
+def test_rebuild_balances_of_one_journal(main_user, second_user):
+    actual = _rebuild(journal=[second_user.journal.pk])
+
+    assert f"#{second_user.journal.pk}" in actual
+    assert f"#{main_user.journal.pk}" not in actual
+
+
+def test_rebuild_balances_skips_journal_without_users():
+    journal = JournalFactory(title="Empty Journal")
+
+    actual = _rebuild(journal=[journal.pk])
+
+    assert "skipped, journal has no users" in actual
+
+
+def test_rebuild_rollups(main_user):
+    IncomeFactory()
+    SavingFactory()
+    MonthlyRollup.objects.all().delete()
+
+    out = StringIO()
+    call_command("rebuild_rollups", stdout=out)
+
+    assert MonthlyRollup.objects.count() == 2
+    assert "Wrote 2 monthly rollup row(s)" in out.getvalue()
+
+
+def test_rebuild_search_index(main_user):
+    IncomeFactory()
+    SearchDocument.objects.all().delete()
+
+    out = StringIO()
+    call_command("rebuild_search_index", stdout=out)
+
+    assert SearchDocument.objects.count() == 1
+    assert "Indexed 1 search document(s)" in out.getvalue()
@@ -3,6 +3,7 @@ from django.shortcuts import redirect, render
 from django.urls import reverse, reverse_lazy
 from django.utils.translation import gettext_lazy as _
 
+from ..core.mixins.conditional import ConditionalGetMixin
 from ..core.mixins.views import (
     CreateViewMixin,
     DeleteViewMixin,
@@ -34,7 +35,7 @@ class Empty(TemplateViewMixin):
     template_name = "counts/empty.html"
 
 
-class TabViewMixin(CountTypetObjectMixin):
+class TabViewMixin(ConditionalGetMixin, CountTypetObjectMixin):
     tab = DEFAULT_TAB
 
     def dispatch(self, request, *args, **kwargs):
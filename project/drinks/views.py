@@ -7,6 +7,7 @@ from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import View
 
+from ..core.mixins.conditional import ConditionalGetMixin
 from ..core.mixins.views import (
     CreateViewMixin,
     DeleteViewMixin,
@@ -36,7 +37,7 @@ class HtmxFormRetargetMixin:
         return response
 
 
-class TabViewMixin:
+class TabViewMixin(ConditionalGetMixin):
     tab = DEFAULT_TAB
 
     def get_template_names(self):
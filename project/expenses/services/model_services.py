@@ -20,7 +20,11 @@ from django.db.models.functions import (
 )
 
 from ...core.mixins.sum import SumMixin
-from ...core.services.model_services import BaseModelService
+from ...core.models import MonthlyRollup
+from ...core.services.model_services import (
+    BaseModelService,
+    MonthlyRollupModelService,
+)
 from .. import models
 
 
@@ -123,7 +127,14 @@ class ExpenseModelService(SumMixin, BaseModelService):
         )
 
     def sum_by_year(self):
-        return self.year_sum(self.objects)
+        """
+        Read from the monthly rollup, which only the save and delete signals
+        keep; rows written without them (bulk_create, queryset update) need
+        `manage.py rebuild_rollups` before these sums are right.
+        """
+        return MonthlyRollupModelService(self.user).sum_by_year(
+            MonthlyRollup.Kind.EXPENSES
+        )
 
     def sum_by_year_type(self, expense_type: list | None = None):
         objects = (
@@ -192,6 +203,11 @@ class ExpenseModelService(SumMixin, BaseModelService):
         }
         db_locale = locale_map.get(self.user.journal.lang, "lt_LT")
 
+        ordering = ["-date", "expense_type__title", F("expense_name__title").asc()]
+        # search results matching more of the words go first
+        if "rank" in qs.query.annotations:
+            ordering.insert(0, "-rank")
+
         return (
             qs.annotate(
                 # Database-level Price Formatting (MariaDB/MySQL)
@@ -211,7 +227,7 @@ class ExpenseModelService(SumMixin, BaseModelService):
                 # Grouping for "If Month Changed" logic
                 month_group=TruncMonth("date"),
             )
-            .order_by("-date", "expense_type__title", F("expense_name__title").asc())
+            .order_by(*ordering)
             .values(
                 "id",
                 "date",
@@ -370,7 +370,6 @@ def test_expense_last_months_qs_count(main_user, django_assert_max_num_queries):
         list(ExpenseModelService(main_user).last_months())
 
 
-@factory.django.mute_signals(post_save)
 def test_expense_years_sum(main_user):
     ExpenseFactory(date=date(1998, 1, 1), price=4.0)
     ExpenseFactory(date=date(1998, 1, 1), price=4.0)
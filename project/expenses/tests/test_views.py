@@ -2,9 +2,11 @@ from datetime import date
 
 import pytest
 import time_machine
+from django.core.cache import cache
 from django.urls import resolve, reverse
 
 from ...accounts.tests.factories import AccountFactory
+from ...core.services import search_index
 from ...core.tests.utils import change_profile_year, clean_content
 from .. import models
 from ..views import expenses, expenses_name, expenses_type
@@ -13,6 +15,14 @@ from .factories import ExpenseFactory, ExpenseNameFactory, ExpenseTypeFactory
 pytestmark = pytest.mark.django_db
 
 
+@pytest.fixture
+def locmem(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+
+
 @pytest.fixture()
 def _db_data():
     ExpenseTypeFactory.reset_sequence()
@@ -832,6 +842,8 @@ def test_search_pagination_first_page(client_logged):
     n = ExpenseNameFactory()
     i = ExpenseFactory.build_batch(51, account=a, expense_type=t, expense_name=n)
     models.Expense.objects.bulk_create(i)
+    # bulk_create skips the signals keeping the search index
+    search_index.rebuild()
 
     url = reverse("expenses:search")
     response = client_logged.get(url, {"search": "type"})
@@ -846,6 +858,8 @@ def test_search_pagination_second_page(client_logged):
     n = ExpenseNameFactory()
     i = ExpenseFactory.build_batch(51, account=a, expense_type=t, expense_name=n)
     models.Expense.objects.bulk_create(i)
+    # bulk_create skips the signals keeping the search index
+    search_index.rebuild()
 
     url = reverse("expenses:search")
     response = client_logged.get(url, {"page": 2, "search": "type"})
@@ -867,6 +881,60 @@ def test_seach_statistic(client_logged):
     assert response.context["average"] == 100
 
 
+def test_search_pagination_ranked_next_page_by_cursor(client_logged):
+    a = AccountFactory()
+    t = ExpenseTypeFactory()
+    n = ExpenseNameFactory()
+    i = ExpenseFactory.build_batch(50, account=a, expense_type=t, expense_name=n)
+    i.append(
+        ExpenseFactory.build(
+            account=a,
+            expense_type=t,
+            expense_name=n,
+            remark="old",
+            date=date(1000, 1, 1),
+        )
+    )
+    models.Expense.objects.bulk_create(i)
+    # bulk_create skips the signals keeping the search index
+    search_index.rebuild()
+
+    url = reverse("expenses:search")
+    first = client_logged.get(url, {"search": "type old"}).context["object_list"]
+    response = client_logged.get(
+        url, {"page": 2, "search": "type old", "cursor": first.next_cursor}
+    )
+
+    # the row matching both words is ranked first, the rest follow by date
+    assert first[0]["remark"] == "old"
+    assert len(response.context["object_list"]) == 1
+    assert response.context["object_list"][0]["remark"] == "Remark"
+
+
+def test_search_statistic_cached_while_paging(client_logged, locmem, mocker):
+    ExpenseFactory(price=200, quantity=2, remark="xxx")
+    url = reverse("expenses:search")
+    client_logged.get(url, {"search": "xxx"})
+
+    statistic = mocker.spy(expenses.Search, "search_statistic")
+    response = client_logged.get(url, {"page": 2, "search": "XXX"})
+
+    assert statistic.call_count == 0
+    assert response.context["sum_price"] == 200
+
+
+def test_search_statistic_follows_new_expense(client_logged, locmem):
+    ExpenseFactory(price=200, quantity=2, remark="xxx")
+    url = reverse("expenses:search")
+    client_logged.get(url, {"search": "xxx"})
+
+    ExpenseFactory(price=300, quantity=3, remark="xxx")
+    response = client_logged.get(url, {"search": "xxx"})
+
+    assert response.context["sum_price"] == 500
+    assert response.context["count"] == 2
+
+
 def test_seach_statistic_not_found(client_logged):
     ExpenseFactory(price=100)
     ExpenseFactory(price=200, quantity=2)
@@ -0,0 +1,29 @@
+# Generated by Django 6.0.7 on 2026-10-18 19:07
+
+from django.db import migrations
+from django.db.models import Max
+
+
+def remove_duplicates(apps, schema_editor):
+    # balances are derived data: keep the newest row of each pension_type and year
+    PensionBalance = apps.get_model("pensions", "PensionBalance")
+    keep = list(
+        PensionBalance.objects.values("pension_type", "year")
+        .annotate(last_id=Max("id"))
+        .values_list("last_id", flat=True)
+    )
+    PensionBalance.objects.exclude(id__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("pensions", "0015_alter_pensiontype_slug_alter_pensiontype_title"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, reverse_code=migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name="pensionbalance",
+            unique_together={("pension_type", "year")},
+        ),
+    ]
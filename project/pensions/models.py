@@ -56,6 +56,7 @@ class PensionBalance(models.Model):
 
     class Meta:
         ordering = ["year", "pension_type__pk"]
+        unique_together = ["pension_type", "year"]
 
     def __str__(self):
         return f"{self.pension_type.title}"
@@ -0,0 +1,29 @@
+# Generated by Django 6.0.7 on 2026-10-18 19:07
+
+from django.db import migrations
+from django.db.models import Max
+
+
+def remove_duplicates(apps, schema_editor):
+    # balances are derived data: keep the newest row of each saving_type and year
+    SavingBalance = apps.get_model("savings", "SavingBalance")
+    keep = list(
+        SavingBalance.objects.values("saving_type", "year")
+        .annotate(last_id=Max("id"))
+        .values_list("last_id", flat=True)
+    )
+    SavingBalance.objects.exclude(id__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("savings", "0016_alter_savingbalance_options"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, reverse_code=migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name="savingbalance",
+            unique_together={("saving_type", "year")},
+        ),
+    ]
@@ -91,6 +91,7 @@ class SavingBalance(models.Model):
 
     class Meta:
         ordering = ["year", "saving_type__pk"]
+        unique_together = ["saving_type", "year"]
 
     def __str__(self):
         return f"{self.saving_type.title}"
@@ -6,7 +6,11 @@ from django.db.models import Count, F, Q, Sum, Value
 from django.db.models.functions import Coalesce, ExtractYear, TruncMonth
 
 from ...core.mixins.sum import SumMixin
-from ...core.services.model_services import BaseModelService
+from ...core.models import MonthlyRollup
+from ...core.services.model_services import (
+    BaseModelService,
+    MonthlyRollupModelService,
+)
 from .. import models
 
 
@@ -45,7 +49,14 @@ class SavingModelService(SumMixin, BaseModelService):
         return self.objects
 
     def sum_by_year(self):
-        return self.year_sum(self.objects)
+        """
+        Read from the monthly rollup, which only the save and delete signals
+        keep; rows written without them (bulk_create, queryset update) need
+        `manage.py rebuild_rollups` before these sums are right.
+        """
+        return MonthlyRollupModelService(self.user).sum_by_year(
+            MonthlyRollup.Kind.SAVINGS
+        )
 
     def sum_by_month(self, year: int, month: Optional[int] = None):
         return self.month_sum(self.objects, year, month).annotate(
@@ -170,7 +170,6 @@ def test_saving_items(main_user):
     assert len(SavingModelService(main_user).items()) == 1
 
 
-@factory.django.mute_signals(post_save)
 def test_saving_years_sum(main_user):
     SavingFactory(date=date(1998, 1, 1), price=4.0)
     SavingFactory(date=date(1998, 1, 1), price=4.0)